@@ -0,0 +1,25 @@
+# ais_replay_server.py
+
+import argparse
+import asyncio
+import numpy as np
+from vds.data_handler.ais_parser import load_ais_targets
+from vds.data_handler.live_ais import LocalFrame, replay_sentences, serve_replay
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded AIS tracks as live AIVDM sentences over UDP or TCP.")
+    parser.add_argument('tracks', type=str, nargs='?', default='data/ais/sample_ais_tracks.csv', help="AIS track CSV.")
+    parser.add_argument('--protocol', choices=('udp', 'tcp'), default='udp')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=10110)
+    parser.add_argument('--origin', type=float, nargs=2, default=(35.08, 129.08), metavar=('LAT', 'LON'),
+                        help="Geodetic position of the simulator origin.")
+    parser.add_argument('--interval', type=float, default=2.0, help="Seconds of track time between reports.")
+    parser.add_argument('--duration', type=float, default=600.0, help="Seconds of track time to serve.")
+    parser.add_argument('--speedup', type=float, default=1.0)
+    args = parser.parse_args()
+
+    targets = load_ais_targets(args.tracks)
+    schedule = replay_sentences(targets, LocalFrame(*args.origin), np.arange(0.0, args.duration, args.interval))
+    print(f"Serving {len(targets)} targets over {args.protocol.upper()} on {args.host}:{args.port}")
+    asyncio.run(serve_replay(schedule, args.host, args.port, args.protocol, args.speedup))
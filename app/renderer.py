@@ -1,27 +1,65 @@
 # app/renderer.py
 
+import os
 import pygame
 import numpy as np
-from collections import deque
+from collections import OrderedDict
 from vds.models.vessels.base_vessel import BaseVessel
 from vds.environment.geography import Geography
 from vds.data_handler.ais_parser import AISTarget
 from vds.environment.wind import Wind
 from vds.environment.current import Current
 from vds.environment.waves import Waves
+from vds.core.track_history import TrackHistory, simplify_polyline
 
 class Renderer:
-    def __init__(self, width: int, height: int):
+    """
+    Draws the simulation with pygame, into a window or, with `headless=True`, into an
+    offscreen surface (SDL dummy video driver) for recording frames without a display.
+    """
+    STATIC_LAYER_MARGIN = 256 # Pixels the camera can move before the static layer is redrawn
+    TRACK_TOLERANCE_PX = 0.5 # Douglas-Peucker tolerance of the drawn track
+    TRACK_CHUNK = 256 # New track points drawn raw before they are simplified into the cached prefix
+    TEXT_CACHE_SIZE = 512 # Rendered text surfaces kept by `_text`
+    AIS_TRIANGLE = np.array([(1.0, 0.0), (-0.5, -1 / 3), (-0.5, 1 / 3)]) # Unit AIS glyph, bow along +x
+
+    def __init__(self, width: int, height: int, headless: bool = False):
+        self.headless = headless
+        if headless:
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
         pygame.init()
         self.width = width
         self.height = height
-        self.screen = pygame.display.set_mode((self.width, self.height))
-        pygame.display.set_caption("Vessel Dynamics Simulator")
+        if headless:
+            self.screen = pygame.Surface((self.width, self.height))
+        else:
+            self.screen = pygame.display.set_mode((self.width, self.height))
+            pygame.display.set_caption("Vessel Dynamics Simulator")
         self.font = pygame.font.Font(None, 24)
         self.title_font = pygame.font.Font(None, 50)
         self.pause_font = pygame.font.Font(None, 74)
         self.zoom = 0.5
         self.offset = np.array([width / 2, height / 2], dtype=float)
+        self.predictor = None # Optional PredictorWorker for the forecast overlay
+        self._prediction_key = None
+        self._prediction_screen = None
+        self.profiler = None # Optional Profiler; times each frame and shows the perf HUD
+        self._perf_lines = []
+        self._perf_frame = 0
+        self._depth_image = None # Bathymetry colours, one pixel per cell
+        self._depth_image_key = None
+        self._static_layer = None # Bathymetry and obstacles around the view, at the current zoom
+        self._static_layer_key = None
+        self._static_layer_origin = None
+        self._track_key = None # Track simplified at the current zoom: absolute indices and world points
+        self._track_indices = np.zeros(0, dtype=int)
+        self._track_world = np.zeros((0, 2))
+        self._track_done = 0
+        self._track_screen_key = None
+        self._track_screen = None
+        self._text_cache = OrderedDict()
+        self._pause_overlay = None
+        self.replay = None # Optional ReplayPlayer; draws the playback bar
 
     def recenter(self, vessel_pos_world: np.ndarray):
         """Recenter the camera on the vessel."""
@@ -30,34 +68,60 @@ class Renderer:
 
     def draw_vessel_selection_screen(self, scenarios: list, selected_index: int):
         self.screen.fill((22, 44, 77))
-        title_surf = self.title_font.render("Select Scenario", True, (255, 255, 255))
+        title_surf = self._text("Select Scenario", (255, 255, 255), self.title_font)
         self.screen.blit(title_surf, (self.width / 2 - title_surf.get_width() / 2, 100))
         for i, scenario_name in enumerate(scenarios):
             color = (255, 255, 0) if i == selected_index else (200, 200, 200)
-            text_surf = self.font.render(scenario_name, True, color)
+            text_surf = self._text(scenario_name, color)
             self.screen.blit(text_surf, (self.width / 2 - text_surf.get_width() / 2, 200 + i * 40))
-        inst_surf = self.font.render("Use UP/DOWN arrows to select, ENTER to continue", True, (150, 150, 150))
+        inst_surf = self._text("Use UP/DOWN arrows to select, ENTER to continue", (150, 150, 150))
         self.screen.blit(inst_surf, (self.width / 2 - inst_surf.get_width() / 2, 500))
         pygame.display.flip()
 
     def draw_settings_screen(self, settings: dict, active_field: str):
         self.screen.fill((22, 44, 77))
-        title_surf = self.title_font.render("Environment Settings", True, (255, 255, 255))
+        title_surf = self._text("Environment Settings", (255, 255, 255), self.title_font)
         self.screen.blit(title_surf, (self.width / 2 - title_surf.get_width() / 2, 100))
         fields = ["wind_speed", "wind_dir", "current_speed", "current_dir", "waves_h", "waves_dir"]
         labels = ["Wind Speed (kts):", "Wind Dir (deg):", "Current Speed (kts):", "Current Dir (deg):", "Waves Hs (m):", "Waves Dir (deg):"]
         for i, (field, label) in enumerate(zip(fields, labels)):
-            label_surf = self.font.render(label, True, (200, 200, 200))
+            label_surf = self._text(label, (200, 200, 200))
             self.screen.blit(label_surf, (400, 200 + i * 40))
             input_rect = pygame.Rect(600, 200 + i * 40, 140, 32)
             color = (255, 255, 0) if active_field == field else (255, 255, 255)
             pygame.draw.rect(self.screen, color, input_rect, 2)
-            text_surf = self.font.render(settings[field], True, (255, 255, 255))
+            text_surf = self._text(settings[field], (255, 255, 255))
             self.screen.blit(text_surf, (input_rect.x + 5, input_rect.y + 5))
-        inst_surf = self.font.render("Use TAB to switch fields, ENTER to start simulation", True, (150, 150, 150))
+        inst_surf = self._text("Use TAB to switch fields, ENTER to start simulation", (150, 150, 150))
         self.screen.blit(inst_surf, (self.width / 2 - inst_surf.get_width() / 2, 500))
         pygame.display.flip()
 
+    def _text(self, text: str, color, font: pygame.font.Font = None) -> pygame.Surface:
+        """Rendered text surface from an LRU cache keyed by font, string and colour."""
+        font = font or self.font
+        key = (id(font), text, tuple(color))
+        surface = self._text_cache.get(key)
+        if surface is not None:
+            self._text_cache.move_to_end(key)
+            return surface
+        surface = font.render(text, True, color)
+        self._text_cache[key] = surface
+        if len(self._text_cache) > self.TEXT_CACHE_SIZE:
+            self._text_cache.popitem(last=False)
+        return surface
+
+    def _visible(self, screen: np.ndarray, margin: float = 0.0) -> np.ndarray:
+        """Mask of (n, 2) screen points whose `margin`-sized box overlaps the screen."""
+        return (screen[:, 0] >= -margin) & (screen[:, 0] < self.width + margin) \
+            & (screen[:, 1] >= -margin) & (screen[:, 1] < self.height + margin)
+
+    def _world_to_screen_array(self, points: np.ndarray) -> np.ndarray:
+        """Vectorized `_world_to_screen` for (n, 2) world points; float screen coordinates."""
+        screen = np.empty_like(points, dtype=float)
+        screen[:, 0] = points[:, 1] * self.zoom + self.offset[0]
+        screen[:, 1] = -points[:, 0] * self.zoom + self.offset[1]
+        return screen
+
     def _world_to_screen(self, pos: np.ndarray) -> tuple[int, int]:
         transformed_pos = np.array([pos[1], -pos[0]])
         screen_pos = (transformed_pos * self.zoom) + self.offset
@@ -65,25 +129,69 @@ class Renderer:
 
     def render(self, simulator, control: dict):
         """Main rendering function. Now takes the simulator object directly."""
+        if self.profiler is not None:
+            frame_start = self.profiler.now()
         self.screen.fill((22, 44, 77))
         vessel = simulator.vessel
 
         self._draw_geography(simulator.geography, simulator.show_obstacles, simulator.show_water_depth, vessel)
         # FIXED: Pass the current waypoint index from the simulator
-        self._draw_waypoints(getattr(simulator, 'waypoints', []), simulator.current_waypoint_index)
+        self._draw_waypoints(simulator.route, simulator.current_waypoint_index)
         self._draw_track(simulator.track_history)
-        self._draw_ais_targets(simulator.ais_targets)
+        if self.predictor is not None and simulator.show_prediction:
+            self.predictor.update(simulator, control)
+            self._draw_predictions(self.predictor)
+        ais_states = _ais_states(simulator.ais_targets)
+        self._draw_ais_targets(ais_states)
         self._draw_vessel(vessel)
         self._draw_hud(vessel, control, simulator)
         self._draw_6dof_indicator(vessel)
         
         if simulator.show_minimap:
-            self._draw_minimap(vessel, simulator.geography, simulator.ais_targets)
+            self._draw_minimap(vessel, simulator.geography, ais_states)
         if simulator.is_paused:
             self._draw_pause_overlay()
-        pygame.display.flip()
+        if self.profiler is not None:
+            self._draw_perf_hud()
+        if self.replay is not None:
+            self._draw_replay_bar(self.replay)
+        if not self.headless:
+            pygame.display.flip()
+        if self.profiler is not None:
+            self.profiler.record('render', frame_start)
+
+    def replay_bar_rect(self) -> pygame.Rect:
+        return pygame.Rect(self.width / 2 - 300, self.height - 70, 600, 12)
+
+    def _draw_replay_bar(self, player):
+        """Playback position, time and speed; clicking the bar seeks (see replay.py)."""
+        bar = self.replay_bar_rect()
+        pygame.draw.rect(self.screen, (50, 50, 50), bar)
+        span = max(player.end_time - player.start_time, 1e-9)
+        filled = bar.width * (player.time - player.start_time) / span
+        pygame.draw.rect(self.screen, (0, 200, 255), (bar.x, bar.y, filled, bar.height))
+        pygame.draw.rect(self.screen, (200, 200, 200), bar, 1)
+        state = 'PLAY' if player.playing else 'PAUSE'
+        text = self._text(f"{state} {player.speed:+g}x  {player.time:.1f} / {player.end_time:.1f} s", (255, 255, 255))
+        self.screen.blit(text, (bar.x, bar.y - 22))
 
-    def _draw_minimap(self, vessel, geography, ais_targets):
+    def _draw_perf_hud(self, refresh_frames: int = 30):
+        """Step and frame time percentiles; the statistics are refreshed every `refresh_frames` frames."""
+        if self._perf_frame % refresh_frames == 0:
+            profiler = self.profiler
+            self._perf_lines = []
+            for phase in ('step', 'forces', 'kinematics', 'collisions', 'ais', 'avoidance', 'render'):
+                stats = profiler.stats(phase)
+                if stats['count']:
+                    self._perf_lines.append(f"{phase:<10} p50 {stats['p50_ms']:6.3f} ms | p99 {stats['p99_ms']:6.3f} ms")
+            self._perf_lines.append(f"steps {profiler.counters.get('steps', 0)}")
+        self._perf_frame += 1
+        x, y = self.width - 360, 220
+        for i, text in enumerate(self._perf_lines):
+            surface = self._text(text, (0, 255, 0))
+            self.screen.blit(surface, (x, y + i * 20))
+
+    def _draw_minimap(self, vessel, geography, ais_states: np.ndarray):
         map_w, map_h = 250, 200
         map_x, map_y = self.width - map_w - 10, 10
         map_rect = pygame.Rect(map_x, map_y, map_w, map_h)
@@ -97,9 +205,13 @@ class Renderer:
             return int(mini_pos_x), int(mini_pos_y)
         vessel_pos = world_to_mini(vessel.state.eta[:2])
         pygame.draw.circle(self.screen, (255, 165, 0), vessel_pos, 4)
-        for target in ais_targets:
-            target_pos = world_to_mini([target.state.x, target.state.y])
-            pygame.draw.circle(self.screen, (150, 150, 150), target_pos, 3)
+        if len(ais_states):
+            # Targets sharing a minimap pixel are drawn once
+            columns = (map_x + ais_states[:, 1] * scale).astype(int)
+            rows = (map_y + ais_states[:, 0] * scale).astype(int)
+            pixels = np.unique(columns * (self.height + 1) + rows)
+            for target_pos in zip((pixels // (self.height + 1)).tolist(), (pixels % (self.height + 1)).tolist()):
+                pygame.draw.circle(self.screen, (150, 150, 150), target_pos, 3)
 
     def _draw_6dof_indicator(self, vessel):
         ind_x, ind_y, ind_w, ind_h = self.width - 260, self.height - 110, 250, 100
@@ -107,7 +219,7 @@ class Renderer:
         pygame.draw.rect(self.screen, (200, 200, 200), (ind_x, ind_y, ind_w, ind_h), 1)
         v, p, q = vessel.state.nu[1], vessel.state.nu[3], vessel.state.nu[4]
         def draw_bar(label, value, y_pos, max_val):
-            label_surf = self.font.render(label, True, (200, 200, 200))
+            label_surf = self._text(label, (200, 200, 200))
             self.screen.blit(label_surf, (ind_x + 10, y_pos + 2))
             bar_bg_rect = pygame.Rect(ind_x + 70, y_pos, 170, 20)
             pygame.draw.rect(self.screen, (50, 50, 50), bar_bg_rect)
@@ -138,13 +250,13 @@ class Renderer:
         if waves and waves.significant_height > 0: info_texts.append(f"Waves: Hs={waves.significant_height:.1f}m @ {waves.direction}°")
 
         for i, text in enumerate(info_texts):
-            surface = self.font.render(text, True, (255, 255, 255))
+            surface = self._text(text, (255, 255, 255))
             self.screen.blit(surface, (10, 10 + i * 25))
             
         rpm_text = f"RPM: {control.get('rpm', 0.0):.0f}"
         rudder_text = f"Rudder: {rudder_angle:.1f}°"
-        rpm_surf = self.font.render(rpm_text, True, (255, 255, 255))
-        rudder_surf = self.font.render(rudder_text, True, rudder_color)
+        rpm_surf = self._text(rpm_text, (255, 255, 255))
+        rudder_surf = self._text(rudder_text, rudder_color)
         padding = 40
         total_width = rpm_surf.get_width() + padding + rudder_surf.get_width()
         start_x = self.width / 2 - total_width / 2
@@ -154,69 +266,182 @@ class Renderer:
         
         toggle_texts = [
             f"[A] Autopilot: {'ON' if simulator.autopilot_enabled else 'OFF'}",
+            f"[V] Avoidance: {'ON' if simulator.avoidance_enabled else 'OFF'}",
             f"[M] Minimap: {'ON' if simulator.show_minimap else 'OFF'}",
+            f"[F] Forecast: {'ON' if simulator.show_prediction else 'OFF'}",
             f"[O] Obstacles: {'ON' if simulator.show_obstacles else 'OFF'}",
-            f"[W] Water Depth: {'ON' if simulator.show_water_depth else 'OFF'}"
+            f"[W] Water Depth: {'ON' if simulator.show_water_depth else 'OFF'}",
+            f"[T] Profiler: {'ON' if self.profiler is not None else 'OFF'}"
         ]
         for i, text in enumerate(toggle_texts):
-            surface = self.font.render(text, True, (255, 255, 0))
+            surface = self._text(text, (255, 255, 0))
             y_pos = self.height - (len(toggle_texts) - i) * 30
             self.screen.blit(surface, (10, y_pos))
 
-    def _draw_waypoints(self, waypoints: list, current_index: int):
-        for i, wp in enumerate(waypoints):
-            pos = np.array(wp['position'])
-            name = wp['name']
-            screen_pos = self._world_to_screen(pos)
+    def _draw_waypoints(self, route, current_index: int):
+        if route is None: return
+        screen = self._world_to_screen_array(route.points[1:])
+        for i in np.flatnonzero(self._visible(screen, margin=12)):
+            screen_pos = screen[i].astype(int).tolist()
             color = (0, 255, 0) if i == current_index else (255, 0, 255)
             pygame.draw.circle(self.screen, color, screen_pos, 12, 2)
-            text_surf = self.font.render(name, True, color)
+            text_surf = self._text(route.names[i], color)
             self.screen.blit(text_surf, (screen_pos[0] + 15, screen_pos[1] - 10))
 
     def _draw_pause_overlay(self):
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))
-        self.screen.blit(overlay, (0, 0))
-        pause_text = self.pause_font.render("PAUSED", True, (255, 255, 0))
+        if self._pause_overlay is None:
+            self._pause_overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            self._pause_overlay.fill((0, 0, 0, 128))
+        self.screen.blit(self._pause_overlay, (0, 0))
+        pause_text = self._text("PAUSED", (255, 255, 0), self.pause_font)
         text_rect = pause_text.get_rect(center=(self.width / 2, self.height / 2))
         self.screen.blit(pause_text, text_rect)
 
-    def _draw_track(self, track_history: deque):
+    def _draw_track(self, track_history: TrackHistory):
+        """
+        Draws the track simplified at the current zoom. Points older than the last `TRACK_CHUNK` are
+        simplified once and cached (in screen space until the camera moves); only the recent tail is
+        transformed every frame. A zoom change or a cleared history rebuilds the cache.
+        """
         if len(track_history) < 2: return
-        screen_points = [self._world_to_screen(p) for p in track_history]
-        pygame.draw.aalines(self.screen, (200, 200, 255), False, screen_points, 1)
+        first, total = track_history.first, track_history.total
+        key = (track_history.generation, self.zoom)
+        if key != self._track_key or self._track_done < first:
+            self._track_key = key
+            self._track_indices = np.array([first])
+            self._track_world = track_history.points(first)[:1].copy()
+            self._track_done = first
+        if self._track_indices[0] < first:
+            keep = self._track_indices >= first
+            self._track_indices, self._track_world = self._track_indices[keep], self._track_world[keep]
+        if total - 1 - self._track_done >= self.TRACK_CHUNK:
+            chunk = track_history.points(self._track_done)
+            kept = simplify_polyline(chunk, self.TRACK_TOLERANCE_PX / self.zoom)[1:]
+            self._track_indices = np.concatenate([self._track_indices, kept + self._track_done])
+            self._track_world = np.concatenate([self._track_world, chunk[kept]])
+            self._track_done = total - 1
+
+        screen_key = (key, len(self._track_indices), int(self._track_indices[0]) if len(self._track_indices) else -1,
+                      self.offset[0], self.offset[1])
+        if screen_key != self._track_screen_key:
+            self._track_screen = self._world_to_screen_array(self._track_world)
+            self._track_screen_key = screen_key
+        tail = self._world_to_screen_array(track_history.points(self._track_done + 1))
+        screen_points = np.concatenate([self._track_screen, tail])
+        if len(screen_points) < 2: return
+        pygame.draw.aalines(self.screen, (200, 200, 255), False, screen_points.tolist(), 1)
+
+    def _draw_predictions(self, predictor):
+        """Draws the forecast tracks; screen points are recomputed only when the forecast or camera changes."""
+        forecast = predictor.forecast  # Read once: the worker thread replaces it as a whole
+        if forecast is None: return
+        tracks = forecast.tracks
+        key = (forecast.version, self.zoom, self.offset[0], self.offset[1])
+        if key != self._prediction_key:
+            screen = np.empty_like(tracks)
+            screen[..., 0] = tracks[..., 1] * self.zoom + self.offset[0]
+            screen[..., 1] = -tracks[..., 0] * self.zoom + self.offset[1]
+            self._prediction_screen = screen.astype(int)
+            self._prediction_key = key
+        marker_indices = predictor.predictor.marker_indices()
+        for i, (points, rudder) in enumerate(zip(self._prediction_screen, forecast.rudders)):
+            if i == 0: color = (0, 255, 255)
+            elif rudder < -0.1: color = (255, 100, 100)
+            elif rudder > 0.1: color = (100, 255, 100)
+            else: color = (200, 200, 200)
+            pygame.draw.lines(self.screen, color, False, points.tolist(), 2 if i == 0 else 1)
+            for index in marker_indices:
+                pygame.draw.circle(self.screen, color, points[index].tolist(), 4 if i == 0 else 3, 1)
 
     def _draw_geography(self, geography: Geography, show_obstacles: bool, show_water: bool, vessel: BaseVessel):
-        if show_water:
-            cell_size_screen = int(geography.cell_size * self.zoom)
-            if cell_size_screen >= 2:
-                for i in range(geography.grid_height):
-                    for j in range(geography.grid_width):
-                        depth = geography.depth_data[i, j]
-                        color = self._get_depth_color(depth, vessel.specs.draft)
-                        world_pos = np.array([j * geography.cell_size, i * geography.cell_size])
-                        screen_pos = self._world_to_screen(world_pos)
-                        pygame.draw.rect(self.screen, color, (screen_pos[0], screen_pos[1], cell_size_screen, cell_size_screen))
+        """
+        Blits the static layer (bathymetry and obstacles). The layer covers the view plus a margin and is
+        redrawn only when the zoom, the toggles or the map change, or the camera moves past the margin.
+        """
+        if not (show_water or show_obstacles):
+            return
+        margin = self.STATIC_LAYER_MARGIN
+        # Layer origin in zoomed world coordinates (screen position minus offset), snapped to the margin
+        origin = np.floor((-self.offset - margin / 2) / margin) * margin
+        # The geography itself (compared by identity) and its change counters identify the map
+        key = (self.zoom, origin[0], origin[1], show_water, show_obstacles, vessel.specs.draft, geography,
+               geography.depth_version, geography.obstacles_version, geography.polygons_version)
+        if key != self._static_layer_key:
+            self._static_layer = self._build_static_layer(geography, show_obstacles, show_water, vessel.specs.draft,
+                                                          origin, (self.width + 2 * margin, self.height + 2 * margin))
+            self._static_layer_key = key
+            self._static_layer_origin = origin
+        self.screen.blit(self._static_layer, (self._static_layer_origin + self.offset).astype(int).tolist())
+
+    def _build_static_layer(self, geography: Geography, show_obstacles: bool, show_water: bool, draft: float,
+                            origin: np.ndarray, size: tuple[int, int]) -> pygame.Surface:
+        layer = pygame.Surface(size, pygame.SRCALPHA)
+        scale = geography.cell_size * self.zoom  # Screen pixels per cell
+        if show_water and scale > 0:
+            image = self._depth_layer_image(geography, draft)
+            # Cell (i, j) spans north [i, i+1) and east [j, j+1) cells; screen x is east, screen y is south.
+            # Image column j is east cell j; image row r is north cell grid_height - 1 - r.
+            top = -geography.grid_height * scale
+            j0 = int(np.clip(np.floor(origin[0] / scale), 0, geography.grid_width))
+            j1 = int(np.clip(np.ceil((origin[0] + size[0]) / scale), 0, geography.grid_width))
+            r0 = int(np.clip(np.floor((origin[1] - top) / scale), 0, geography.grid_height))
+            r1 = int(np.clip(np.ceil((origin[1] + size[1] - top) / scale), 0, geography.grid_height))
+            if j1 > j0 and r1 > r0:
+                x0, y0 = j0 * scale - origin[0], top + r0 * scale - origin[1]
+                x1, y1 = j1 * scale - origin[0], top + r1 * scale - origin[1]
+                width, height = int(round(x1)) - int(round(x0)), int(round(y1)) - int(round(y0))
+                if width > 0 and height > 0:
+                    cells = image.subsurface((j0, r0, j1 - j0, r1 - r0))
+                    layer.blit(pygame.transform.scale(cells, (width, height)), (int(round(x0)), int(round(y0))))
+
+        if show_obstacles and len(geography.obstacle_radii):
+            centres = np.column_stack([geography.obstacle_positions[:, 1], -geography.obstacle_positions[:, 0]])
+            centres = centres * self.zoom - origin
+            radii = (geography.obstacle_radii * self.zoom).astype(int)
+            visible = (radii > 1) & np.all(centres + radii[:, None] >= 0, axis=1) \
+                & (centres[:, 0] - radii < size[0]) & (centres[:, 1] - radii < size[1])
+            for centre, radius in zip(centres[visible].astype(int).tolist(), radii[visible].tolist()):
+                pygame.draw.circle(layer, (139, 69, 19), centre, radius)
 
         if show_obstacles:
-            for obs in geography.obstructions:
-                screen_pos = self._world_to_screen(obs.position)
-                screen_radius = int(obs.radius * self.zoom)
-                if screen_radius > 1:
-                    pygame.draw.circle(self.screen, (139, 69, 19), screen_pos, screen_radius)
-    
-    def _draw_ais_targets(self, ais_targets: list[AISTarget]):
-        for target in ais_targets:
-            pos = np.array([target.state.x, target.state.y])
-            cog_rad = target.state.cog_rad - np.pi / 2
-            target_size = 15 * self.zoom
-            if target_size < 2: continue
-            points = [(target_size, 0),(-target_size / 2, -target_size / 3),(-target_size / 2, target_size / 3),]
-            rot_matrix = np.array([[np.cos(cog_rad), -np.sin(cog_rad)], [np.sin(cog_rad), np.cos(cog_rad)]])
-            rotated_points = [rot_matrix @ p for p in points]
-            screen_pos = self._world_to_screen(pos)
-            screen_points = [(p[0] + screen_pos[0], p[1] + screen_pos[1]) for p in rotated_points]
-            pygame.draw.polygon(self.screen, (150, 150, 150), screen_points)
+            def to_layer(points):
+                return np.column_stack([points[..., 1].ravel(), -points[..., 0].ravel()]) * self.zoom - origin
+            for points in geography.polygons:
+                screen = to_layer(points)
+                if len(points) >= 3 and np.all(screen.max(axis=0) >= 0) and np.all(screen.min(axis=0) < size):
+                    pygame.draw.polygon(layer, (139, 69, 19), screen.astype(int).tolist())
+            coastline = geography.coastline()
+            if len(coastline):
+                ends = to_layer(coastline).reshape(-1, 2, 2)
+                visible = np.all(ends.max(axis=1) >= 0, axis=1) & np.all(ends.min(axis=1) < size, axis=1)
+                for start, end in ends[visible].astype(int).tolist():
+                    pygame.draw.line(layer, (60, 40, 20), start, end, 2)
+        return layer
+
+    def _depth_layer_image(self, geography: Geography, draft: float) -> pygame.Surface:
+        """Bathymetry colours at one pixel per cell, north up; rebuilt only when the grid or the draft changes."""
+        key = (geography, geography.depth_version, draft)
+        if key != self._depth_image_key:
+            colors = self._get_depth_colors(geography.depth_data, draft)
+            self._depth_image = pygame.surfarray.make_surface(np.ascontiguousarray(colors[::-1].transpose(1, 0, 2)))
+            self._depth_image_key = key
+        return self._depth_image
+
+    def _draw_ais_targets(self, states: np.ndarray):
+        """Culls targets (rows of `_ais_states`) off screen, then rotates and places all remaining glyph vertices at once."""
+        target_size = 15 * self.zoom
+        if not len(states) or target_size < 2: return
+        screen = self._world_to_screen_array(states[:, :2])
+        visible = self._visible(screen, margin=target_size)
+        if not visible.any(): return
+        screen, cog_rad = screen[visible], states[visible, 2] - np.pi / 2
+        cos, sin = np.cos(cog_rad)[:, None], np.sin(cog_rad)[:, None]
+        template = self.AIS_TRIANGLE * target_size
+        vertices = np.empty((len(screen), 3, 2))
+        vertices[..., 0] = cos * template[:, 0] - sin * template[:, 1] + screen[:, 0:1]
+        vertices[..., 1] = sin * template[:, 0] + cos * template[:, 1] + screen[:, 1:2]
+        for polygon in vertices.tolist():
+            pygame.draw.polygon(self.screen, (150, 150, 150), polygon)
 
     def _draw_vessel(self, vessel: BaseVessel):
         pos = vessel.state.eta[:2]
@@ -231,11 +456,17 @@ class Renderer:
         pygame.draw.polygon(self.screen, (255, 165, 0), screen_points)
         pygame.draw.polygon(self.screen, (255, 255, 255), screen_points, 1)
 
-    def _get_depth_color(self, depth: float, vessel_draft: float):
-        depth = abs(depth)
-        shallow_limit = vessel_draft * 1.2
-        deep_limit = vessel_draft * 2.0
-        if depth < shallow_limit: return (217, 102, 79)
-        elif depth > deep_limit: return (22, 85, 142)
-        else: return (71, 161, 201)
+    def _get_depth_colors(self, depth: np.ndarray, vessel_draft: float) -> np.ndarray:
+        """Shallow (< 1.2 draft), medium and deep (> 2 drafts) water colours as an (..., 3) uint8 array."""
+        depth = np.abs(depth)
+        colors = np.empty(depth.shape + (3,), dtype=np.uint8)
+        colors[:] = (71, 161, 201)
+        colors[depth < vessel_draft * 1.2] = (217, 102, 79)
+        colors[depth > vessel_draft * 2.0] = (22, 85, 142)
+        return colors
 
+def _ais_states(ais_targets: list[AISTarget]) -> np.ndarray:
+    """(n, 3) array of target x, y and course (rad)."""
+    if not ais_targets:
+        return np.zeros((0, 3))
+    return np.array([(target.state.x, target.state.y, target.state.cog_rad) for target in ais_targets], dtype=float)
@@ -0,0 +1,79 @@
+# app/video.py
+
+import os
+import shutil
+import subprocess
+import pygame
+from .renderer import Renderer
+
+class RawVideoSink:
+    """
+    Writes frames as packed RGB24 bytes to a binary stream (a pipe, stdout or a file).
+    원시 RGB 프레임을 바이너리 스트림에 기록합니다.
+
+    Read it back with e.g. `ffmpeg -f rawvideo -pix_fmt rgb24 -s WxH -r FPS -i - out.mp4`.
+    """
+    def __init__(self, stream):
+        self.stream = stream
+        self.frames = 0
+
+    def write(self, surface: pygame.Surface):
+        self.stream.write(pygame.image.tobytes(surface, 'RGB'))
+        self.frames += 1
+
+    def close(self):
+        self.stream.flush()
+
+class PngSequenceSink:
+    """Saves frames as numbered PNG files (`frame_000000.png`, ...) in a directory."""
+    def __init__(self, directory: str, prefix: str = 'frame'):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.prefix = prefix
+        self.frames = 0
+
+    def write(self, surface: pygame.Surface):
+        pygame.image.save(surface, os.path.join(self.directory, f"{self.prefix}_{self.frames:06d}.png"))
+        self.frames += 1
+
+    def close(self):
+        pass
+
+class FFmpegSink(RawVideoSink):
+    """Pipes raw frames into an `ffmpeg` process that encodes them to `output_path`."""
+    def __init__(self, output_path: str, size: tuple[int, int], fps: float):
+        executable = shutil.which('ffmpeg')
+        if executable is None:
+            raise RuntimeError("ffmpeg was not found on PATH; write raw frames or PNGs instead.")
+        command = [executable, '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                   '-s', f"{size[0]}x{size[1]}", '-r', str(fps), '-i', '-',
+                   '-pix_fmt', 'yuv420p', output_path]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        super().__init__(self.process.stdin)
+
+    def close(self):
+        self.stream.close()
+        self.process.wait()
+
+def frame_interval(dt: float, fps: float, speedup: float = 1.0) -> int:
+    """Physics steps per recorded frame so that the video plays `speedup` times faster than simulated time."""
+    return max(1, int(round(speedup / (fps * dt))))
+
+def record(simulator, renderer: Renderer, sink, duration: float, dt: float, control: dict,
+           every: int = 1, follow: bool = True) -> int:
+    """
+    Runs `simulator` for `duration` seconds and renders every `every`-th physics step into `sink`.
+    With `follow`, the camera is recentred on the vessel before each frame. Returns the number of frames.
+    """
+    steps = int(round(duration / dt))
+    for i in range(steps):
+        simulator.step(dt, control)
+        if i % every == 0:
+            if follow:
+                renderer.recenter(simulator.vessel.state.eta[:2])
+            renderer.render(simulator, control)
+            sink.write(renderer.screen)
+        if simulator.collision_detected:
+            break
+    sink.close()
+    return sink.frames
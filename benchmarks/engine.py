@@ -0,0 +1,336 @@
+# benchmarks/engine.py
+"""
+Throughput benchmarks for the core engine, with stored baselines.
+
+Every case is a hot path at one scale (vessels, targets, obstacles, queries or grid
+size). A case reports throughput in items per second: best-of-`repeat` timing of
+its callable divided into the number of items one call processes.
+
+    python -m benchmarks.engine                  # run and compare with the baseline
+    python -m benchmarks.engine --save           # run and store as the new baseline
+    python -m benchmarks.engine -k mmg_forces    # only cases whose key contains the string
+
+The run fails (exit code 1) when any case's throughput falls more than `--threshold`
+(default 25%) below its baseline. Baselines are machine specific; re-save them
+when the benchmark machine changes.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable
+import numpy as np
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+DEFAULT_THRESHOLD = 0.25
+KCS_PARAMS = 'data/vessel_params/kcs_hydrodynamics.json'
+SAMPLE_DEPTH = 'data/bathymetry/sample_depth.csv'
+
+@dataclass
+class Case:
+    """One benchmarked path at one scale; `setup` builds the state and returns the callable to time."""
+    name: str
+    scale: str
+    items: int
+    setup: Callable[[], Callable[[], object]]
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.scale}]"
+
+def _specs():
+    from vds.models.vessels.base_vessel import VesselSpecifications
+    return VesselSpecifications(loa=232.5, beam=32.2, draft=10.8, mass=5.2e7, inertia_z=2.17e10,
+                                wind_area_longitudinal=800.0, wind_area_transverse=2500.0)
+
+def _environment():
+    from vds.environment.wind import Wind
+    from vds.environment.current import Current
+    from vds.environment.waves import Waves
+    return Wind(speed=15.0, direction=45.0), Current(speed=1.0, direction=90.0), \
+        Waves(significant_height=2.0, period=8.0, direction=30.0)
+
+def _geography(size: int, obstacles: int = 0):
+    from vds.environment.geography import Geography
+    rng = np.random.default_rng(0)
+    geography = Geography(-rng.uniform(5.0, 60.0, (size, size)), 20.0)
+    if obstacles:
+        geography.set_obstacles(rng.uniform(0, 20.0 * size, (obstacles, 2)), rng.uniform(5.0, 30.0, obstacles))
+    return geography
+
+def _ais_table(tracks: int, points: int = 10):
+    """AIS table of `tracks` straight tracks with `points` fixes each, in the sample CSV's columns."""
+    rng = np.random.default_rng(0)
+    start = rng.uniform(0, 5000.0, (tracks, 1, 2))
+    velocity = rng.uniform(-5.0, 5.0, (tracks, 1, 2))
+    times = np.arange(points) * 60.0
+    positions = start + velocity * times[None, :, None]
+    return {'timestamp': np.tile(times, tracks), 'mmsi': np.repeat(np.arange(tracks) + 440000000, points),
+            'x': positions[..., 0].ravel(), 'y': positions[..., 1].ravel(),
+            'sog_kts': np.full(tracks * points, 10.0), 'cog_deg': np.full(tracks * points, 45.0)}
+
+def _ais_targets(count: int):
+    from vds.data_handler.ais_parser import targets_from_table
+    return targets_from_table(_ais_table(count))
+
+def _simulator(ais: int = 0, obstacles: int = 0, grid: int = 10):
+    from vds.core.simulator import Simulator
+    from vds.models.vessels.base_vessel import BaseVessel, VesselState
+    from vds.models.dynamics.mmg_model import MMGModel
+    specs = _specs()
+    vessel = BaseVessel(specs, VesselState(eta=np.array([100.0, 100.0, 0, 0, 0, 0]),
+                                           nu=np.array([7.7, 0, 0, 0, 0, 0])))
+    wind, current, waves = _environment()
+    sim = Simulator(vessel, MMGModel(specs, KCS_PARAMS), _geography(grid, obstacles), _ais_targets(ais) if ais else [],
+                    wind, current, waves, seed=0)
+    sim.waypoints = [{'name': 'WP1', 'position': [100000.0, 100.0]}]
+    sim.set_autopilot(True)
+    return sim
+
+def _mmg_single():
+    from vds.models.dynamics.mmg_model import MMGModel
+    from vds.models.vessels.base_vessel import VesselState
+    model = MMGModel(_specs(), KCS_PARAMS)
+    state = VesselState(nu=np.array([7.7, 0.1, 0, 0, 0, 0.002]))
+    control = {'rpm': 100.0, 'rudder_angle': 10.0}
+    wind, current, waves = _environment()
+    return lambda: model.calculate_forces(state, control, 50.0, wind, current, waves)
+
+def _mmg_batched(n: int):
+    from vds.models.dynamics.mmg_model import MMGModel
+    from vds.models.dynamics.batched_mmg_model import BatchedMMGModel
+    model = BatchedMMGModel.from_model(MMGModel(_specs(), KCS_PARAMS))
+    eta = np.zeros((n, 6))
+    nu = np.tile([7.7, 0.1, 0, 0, 0, 0.002], (n, 1))
+    rudder = np.linspace(-35, 35, n)
+    wind, current, waves = _environment()
+    return lambda: model.calculate_forces(eta, nu, 100.0, rudder, 50.0, wind, current, waves)
+
+def _kinematics_single():
+    from vds.core.kinematics import update_kinematics_6dof
+    from vds.models.vessels.base_vessel import VesselState
+    state = VesselState(nu=np.array([7.7, 0.1, 0, 0.001, 0.001, 0.002]))
+    return lambda: update_kinematics_6dof(state, 0.1)
+
+def _kinematics_batch(n: int):
+    from vds.core.kinematics import update_kinematics_batch
+    eta = np.zeros((n, 6))
+    nu = np.tile([7.7, 0.1, 0, 0.001, 0.001, 0.002], (n, 1))
+    return lambda: update_kinematics_batch(eta, nu, 0.1)
+
+def _simulator_step(ais: int):
+    sim = _simulator(ais=ais)
+    control = {'rpm': 100.0, 'rudder_angle': 0.0}
+    return lambda: sim.step(0.1, control)
+
+def _ais_update(n: int):
+    targets = _ais_targets(n)
+    clock = [0.0]
+    def update():
+        clock[0] += 0.1
+        for target in targets:
+            target.update(clock[0])
+    return update
+
+def _collisions(n: int):
+    sim = _simulator(obstacles=n, grid=500)
+    return sim.check_collisions
+
+def _depth_scalar(grid: int):
+    geography = _geography(grid)
+    return lambda: geography.get_depth_at(1234.5, 987.6)
+
+def _depth_vector(grid: int, n: int):
+    geography = _geography(grid)
+    points = np.random.default_rng(1).uniform(0, grid * geography.cell_size, (2, n))
+    return lambda: geography.get_depths_at(points[0], points[1])
+
+def _write_temp_csv(write) -> str:
+    handle, path = tempfile.mkstemp(suffix='.csv', prefix='vds-bench-')
+    os.close(handle)
+    atexit.register(os.remove, path)
+    write(path)
+    return path
+
+def _load_bathymetry(grid: int):
+    from vds.environment.geography import Geography
+    if grid == 10:
+        path = SAMPLE_DEPTH
+    else:
+        path = _write_temp_csv(lambda p: np.savetxt(p, _geography(grid).depth_data, delimiter=',', fmt='%.2f'))
+    return lambda: Geography.from_csv(path, 20.0)
+
+def _load_ais(tracks: int):
+    import pandas as pd
+    from vds.data_handler.ais_parser import load_ais_targets
+    path = _write_temp_csv(lambda p: pd.DataFrame(_ais_table(tracks)).to_csv(p, index=False))
+    return lambda: load_ais_targets(path)
+
+def _renderer_frame(ais: int, grid: int, track: int = 200):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    from app.renderer import Renderer
+    from vds.core.track_history import TrackHistory
+    renderer = Renderer(1280, 720)
+    sim = _simulator(ais=ais, grid=grid, obstacles=20)
+    sim.track_history = TrackHistory(maxlen=max(track, 10000))
+    control = {'rpm': 100.0, 'rudder_angle': 5.0}
+    for _ in range(track):
+        sim.step(0.1, control)
+    renderer.recenter(sim.vessel.state.eta[:2])
+    return lambda: renderer.render(sim, control)
+
+def _radar_sweep(grid: int, obstacles: int = 0, ais: int = 0):
+    from vds.core.radar import Radar
+    radar = Radar(n_bearings=1024)
+    sim = _simulator(ais=ais, grid=grid, obstacles=obstacles)
+    sim.vessel.state.eta[:2] = 10.0 * grid  # Centre of the grid
+    return lambda: radar.sweep(sim)
+
+def _shore_query(edges: int, points: int):
+    from vds.environment.shoreline import SegmentBVH
+    rng = np.random.default_rng(0)
+    starts = rng.uniform(0.0, 100_000.0, (edges, 2))
+    segments = np.stack([starts, starts + rng.uniform(-50.0, 50.0, (edges, 2))], axis=1)
+    bvh = SegmentBVH(segments)
+    queries = rng.uniform(0.0, 100_000.0, (points, 2))
+    return lambda: (bvh.nearest(queries), bvh.hull_contacts(queries, np.zeros(points), 300.0, 50.0))
+
+def _steady_equilibrium(n: int):
+    from vds.core.performance import solve_equilibrium
+    from vds.models.dynamics.mmg_model import MMGModel
+    from vds.models.dynamics.batched_mmg_model import BatchedMMGModel
+    model = BatchedMMGModel.from_model(MMGModel(_specs(), KCS_PARAMS))
+    rpm, rudder = np.linspace(40.0, 200.0, n), np.linspace(-35.0, 35.0, n)
+    return lambda: solve_equilibrium(model, rpm, rudder)
+
+def _hydro_fit(n: int):
+    from vds.core.hydro_identification import TrialData, fit_hydro_params
+    from vds.models.dynamics.mmg_model import MMGModel
+    from vds.models.dynamics.batched_mmg_model import BatchedMMGModel
+    truth = MMGModel(_specs(), KCS_PARAMS)
+    rng = np.random.default_rng(0)
+    nu = np.zeros((n, 6))
+    nu[:, 0], nu[:, 1], nu[:, 5] = rng.uniform(2.0, 8.0, n), rng.uniform(-0.5, 0.5, n), rng.uniform(-0.01, 0.01, n)
+    rpm, rudder = rng.uniform(50.0, 150.0, n), rng.uniform(-35.0, 35.0, n)
+    accel = BatchedMMGModel.from_model(truth).calculate_forces(np.zeros((n, 6)), nu, rpm, rudder)[:, [0, 1, 5]]
+    data = TrialData(np.zeros(n), nu, rpm, rudder, accel)
+    start = MMGModel(_specs(), {**truth.p, 'Y_v_prime': 1.2 * truth.p['Y_v_prime'], 'N_r_prime': 0.8 * truth.p['N_r_prime'],
+                                'k_1': 0.9 * truth.p['k_1']})
+    return lambda: fit_hydro_params(start, data)
+
+def cases() -> list[Case]:
+    return [
+        Case('mmg_forces', '1', 1, _mmg_single),
+        Case('mmg_forces', '100', 100, lambda: _mmg_batched(100)),
+        Case('mmg_forces', '10k', 10_000, lambda: _mmg_batched(10_000)),
+        Case('kinematics', '1', 1, _kinematics_single),
+        Case('kinematics', '100', 100, lambda: _kinematics_batch(100)),
+        Case('kinematics', '10k', 10_000, lambda: _kinematics_batch(10_000)),
+        Case('simulator_step', '1', 1, lambda: _simulator_step(0)),
+        Case('simulator_step', '100ais', 1, lambda: _simulator_step(100)),
+        Case('ais_update', '1', 1, lambda: _ais_update(1)),
+        Case('ais_update', '100', 100, lambda: _ais_update(100)),
+        Case('ais_update', '10k', 10_000, lambda: _ais_update(10_000)),
+        Case('collisions', '1', 1, lambda: _collisions(1)),
+        Case('collisions', '100', 100, lambda: _collisions(100)),
+        Case('collisions', '10k', 10_000, lambda: _collisions(10_000)),
+        Case('depth_query', 'small', 1, lambda: _depth_scalar(10)),
+        Case('depth_query', 'large', 1, lambda: _depth_scalar(2000)),
+        Case('depth_query', 'large-10k', 10_000, lambda: _depth_vector(2000, 10_000)),
+        Case('load_bathymetry', 'small', 100, lambda: _load_bathymetry(10)),
+        Case('load_bathymetry', 'large', 250_000, lambda: _load_bathymetry(500)),
+        Case('load_ais', '100', 100, lambda: _load_ais(100)),
+        Case('load_ais', '10k', 10_000, lambda: _load_ais(10_000)),
+        Case('renderer_frame', 'small', 1, lambda: _renderer_frame(0, 10)),
+        Case('renderer_frame', '100ais', 1, lambda: _renderer_frame(100, 10)),
+        Case('renderer_frame', 'large', 1, lambda: _renderer_frame(0, 200)),
+        Case('renderer_frame', '10kais', 1, lambda: _renderer_frame(10_000, 10)),
+        Case('renderer_frame', '100k-track', 1, lambda: _renderer_frame(0, 10, track=100_000)),
+        Case('radar_sweep', 'small', 1024, lambda: _radar_sweep(10, obstacles=20)),
+        Case('radar_sweep', 'large', 1024, lambda: _radar_sweep(200)),
+        Case('radar_sweep', '10k-obstacles', 1024, lambda: _radar_sweep(200, obstacles=10_000)),
+        Case('radar_sweep', '100ais', 1024, lambda: _radar_sweep(200, ais=100)),
+        Case('shore_query', '1', 1, lambda: _shore_query(1000, 1)),
+        Case('shore_query', '100k-edges', 100, lambda: _shore_query(100_000, 100)),
+        Case('steady_equilibrium', '1', 1, lambda: _steady_equilibrium(1)),
+        Case('steady_equilibrium', '1k', 1000, lambda: _steady_equilibrium(1000)),
+        Case('hydro_fit', 'small', 10_000, lambda: _hydro_fit(10_000)),
+        Case('hydro_fit', '1M', 1_000_000, lambda: _hydro_fit(1_000_000)),
+    ]
+
+def measure(case: Case, min_time: float = 0.2, repeat: int = 5) -> dict:
+    """Best-of-`repeat` seconds per call, each repeat running at least `min_time / repeat` seconds."""
+    fn = case.setup()
+    fn()  # Warm-up, and a first estimate of the per-call time
+    start = time.perf_counter()
+    fn()
+    number = max(1, int(min_time / repeat / max(time.perf_counter() - start, 1e-9)))
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return {'seconds_per_call': best, 'throughput': case.items / best}
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """Keys of the cases whose throughput dropped more than `threshold` below the baseline."""
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference and result['throughput'] < reference['throughput'] * (1.0 - threshold):
+            regressions.append(key)
+    return regressions
+
+def load_baseline(path: str = BASELINE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)['results']
+
+def save_baseline(results: dict, path: str = BASELINE_PATH):
+    """Merges `results` into the stored baseline, so a filtered run only replaces its own cases."""
+    merged = {**load_baseline(path), **results}
+    with open(path, 'w') as f:
+        json.dump({'machine': {'python': platform.python_version(), 'numpy': np.__version__,
+                               'processor': platform.processor() or platform.machine()},
+                   'results': dict(sorted(merged.items()))}, f, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Core engine throughput benchmarks.")
+    parser.add_argument('-k', '--filter', default='', help="Only run cases whose key contains this string.")
+    parser.add_argument('--save', action='store_true', help="Store the results as the new baseline.")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed throughput drop relative to the baseline (0.25 = 25%%).")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Seconds of timing per case.")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    results = {}
+    for case in cases():
+        if args.filter not in case.key:
+            continue
+        result = measure(case, args.min_time)
+        results[case.key] = result
+        reference = baseline.get(case.key)
+        ratio = f"{result['throughput'] / reference['throughput']:6.2f}x" if reference else '     -'
+        print(f"{case.key:<28} {result['seconds_per_call'] * 1e6:12.1f} us/call {result['throughput']:14.0f} items/s  {ratio}")
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return
+    regressions = compare(results, baseline, args.threshold)
+    for key in regressions:
+        print(f"REGRESSION: {key} is more than {args.threshold:.0%} below its baseline")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    main()
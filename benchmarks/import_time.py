@@ -0,0 +1,83 @@
+# benchmarks/import_time.py
+"""
+Import-time benchmark for headless use.
+
+Each entry point is imported in a fresh interpreter, several times, and its median
+cost above a bare `import numpy` is compared with the budget. Headless entry points
+must also not load any of the heavy optional dependencies in `HEAVY_MODULES`; those
+are imported only on the code paths that need them (CSV parsing, plotting, rendering,
+route planning, fleet k-d trees).
+
+    python -m benchmarks.import_time [--repeat 5] [--budget 0.15]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ('pandas', 'scipy', 'pygame', 'matplotlib')
+HEADLESS_ENTRY_POINTS = (
+    'vds.core.simulator',
+    'vds.core.monte_carlo',
+    'vds.core.predictor',
+    'vds.utils.logger',
+    'scenarios.scenario_loader',
+)
+IMPORT_BUDGET_S = 0.15  # Median cost of an entry point on top of numpy
+
+_PROBE = """
+import sys, time, json
+import numpy
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def probe_import(module: str) -> dict:
+    """Imports `module` in a fresh interpreter: its cost above numpy and the heavy modules it pulled in."""
+    script = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, '-c', script], check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def measure(modules=HEADLESS_ENTRY_POINTS, repeat: int = 5) -> dict:
+    """Median import time and heavy dependencies of each module over `repeat` fresh interpreters."""
+    results = {}
+    for module in modules:
+        probes = [probe_import(module) for _ in range(repeat)]
+        results[module] = {'median_s': statistics.median(p['seconds'] for p in probes),
+                           'heavy': probes[0]['heavy']}
+    return results
+
+def check(results: dict, budget: float = IMPORT_BUDGET_S) -> list[str]:
+    """Budget violations of a `measure` result, as human-readable messages."""
+    failures = []
+    for module, result in results.items():
+        if result['heavy']:
+            failures.append(f"{module} imports {', '.join(result['heavy'])}")
+        if result['median_s'] > budget:
+            failures.append(f"{module} takes {result['median_s'] * 1e3:.0f} ms (budget {budget * 1e3:.0f} ms)")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure headless import times against the import budget.")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=IMPORT_BUDGET_S, help="Seconds per entry point above numpy.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = measure(repeat=args.repeat)
+    for module, result in results.items():
+        heavy = ', '.join(result['heavy']) or '-'
+        print(f"{module:<30} {result['median_s'] * 1e3:8.1f} ms   heavy: {heavy}")
+    failures = check(results, args.budget)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print(f"Measured {len(results)} entry points in {time.perf_counter() - start:.1f} s.")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+# build_performance.py
+
+import argparse
+import yaml
+from vds.core.performance import build_performance_table, default_performance_path
+from vds.models.dynamics.batched_mmg_model import BatchedMMGModel
+from vds.models.dynamics.mmg_model import MMGModel
+from vds.models.vessels.base_vessel import VesselSpecifications
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve steady speed-rpm and turning tables for a scenario's vessel.")
+    parser.add_argument('scenario', type=str, help="Scenario YAML whose vessel specs and hydro file are used.")
+    parser.add_argument('--hydro', type=str, default=None,
+                        help="Hydro parameter JSON to use instead of the scenario's own.")
+    parser.add_argument('--output', type=str, default=None,
+                        help="Tables to write. Defaults to <vessel>_performance.json next to the hydro file.")
+    parser.add_argument('--max-rpm', type=float, default=300.0)
+    parser.add_argument('--rpm-steps', type=int, default=31)
+    parser.add_argument('--max-rudder', type=float, default=35.0, help="Largest rudder angle (deg).")
+    parser.add_argument('--rudder-steps', type=int, default=15)
+    parser.add_argument('--head-winds', type=float, nargs='+', default=[0.0, 10.0, 20.0, 30.0, 40.0],
+                        help="Head wind speeds (kts) of the speed table; uniformly spaced.")
+    args = parser.parse_args()
+
+    with open(args.scenario, 'r') as f:
+        vessel_conf = yaml.safe_load(f)['vessel']
+    hydro_path = args.hydro or vessel_conf['hydro_params']
+    model = BatchedMMGModel.from_model(MMGModel(VesselSpecifications(**vessel_conf['specs']), hydro_path))
+    table = build_performance_table(model, args.max_rpm, args.rpm_steps, args.max_rudder, args.rudder_steps,
+                                    args.head_winds)
+
+    output_path = args.output or default_performance_path(hydro_path)
+    table.save(output_path, {'scenario': args.scenario, 'hydro_params': hydro_path})
+    print(f"Performance tables saved to {output_path}")
+    for rpm in table.rpm[::5]:
+        print(f"  {rpm:6.1f} rpm: {table.speed_at(rpm) / 0.514444:5.1f} kts, "
+              f"turning radius at {args.max_rudder:g} deg {table.turning_radius(rpm, args.max_rudder):8.0f} m")
+    if not table.converged.all():
+        print(f"  {int((~table.converged).sum())} turning states have no steady solution (directionally unstable hull).")
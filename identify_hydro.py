@@ -0,0 +1,56 @@
+# identify_hydro.py
+
+import argparse
+import json
+import logging
+import os
+import sys
+import yaml
+from vds.core.hydro_identification import (DEFAULT_FIT_KEYS, TrialData, fit_hydro_params, save_hydro_params,
+                                           trial_from_csv, trial_from_run_log)
+from vds.data_handler.run_log import RunLog
+from vds.environment.wind import Wind
+from vds.environment.current import Current
+from vds.environment.waves import Waves
+from scenarios.scenario_loader import load_scenario
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit hydrodynamic derivatives to logged trials.")
+    parser.add_argument('logs', type=str, nargs='+', help="Run log directories (*.vdslog) or DataLogger CSV files.")
+    parser.add_argument('--scenario', type=str, default=None,
+                        help="Scenario YAML with the vessel and environment (default: the one recorded in the first run log).")
+    parser.add_argument('--params', type=str, nargs='+', default=list(DEFAULT_FIT_KEYS), help="Derivatives to fit.")
+    parser.add_argument('--output', type=str, default=None,
+                        help="Hydro JSON to write. Defaults to <vessel>_identified_hydrodynamics.json next to the original.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    run_logs = [RunLog(path) for path in args.logs if os.path.isdir(path)]
+    scenario_path = args.scenario or (run_logs[0].attributes.get('scenario_path') if run_logs else None)
+    if scenario_path is None:
+        sys.exit("No scenario given and none recorded in the logs; pass --scenario.")
+    vessel, dynamics_model, _, _, wind, current, waves, *_ = load_scenario(scenario_path)
+    environments = {json.dumps({key: log.attributes.get(key) for key in ('wind', 'current', 'waves')}) for log in run_logs}
+    if len(environments) > 1:
+        sys.exit("The run logs were recorded in different wind, current or wave conditions; fit them separately.")
+    if run_logs and 'wind' in run_logs[0].attributes:
+        attributes = run_logs[0].attributes
+        wind = Wind(speed=attributes['wind'][0], direction=attributes['wind'][1])
+        current = Current(speed=attributes['current'][0], direction=attributes['current'][1])
+        waves = Waves(significant_height=attributes['waves'][0], period=attributes['waves'][1], direction=attributes['waves'][2])
+
+    data = TrialData.concatenate([trial_from_run_log(path) if os.path.isdir(path) else trial_from_csv(path)
+                                  for path in args.logs])
+    result = fit_hydro_params(dynamics_model, data, args.params, wind, current, waves)
+    print(f"{result.samples} samples, {result.iterations} iterations, cost {result.initial_cost:.4g} -> {result.cost:.4g}")
+    for name, value in result.fitted.items():
+        print(f"  {name:12s} {result.initial[name]:10.5f} -> {value:10.5f} (± {result.std_errors[name]:.2g})")
+
+    output_path = args.output
+    if output_path is None:
+        with open(scenario_path, 'r') as f:
+            hydro_path = yaml.safe_load(f)['vessel']['hydro_params']
+        output_path = hydro_path.replace('_hydrodynamics', '_identified_hydrodynamics')
+        if output_path == hydro_path:
+            output_path = hydro_path.replace('.json', '_identified.json')
+    save_hydro_params(output_path, result, {'logs': args.logs, 'scenario': scenario_path})
@@ -1,10 +1,11 @@
 # main.py
 
+import logging
 import pygame
 import sys
 import os
+import time
 import numpy as np
-import yaml
 from app.renderer import Renderer
 from vds.core.simulator import Simulator
 from vds.utils.logger import DataLogger
@@ -12,7 +13,11 @@ from scenarios.scenario_loader import load_scenario
 from vds.environment.wind import Wind
 from vds.environment.current import Current
 from vds.environment.waves import Waves
-from vds.core.autopilot import Autopilot
+from vds.core.predictor import TrajectoryPredictor, PredictorWorker
+from vds.models.dynamics.batched_mmg_model import BatchedMMGModel
+from vds.core.mpc import SamplingMPC
+from vds.utils.profiler import Profiler
+from vds.core.events import print_event
 
 def vessel_selection_loop(renderer, clock):
     """Loop for the initial scenario selection screen."""
@@ -83,6 +88,7 @@ def settings_loop(renderer, clock, default_env):
         clock.tick(30)
 
 def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
     renderer = Renderer(SCREEN_WIDTH, SCREEN_HEIGHT)
     clock = pygame.time.Clock()
@@ -91,7 +97,7 @@ def main():
     if scenario_path is None:
         pygame.quit(); sys.exit()
 
-    vessel, dynamics_model, geography, ais_targets, wind, current, waves, initial_control, waypoints = load_scenario(scenario_path)
+    vessel, dynamics_model, geography, ais_targets, wind, current, waves, initial_control, waypoints, autopilot, streams = load_scenario(scenario_path)
     
     default_env = {'wind': wind, 'current': current, 'waves': waves}
     env_factors = settings_loop(renderer, clock, default_env)
@@ -99,15 +105,21 @@ def main():
         pygame.quit(); sys.exit()
     wind, current, waves = env_factors
     
-    simulator = Simulator(vessel, dynamics_model, geography, ais_targets, wind, current, waves)
+    simulator = Simulator(vessel, dynamics_model, geography, ais_targets, wind, current, waves, autopilot, seed=streams)
     simulator.waypoints = waypoints
+    simulator.events.subscribe(print_event)
     
-    with open(scenario_path, 'r') as f:
-        config = yaml.safe_load(f)
-        simulator.show_obstacles = config.get('environment', {}).get('obstacles', {}).get('enabled', False)
-
-    logger = DataLogger()
-    autopilot = Autopilot()
+    # Obstacles are only loaded when the scenario enables them
+    simulator.show_obstacles = geography.has_obstructions
+
+    run_log_path = os.path.join('output', f"run_{time.strftime('%Y%m%d_%H%M%S')}.vdslog")
+    logger = DataLogger(run_log_path, attributes={
+        'scenario_path': scenario_path,
+        'wind': [wind.speed, wind.direction], 'current': [current.speed, current.direction],
+        'waves': [waves.significant_height, waves.period, waves.direction]})
+    batched_model = BatchedMMGModel.from_model(dynamics_model)
+    renderer.predictor = PredictorWorker(TrajectoryPredictor(batched_model))
+    simulator.collision_avoidance = SamplingMPC(batched_model, vessel.specs.loa, vessel.specs.draft)
 
     running = True
     dt = 0.1
@@ -118,8 +130,9 @@ def main():
     camera_locked = True
     panning = False
     pan_start_pos = (0, 0)
+    profiler = None
 
-    print("Controls: '0': Center Rudder | 'R': Reset | 'O': Obstacles | 'W': Water | 'P': Pause | 'C': Camera Lock | 'M': Minimap | 'A': Autopilot")
+    print("Controls: '0': Center Rudder | 'R': Reset | 'O': Obstacles | 'W': Water | 'P': Pause | 'C': Camera Lock | 'M': Minimap | 'F': Forecast | 'A': Autopilot | 'V': Avoidance | 'T': Profiler")
 
     while running:
         for event in pygame.event.get():
@@ -143,19 +156,29 @@ def main():
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_c: camera_locked = not camera_locked
                 elif event.key == pygame.K_a:
-                    simulator.autopilot_enabled = not simulator.autopilot_enabled
-                    autopilot.reset()
-                    print(f"Autopilot {'ENGAGED' if simulator.autopilot_enabled else 'DISENGAGED'}.")
+                    simulator.set_autopilot(not simulator.autopilot_enabled)
+                    if simulator.autopilot_enabled:
+                        print("Autopilot ENGAGED.")  # Disengaging is reported as an event
                 elif event.key == pygame.K_LEFT: control['rudder_angle'] = max(-RUDDER_MAX, control['rudder_angle'] - RUDDER_INCREMENT)
                 elif event.key == pygame.K_RIGHT: control['rudder_angle'] = min(RUDDER_MAX, control['rudder_angle'] + RUDDER_INCREMENT)
                 elif event.key == pygame.K_UP: control['rpm'] = min(RPM_MAX, control['rpm'] + RPM_INCREMENT)
                 elif event.key == pygame.K_DOWN: control['rpm'] = max(RPM_MIN, control['rpm'] - RPM_INCREMENT)
                 elif event.key == pygame.K_0 or event.key == pygame.K_KP0: control['rudder_angle'] = 0.0
-                elif event.key == pygame.K_r: simulator.reset(); control = initial_control.copy(); autopilot.reset()
+                elif event.key == pygame.K_r: simulator.reset(); control = initial_control.copy()
                 elif event.key == pygame.K_o: simulator.show_obstacles = not simulator.show_obstacles
                 elif event.key == pygame.K_w: simulator.show_water_depth = not simulator.show_water_depth
                 elif event.key == pygame.K_p: simulator.is_paused = not simulator.is_paused
                 elif event.key == pygame.K_m: simulator.show_minimap = not simulator.show_minimap
+                elif event.key == pygame.K_f: simulator.show_prediction = not simulator.show_prediction
+                elif event.key == pygame.K_v:
+                    simulator.avoidance_enabled = not simulator.avoidance_enabled
+                    simulator.collision_avoidance.reset()
+                elif event.key == pygame.K_t:
+                    if simulator.profiler is None:
+                        profiler = profiler or Profiler()
+                        simulator.profiler = renderer.profiler = profiler
+                    else:
+                        simulator.profiler = renderer.profiler = None
 
         if panning:
             mouse_delta = np.array(pygame.mouse.get_pos()) - np.array(pan_start_pos)
@@ -163,11 +186,6 @@ def main():
         elif camera_locked:
             renderer.recenter(simulator.vessel.state.eta[:2])
 
-        if simulator.autopilot_enabled and simulator.current_waypoint_index < len(simulator.waypoints):
-            target_pos = np.array(simulator.waypoints[simulator.current_waypoint_index]['position'])
-            control['rudder_angle'] = autopilot.calculate_rudder_angle(
-                simulator.vessel.state.eta[:2], simulator.vessel.state.eta[5], target_pos, dt)
-
         if not simulator.collision_detected:
             if not simulator.is_paused:
                 logger.log(simulator, control)
@@ -178,6 +196,11 @@ def main():
         clock.tick(60)
         
     logger.save()
+    if profiler is not None:
+        profiler.save_json(os.path.join('output', 'profile.json'))
+        profiler.save_chrome_trace(os.path.join('output', 'profile_trace.json'))
+        print("Profile saved to output/profile.json (Chrome trace: output/profile_trace.json)")
+    renderer.predictor.stop()
     pygame.quit()
     sys.exit()
 
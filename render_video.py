@@ -0,0 +1,49 @@
+# render_video.py
+
+import argparse
+import contextlib
+import sys
+import time
+from app.renderer import Renderer
+from app.video import FFmpegSink, PngSequenceSink, RawVideoSink, frame_interval, record
+from vds.core.simulator import Simulator
+from scenarios.scenario_loader import load_scenario
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a scenario run to video frames without a display.")
+    parser.add_argument('scenario', type=str, help="Path to a scenario YAML file.")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument('--png', type=str, help="Directory for numbered PNG frames.")
+    output.add_argument('--raw', type=str, help="File for raw RGB24 frames, or '-' for stdout (e.g. piped to ffmpeg).")
+    output.add_argument('--mp4', type=str, help="Video file encoded with ffmpeg.")
+    parser.add_argument('--duration', type=float, default=3600.0, help="Simulated time (s).")
+    parser.add_argument('--dt', type=float, default=0.1, help="Physics time step (s).")
+    parser.add_argument('--fps', type=float, default=30.0, help="Video frame rate.")
+    parser.add_argument('--speedup', type=float, default=60.0, help="Simulated seconds per video second.")
+    parser.add_argument('--size', type=int, nargs=2, default=[1280, 720], metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument('--zoom', type=float, default=0.5, help="Screen pixels per metre.")
+    parser.add_argument('--no-autopilot', action='store_true', help="Keep the scenario's initial rudder instead.")
+    args = parser.parse_args()
+
+    vessel, dynamics_model, geography, ais_targets, wind, current, waves, initial_control, waypoints, autopilot, streams = \
+        load_scenario(args.scenario)
+    simulator = Simulator(vessel, dynamics_model, geography, ais_targets, wind, current, waves, autopilot, seed=streams)
+    simulator.waypoints = waypoints
+    simulator.show_obstacles = geography.has_obstructions
+    simulator.set_autopilot(bool(waypoints) and not args.no_autopilot)
+
+    renderer = Renderer(*args.size, headless=True)
+    renderer.zoom = args.zoom
+    if args.png:
+        sink = PngSequenceSink(args.png)
+    elif args.raw:
+        sink = RawVideoSink(sys.stdout.buffer if args.raw == '-' else open(args.raw, 'wb'))
+    else:
+        sink = FFmpegSink(args.mp4, tuple(args.size), args.fps)
+
+    start = time.perf_counter()
+    every = frame_interval(args.dt, args.fps, args.speedup)
+    # Simulation messages go to stderr so they never mix with frames written to stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        frames = record(simulator, renderer, sink, args.duration, args.dt, initial_control.copy(), every=every)
+    print(f"Rendered {frames} frames (every {every} steps) in {time.perf_counter() - start:.1f} s.", file=sys.stderr)
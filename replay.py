@@ -0,0 +1,80 @@
+# replay.py
+
+import argparse
+import sys
+import pygame
+from app.renderer import Renderer
+from vds.core.replay import ReplayPlayer
+from vds.core.simulator import Simulator
+from vds.data_handler.run_log import RunLog
+from vds.environment.wind import Wind
+from vds.environment.current import Current
+from vds.environment.waves import Waves
+from scenarios.scenario_loader import load_scenario
+
+def build_replay_simulator(log: RunLog, scenario_path: str = None) -> Simulator:
+    """A simulator with the logged scenario and environment, used only to hold the replayed state."""
+    attributes = log.attributes
+    vessel, dynamics_model, geography, ais_targets, wind, current, waves, _, waypoints, autopilot, streams = \
+        load_scenario(scenario_path or attributes['scenario_path'])
+    if 'wind' in attributes:
+        wind = Wind(speed=attributes['wind'][0], direction=attributes['wind'][1])
+        current = Current(speed=attributes['current'][0], direction=attributes['current'][1])
+        waves = Waves(significant_height=attributes['waves'][0], period=attributes['waves'][1],
+                      direction=attributes['waves'][2])
+    simulator = Simulator(vessel, dynamics_model, geography, ais_targets, wind, current, waves, autopilot, seed=streams)
+    simulator.waypoints = waypoints
+    simulator.show_obstacles = geography.has_obstructions
+    return simulator
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play back a run log recorded by main.py.")
+    parser.add_argument('log', type=str, help="Run log directory (output/run_*.vdslog).")
+    parser.add_argument('--scenario', type=str, default=None, help="Scenario YAML, if it moved since the run.")
+    parser.add_argument('--speed', type=float, default=1.0, help="Initial playback speed.")
+    args = parser.parse_args()
+
+    log = RunLog(args.log)
+    if len(log) == 0:
+        sys.exit(f"'{args.log}' has no rows.")
+    renderer = Renderer(1280, 720)
+    pygame.display.set_caption("Vessel Dynamics Simulator - Replay")
+    player = ReplayPlayer(log, build_replay_simulator(log, args.scenario))
+    player.speed = args.speed
+    renderer.replay = player
+    simulator = player.simulator
+    clock = pygame.time.Clock()
+
+    print("Controls: SPACE: Play/Pause | LEFT/RIGHT: -/+10 s (SHIFT: 60 s) | UP/DOWN: Speed x2 / /2 | "
+          "B: Reverse | ',' '.': Step | HOME/END: Start/End | Click bar: Seek")
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT: running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                bar = renderer.replay_bar_rect()
+                if bar.inflate(0, 12).collidepoint(event.pos):
+                    fraction = (event.pos[0] - bar.x) / bar.width
+                    player.seek(player.start_time + fraction * (player.end_time - player.start_time))
+            elif event.type == pygame.KEYDOWN:
+                jump = 60.0 if event.mod & pygame.KMOD_SHIFT else 10.0
+                if event.key == pygame.K_SPACE: player.playing = not player.playing
+                elif event.key == pygame.K_LEFT: player.seek(player.time - jump)
+                elif event.key == pygame.K_RIGHT: player.seek(player.time + jump)
+                elif event.key == pygame.K_UP: player.speed = min(player.speed * 2, 1024.0)
+                elif event.key == pygame.K_DOWN: player.speed = player.speed / 2 if abs(player.speed) > 1 / 64 else player.speed
+                elif event.key == pygame.K_b: player.speed = -player.speed
+                elif event.key == pygame.K_COMMA: player.playing = False; player.step_rows(-1)
+                elif event.key == pygame.K_PERIOD: player.playing = False; player.step_rows(1)
+                elif event.key == pygame.K_HOME: player.seek(player.start_time)
+                elif event.key == pygame.K_END: player.seek(player.end_time)
+                elif event.key == pygame.K_m: simulator.show_minimap = not simulator.show_minimap
+                elif event.key == pygame.K_w: simulator.show_water_depth = not simulator.show_water_depth
+                elif event.key == pygame.K_o: simulator.show_obstacles = not simulator.show_obstacles
+
+        player.advance(clock.get_time() / 1000.0)
+        renderer.recenter(simulator.vessel.state.eta[:2])
+        renderer.render(simulator, player.control())
+        clock.tick(60)
+
+    pygame.quit()
@@ -0,0 +1,54 @@
+# run_monte_carlo.py
+
+import argparse
+from vds.core.monte_carlo import StudyConfig, FileJobQueue, Worker, run_local
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distributed Monte Carlo studies over a shared-directory job queue.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    submit = subparsers.add_parser('submit', help="Create a queue with one job per scenario variant.")
+    local = subparsers.add_parser('local', help="Submit and drain the queue with local worker processes.")
+    for sub in (submit, local):
+        sub.add_argument('scenario', type=str, help="Path to a scenario YAML file.")
+        sub.add_argument('queue', type=str, help="Queue directory (shared between machines for multi-node runs).")
+        sub.add_argument('--jobs', type=int, required=True, help="Number of scenario variants.")
+        sub.add_argument('--seed', type=int, default=0, help="Study seed; job seeds are derived from it and the job id.")
+        sub.add_argument('--duration', type=float, default=600.0, help="Simulated time per job (s).")
+        sub.add_argument('--dt', type=float, default=0.5, help="Simulation time step (s).")
+        sub.add_argument('--obstacles', type=int, default=0, help="Random obstacles added per job.")
+        sub.add_argument('--position-sigma', type=float, default=0.0, help="Initial position scatter (m).")
+    local.add_argument('--workers', type=int, default=None, help="Number of worker processes.")
+    local.add_argument('--output', type=str, default=None, help="CSV file for the collected results.")
+
+    work = subparsers.add_parser('work', help="Run a worker against an existing queue.")
+    work.add_argument('queue', type=str, help="Queue directory.")
+    work.add_argument('--batch', type=int, default=16, help="Jobs claimed (and results per shard) at a time.")
+    work.add_argument('--wait', type=float, default=0.0, help="Seconds to keep polling an empty queue.")
+    work.add_argument('--requeue-after', type=float, default=None,
+                      help="Return jobs running longer than this many seconds to the queue first.")
+
+    collect = subparsers.add_parser('collect', help="Merge result shards into one CSV file.")
+    collect.add_argument('queue', type=str, help="Queue directory.")
+    collect.add_argument('output', type=str, help="CSV file to write.")
+    args = parser.parse_args()
+
+    if args.command in ('submit', 'local'):
+        config = StudyConfig(scenario_path=args.scenario, jobs=args.jobs, seed=args.seed, duration=args.duration,
+                             dt=args.dt, random_obstacles=args.obstacles, position_sigma_m=args.position_sigma)
+        if args.command == 'submit':
+            FileJobQueue(args.queue).submit(config)
+            print(f"Submitted {config.jobs} jobs to {args.queue}")
+        else:
+            results = run_local(config, args.queue, workers=args.workers)
+            print(results.describe())
+            if args.output:
+                results.to_csv(args.output, index=False)
+    elif args.command == 'work':
+        queue = FileJobQueue(args.queue)
+        if args.requeue_after is not None:
+            print(f"Requeued {queue.requeue_stale(args.requeue_after)} stale jobs.")
+        print(f"Completed {Worker(queue, batch_size=args.batch).run(wait=args.wait)} jobs.")
+    else:
+        FileJobQueue(args.queue).collect().to_csv(args.output, index=False)
+        print(f"Results saved to {args.output}")
@@ -0,0 +1,31 @@
+# run_server.py
+
+import argparse
+import asyncio
+from vds.core.events import print_event
+from vds.core.simulator import Simulator
+from vds.core.sim_server import SimulationServer
+from scenarios.scenario_loader import load_scenario
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host a scenario for remote stations over TCP (headless).")
+    parser.add_argument('scenario', type=str, help="Scenario YAML.")
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--dt', type=float, default=0.1, help="Physics step (s).")
+    parser.add_argument('--rate', type=float, default=10.0, help="State broadcasts per second.")
+    parser.add_argument('--speed', type=float, default=1.0, help="Simulated seconds per wall-clock second.")
+    args = parser.parse_args()
+
+    vessel, dynamics_model, geography, ais_targets, wind, current, waves, initial_control, waypoints, autopilot, streams = load_scenario(args.scenario)
+    simulator = Simulator(vessel, dynamics_model, geography, ais_targets, wind, current, waves, autopilot, seed=streams)
+    simulator.waypoints = waypoints
+    simulator.show_obstacles = geography.has_obstructions
+    simulator.events.subscribe(print_event)
+
+    server = SimulationServer(simulator, initial_control, args.host, args.port, args.dt, args.rate, args.speed)
+    print(f"Serving '{args.scenario}' on {args.host}:{args.port} ({args.rate:g} Hz)")
+    try:
+        asyncio.run(server.run())
+    except KeyboardInterrupt:
+        pass
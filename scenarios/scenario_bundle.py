@@ -0,0 +1,236 @@
+# scenarios/scenario_bundle.py
+
+import hashlib
+import json
+import os
+import struct
+import yaml
+import numpy as np
+from vds.environment.geography import Geography
+from vds.environment.shoreline import load_polygons
+from vds.models.vessels.base_vessel import VesselSpecifications
+from vds.core.route import Route
+from vds.core.performance import default_performance_path
+
+BUNDLE_VERSION = 1
+_MAGIC = b'VDSB'
+_HEADER = struct.Struct('<4sHHQ')  # magic, version, reserved, metadata length
+_ALIGN = 64
+CACHE_DIR_NAME = '.scenario_cache'
+AIS_TRACKS_PATH = 'data/ais/sample_ais_tracks.csv'
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _source_record(path: str) -> dict:
+    """Identity of one source file; a missing file is recorded too, so creating it invalidates the bundle."""
+    if not os.path.exists(path):
+        return {'path': path, 'exists': False}
+    stat = os.stat(path)
+    return {'path': path, 'exists': True, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': _sha256(path)}
+
+def default_autopilot_params_path(hydro_params_path: str) -> str:
+    """Per-vessel autopilot config path stored next to the hydro file (e.g. kcs_autopilot.json)."""
+    base = os.path.basename(hydro_params_path).replace('_hydrodynamics', '').replace('.json', '')
+    return os.path.join(os.path.dirname(hydro_params_path), f"{base}_autopilot.json")
+
+class ScenarioBundle:
+    """
+    A scenario with every source file resolved: specs, hydro parameters, autopilot gains,
+    bathymetry grid, obstacles, waypoints and AIS tracks.
+    모든 원본 파일을 해석해 하나로 묶은 시나리오 번들.
+
+    `meta` holds the JSON-serializable part and `arrays` the numeric data. Saved
+    bundles are a single versioned file (header, JSON metadata, 64-byte aligned
+    arrays) that `open` memory-maps, so many workers can share one copy of the
+    grid. `content_hash` covers the contents of every source file.
+    """
+    def __init__(self, meta: dict, arrays: dict[str, np.ndarray]):
+        self.meta = meta
+        self.arrays = arrays
+
+    @property
+    def content_hash(self) -> str:
+        return self.meta['content_hash']
+
+    @property
+    def config(self) -> dict:
+        """The scenario YAML as parsed at compile time."""
+        return self.meta['config']
+
+    def is_stale(self) -> bool:
+        """True if any source file changed (or appeared/disappeared) since the bundle was compiled."""
+        for record in self.meta['sources']:
+            exists = os.path.exists(record['path'])
+            if exists != record['exists']:
+                return True
+            if not exists:
+                continue
+            stat = os.stat(record['path'])
+            if stat.st_size == record['size'] and stat.st_mtime_ns == record['mtime_ns']:
+                continue
+            # Touched but possibly unchanged: fall back to comparing contents
+            if _sha256(record['path']) != record['sha256']:
+                return True
+        return False
+
+    def save(self, path: str):
+        """Writes the bundle atomically, so concurrent readers never see a partial file."""
+        layout, offset = {}, 0
+        for name, array in self.arrays.items():
+            array = np.ascontiguousarray(array)
+            layout[name] = {'offset': offset, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+            offset += -(-array.nbytes // _ALIGN) * _ALIGN
+        meta = json.dumps({**self.meta, 'arrays': layout}).encode('utf-8')
+        data_start = -(-(_HEADER.size + len(meta)) // _ALIGN) * _ALIGN
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, BUNDLE_VERSION, 0, len(meta)))
+            f.write(meta)
+            for name, array in self.arrays.items():
+                f.seek(data_start + layout[name]['offset'])
+                f.write(np.ascontiguousarray(array).tobytes())
+            f.truncate(data_start + offset)
+        os.replace(tmp, path)
+
+    @classmethod
+    def open(cls, path: str) -> 'ScenarioBundle':
+        """Opens a saved bundle; arrays are read-only memory maps into the file."""
+        with open(path, 'rb') as f:
+            magic, version, _, meta_length = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC or version != BUNDLE_VERSION:
+                raise ValueError(f"'{path}' is not a scenario bundle, or was written by an unsupported version.")
+            meta = json.loads(f.read(meta_length).decode('utf-8'))
+        data_start = -(-(_HEADER.size + meta_length) // _ALIGN) * _ALIGN
+        arrays = {}
+        for name, entry in meta.pop('arrays').items():
+            shape = tuple(entry['shape'])
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.zeros(shape, dtype=entry['dtype'])
+            else:
+                arrays[name] = np.memmap(path, dtype=entry['dtype'], mode='r', offset=data_start + entry['offset'], shape=shape)
+        return cls(meta, arrays)
+
+def resolve_scenario(filepath: str, hydro_params_path: str = None) -> ScenarioBundle:
+    """
+    Reads a scenario YAML and every file it refers to into an in-memory bundle.
+    Planned routes (`route_plan`) are solved here too, unless the scenario adds random
+    obstacles, which depend on the run seed; those routes are planned at load time.
+    """
+    with open(filepath, 'r') as f:
+        config = yaml.safe_load(f)
+    vessel_conf = config['vessel']
+    env_conf = config['environment']
+    if hydro_params_path is None:
+        hydro_params_path = vessel_conf['hydro_params']
+    autopilot_path = vessel_conf.get('autopilot_params', default_autopilot_params_path(hydro_params_path))
+    performance_path = vessel_conf.get('performance_tables', default_performance_path(hydro_params_path))
+    sources = [filepath, hydro_params_path, autopilot_path, performance_path, env_conf['geography_data']]
+
+    with open(hydro_params_path, 'r') as f:
+        hydro_params = json.load(f)
+    gains = {}
+    if os.path.exists(autopilot_path):
+        with open(autopilot_path, 'r') as f:
+            gains = json.load(f).get('gains', {})
+    performance = None
+    if os.path.exists(performance_path):
+        with open(performance_path, 'r') as f:
+            performance = json.load(f)
+
+    import pandas as pd
+    depth = pd.read_csv(env_conf['geography_data'], header=None).values.astype(float)
+    geography = Geography(depth, env_conf['cell_size'])
+    obstacles_conf = env_conf.get('obstacles', {})
+    if obstacles_conf.get('enabled', False):
+        for obs_data in obstacles_conf.get('locations', []):
+            geography.add_obstacle(obs_data['position'][0], obs_data['position'][1], obs_data['radius'])
+        if 'polygons_file' in obstacles_conf:
+            sources.append(obstacles_conf['polygons_file'])
+            geography.set_polygons(load_polygons(obstacles_conf['polygons_file']))
+
+    arrays = {'depth': depth, 'obstacle_positions': geography.obstacle_positions,
+              'obstacle_radii': geography.obstacle_radii}
+    if geography.polygons:
+        # Vertices of all polygons back to back; polygon k is points[offsets[k]:offsets[k + 1]]
+        arrays['polygon_points'] = np.concatenate(geography.polygons)
+        arrays['polygon_offsets'] = np.cumsum([0] + [len(points) for points in geography.polygons])
+    if env_conf.get('ais_targets', {}).get('enabled', False):
+        sources.append(AIS_TRACKS_PATH)
+        if os.path.exists(AIS_TRACKS_PATH):
+            tracks = pd.read_csv(AIS_TRACKS_PATH)
+            for column in tracks.columns:
+                arrays[f"ais_{column}"] = tracks[column].to_numpy()
+
+    initial_pos = vessel_conf['initial_state'].get('position', [0, 0])
+    random_obstacles = obstacles_conf.get('random') if obstacles_conf.get('enabled', False) else None
+    route_plan = None
+    if 'route_file' in env_conf:
+        sources.append(env_conf['route_file'])
+        waypoints = Route.load_waypoints(env_conf['route_file'])
+    elif 'route_plan' in env_conf:
+        route_plan = env_conf['route_plan']
+        waypoints = []
+        if not random_obstacles:
+            waypoints = plan_route(geography, VesselSpecifications(**vessel_conf['specs']), initial_pos, route_plan)
+    else:
+        waypoints = env_conf.get('waypoints', [])
+
+    records = [_source_record(path) for path in sources]
+    digest = hashlib.sha256(f"{BUNDLE_VERSION}:{hydro_params_path}".encode('utf-8'))
+    for record in records:
+        digest.update(f"{record['path']}:{record.get('sha256', 'missing')}".encode('utf-8'))
+    meta = {
+        'version': BUNDLE_VERSION,
+        'content_hash': digest.hexdigest(),
+        'sources': records,
+        'config': config,
+        'hydro_params_path': hydro_params_path,
+        'hydro_params': hydro_params,
+        'autopilot_gains': gains,
+        'performance': performance,
+        'waypoints': waypoints,
+        'route_plan': route_plan if not waypoints else None,
+        'random_obstacles': random_obstacles,
+    }
+    return ScenarioBundle(meta, arrays)
+
+def plan_route(geography: Geography, specs: VesselSpecifications, start, plan_conf: dict) -> list[dict]:
+    from vds.core.route_planner import RoutePlanner
+    planner = RoutePlanner(geography, specs.draft, clearance=plan_conf.get('clearance', specs.loa / 2),
+                           resolution=plan_conf.get('resolution'))
+    return planner.plan(start, plan_conf['goal'])
+
+def bundle_path(filepath: str, hydro_params_path: str = None) -> str:
+    """Cache location of a scenario's bundle: `.scenario_cache/` next to the YAML."""
+    directory, name = os.path.split(os.path.abspath(filepath))
+    suffix = ''
+    if hydro_params_path is not None:
+        suffix = '-' + hashlib.sha1(hydro_params_path.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(directory, CACHE_DIR_NAME, f"{os.path.splitext(name)[0]}{suffix}.vdsb")
+
+def compile_scenario(filepath: str, hydro_params_path: str = None, output_path: str = None) -> str:
+    """Resolves a scenario and saves it as a bundle. Returns the bundle path."""
+    output_path = output_path or bundle_path(filepath, hydro_params_path)
+    resolve_scenario(filepath, hydro_params_path).save(output_path)
+    return output_path
+
+def load_bundle(filepath: str, hydro_params_path: str = None) -> ScenarioBundle:
+    """Opens the cached bundle of a scenario, recompiling it first if it is missing, stale or outdated."""
+    path = bundle_path(filepath, hydro_params_path)
+    if os.path.exists(path):
+        try:
+            bundle = ScenarioBundle.open(path)
+            if not bundle.is_stale():
+                return bundle
+        except (ValueError, OSError, json.JSONDecodeError, struct.error):
+            pass  # Unreadable or older format: rebuild it
+    return ScenarioBundle.open(compile_scenario(filepath, hydro_params_path, path))
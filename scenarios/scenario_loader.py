@@ -1,19 +1,80 @@
 # scenarios/scenario_loader.py
 
-import yaml
+import json
+import logging
+import os
 import numpy as np
 from vds.models.vessels.base_vessel import BaseVessel, VesselSpecifications, VesselState
 from vds.environment.geography import Geography
 from vds.environment.wind import Wind
 from vds.environment.current import Current
 from vds.environment.waves import Waves
-from vds.data_handler.ais_parser import load_ais_targets
+from vds.data_handler.ais_parser import targets_from_table
 from vds.models.dynamics.mmg_model import MMGModel
+from vds.models.dynamics.batched_mmg_model import BatchedMMGModel
+from vds.core.performance import PerformanceTable, default_performance_path
+from vds.core.autopilot import AutopilotBank
+from vds.core.random_streams import RandomStreams
+from .scenario_bundle import (ScenarioBundle, default_autopilot_params_path, load_bundle, plan_route,
+                              resolve_scenario)
 
-def load_scenario(filepath: str):
-    """Loads all simulation components from a YAML scenario file."""
-    with open(filepath, 'r') as f:
-        config = yaml.safe_load(f)
+log = logging.getLogger(__name__)
+
+def autopilot_from_gains(gains: dict, specs: VesselSpecifications) -> AutopilotBank:
+    """Single-vessel autopilot with the given gains (defaults for any that are missing)."""
+    return AutopilotBank(1, lookahead=gains.get('lookahead', 2.5 * specs.loa),
+                         **{k: gains[k] for k in ('kp', 'ki', 'kd') if k in gains})
+
+def trim_rpm(model: MMGModel, speed: float, performance: dict = None) -> float:
+    """
+    Rpm holding `speed` (m/s) straight ahead: an O(1) lookup in the vessel's performance
+    tables if they were built, otherwise solved on the spot.
+    """
+    if performance is not None:
+        return PerformanceTable.from_dict(performance).rpm_for_speed(speed)
+    from vds.core.fleet import steady_rpm
+    return float(steady_rpm(BatchedMMGModel.from_model(model), np.array([speed]))[0])
+
+def bank_gains(autopilot: AutopilotBank, row: int = 0) -> dict:
+    """Gains of one vessel of a bank, in the form `autopilot_from_gains` and `FleetAgent` take."""
+    return {'kp': float(autopilot.kp[row]), 'ki': float(autopilot.ki[row]), 'kd': float(autopilot.kd[row]),
+            'lookahead': float(autopilot.lookahead[row])}
+
+def load_autopilot(vessel_conf: dict, specs: VesselSpecifications) -> AutopilotBank:
+    """
+    Builds the vessel's autopilot. Gains are read from `vessel.autopilot_params` if given,
+    otherwise from the per-vessel config next to the hydro file, otherwise defaults are used.
+    """
+    params_path = vessel_conf.get('autopilot_params', default_autopilot_params_path(vessel_conf['hydro_params']))
+    gains = {}
+    if os.path.exists(params_path):
+        with open(params_path, 'r') as f:
+            gains = json.load(f).get('gains', {})
+    return autopilot_from_gains(gains, specs)
+
+def load_scenario(filepath: str, hydro_params_path: str = None, seed=None, use_bundle: bool = True):
+    """
+    Loads all simulation components from a YAML scenario file.
+    `hydro_params_path` optionally overrides the scenario's hydro file, and `seed`
+    (an int, SeedSequence or RandomStreams) overrides the scenario's `seed` entry.
+    The returned `RandomStreams` should be passed on to the `Simulator`.
+
+    Sources are read through the scenario's compiled bundle (see `scenario_bundle`),
+    which is rebuilt only when a source file changes. `use_bundle=False` resolves
+    the sources directly without touching the cache.
+    """
+    if use_bundle:
+        bundle = load_bundle(filepath, hydro_params_path)
+    else:
+        bundle = resolve_scenario(filepath, hydro_params_path)
+    return build_scenario(bundle, seed)
+
+def build_scenario(bundle: ScenarioBundle, seed=None):
+    """Creates the simulation components of a resolved scenario bundle."""
+    config = bundle.config
+    if seed is None:
+        seed = config.get('seed')
+    streams = seed if isinstance(seed, RandomStreams) else RandomStreams(seed)
 
     # Load Vessel
     vessel_conf = config['vessel']
@@ -30,30 +91,91 @@ def load_scenario(filepath: str):
     vessel = BaseVessel(specs, initial_state)
 
     # Load Dynamics Model
-    hydro_params_path = vessel_conf['hydro_params']
-    dynamics_model = MMGModel(vessel.specs, hydro_params_path)
+    dynamics_model = MMGModel(vessel.specs, bundle.meta['hydro_params'])
+    autopilot = autopilot_from_gains(bundle.meta['autopilot_gains'], vessel.specs)
     
     # Load Environment
     env_conf = config['environment']
-    geography = Geography.from_csv(env_conf['geography_data'], env_conf['cell_size'])
-    
-    if env_conf.get('obstacles', {}).get('enabled', False):
-        for obs_data in env_conf['obstacles'].get('locations', []):
-            geography.add_obstacle(center_x=obs_data['position'][0], center_y=obs_data['position'][1], radius=obs_data['radius'])
+    arrays = bundle.arrays
+    geography = Geography(arrays['depth'], env_conf['cell_size'])
+    geography.set_obstacles(arrays['obstacle_positions'], arrays['obstacle_radii'])
+    if 'polygon_points' in arrays:
+        offsets = np.asarray(arrays['polygon_offsets'])
+        geography.set_polygons(np.split(np.asarray(arrays['polygon_points']), offsets[1:-1]))
+    random_conf = bundle.meta['random_obstacles']
+    if random_conf:
+        geography.add_random_obstacles(random_conf['count'], random_conf['min_radius'], random_conf['max_radius'],
+                                       safe_zone_radius=random_conf.get('safe_zone_radius', 0.0),
+                                       rng=streams.obstacles, center=initial_pos)
 
     ais_targets = []
-    if env_conf.get('ais_targets', {}).get('enabled', False):
-        ais_targets = load_ais_targets('data/ais/sample_ais_tracks.csv')
+    if 'ais_mmsi' in arrays:
+        columns = {name[len('ais_'):]: np.asarray(array) for name, array in arrays.items() if name.startswith('ais_')}
+        ais_targets = targets_from_table(columns)
 
-    waypoints = env_conf.get('waypoints', [])
+    waypoints = bundle.meta['waypoints']
+    if bundle.meta['route_plan']:
+        waypoints = plan_route(geography, specs, initial_pos, bundle.meta['route_plan'])
 
     wind = Wind(speed=env_conf['wind']['speed_kts'], direction=env_conf['wind']['direction_deg'])
     current = Current(speed=env_conf['current']['speed_kts'], direction=env_conf['current']['direction_deg'])
     waves = Waves(significant_height=env_conf['waves']['hs_m'], period=env_conf['waves']['period_s'], direction=env_conf['waves']['direction_deg'])
     
-    initial_control = config['initial_control']
+    initial_control = dict(config['initial_control'])
+    if initial_control.get('rpm', 'auto') == 'auto':
+        initial_control['rpm'] = trim_rpm(dynamics_model, initial_speed_ms, bundle.meta.get('performance'))
 
-    print(f"Loaded scenario: {config['scenario_name']}")
+    log.info("Loaded scenario: %s", config['scenario_name'])
     
-    return vessel, dynamics_model, geography, ais_targets, wind, current, waves, initial_control, waypoints
+    return vessel, dynamics_model, geography, ais_targets, wind, current, waves, initial_control, waypoints, autopilot, streams
+
+def load_fleet(filepath: str, hydro_params_path: str = None, seed=None) -> 'FleetSimulator':
+    """
+    Loads a scenario as a multi-agent simulation.
+    The scenario's own vessel becomes the first agent, followed by the entries of the optional
+    `fleet.vessels` list (same keys as `vessel`, including `autopilot_params`, plus `name`,
+    `initial_control` and `waypoints`).
+    Unless `fleet.dynamic_ais` is false, AIS targets are converted into dynamic agents
+    using the hull in `fleet.ais_vessel` (default: the scenario's vessel).
+    """
+    from vds.core.fleet import FleetAgent, FleetSimulator
+    bundle = load_bundle(filepath, hydro_params_path)
+    vessel, dynamics_model, geography, ais_targets, wind, current, waves, initial_control, waypoints, autopilot, _ = \
+        build_scenario(bundle, seed)
+    config = bundle.config
+    fleet_conf = config.get('fleet', {})
+
+    agents = [FleetAgent(config.get('scenario_name', 'own ship'), vessel, dynamics_model, waypoints,
+                         initial_control.get('rpm', 0.0), bank_gains(autopilot))]
+    models = {}  # Vessels sharing a hydro file share one MMGModel
+    for i, conf in enumerate(fleet_conf.get('vessels', [])):
+        specs = VesselSpecifications(**conf['specs'])
+        state_conf = conf.get('initial_state', {})
+        position = state_conf.get('position', [0, 0])
+        eta = np.array([position[0], position[1], 0, 0, 0, np.radians(state_conf.get('heading_deg', 0.0))], dtype=float)
+        nu = np.array([state_conf.get('speed_kts', 0.0) * 0.514444, 0, 0, 0, 0, 0], dtype=float)
+        key = (conf['hydro_params'], tuple(conf['specs'].items()))
+        if key not in models:
+            models[key] = MMGModel(specs, conf['hydro_params'])
+        rpm = conf.get('initial_control', {}).get('rpm', 0.0)
+        if rpm == 'auto':
+            performance_path = conf.get('performance_tables', default_performance_path(conf['hydro_params']))
+            performance = None
+            if os.path.exists(performance_path):
+                with open(performance_path, 'r') as f:
+                    performance = json.load(f)
+            rpm = trim_rpm(models[key], nu[0], performance)
+        agents.append(FleetAgent(conf.get('name', f"vessel-{i + 1}"), BaseVessel(specs, VesselState(eta=eta, nu=nu)),
+                                 models[key], conf.get('waypoints', []), rpm, bank_gains(load_autopilot(conf, specs))))
+
+    if fleet_conf.get('dynamic_ais', True) and ais_targets:
+        ais_conf = fleet_conf.get('ais_vessel')
+        if ais_conf:
+            ais_specs = VesselSpecifications(**ais_conf['specs'])
+            ais_model = MMGModel(ais_specs, ais_conf['hydro_params'])
+        else:
+            ais_specs, ais_model = vessel.specs, dynamics_model
+        agents += FleetSimulator.agents_from_ais(ais_targets, ais_specs, ais_model)
 
+    return FleetSimulator(agents, geography, wind, current, waves,
+                          check_obstacles=config['environment'].get('obstacles', {}).get('enabled', False))
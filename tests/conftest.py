@@ -0,0 +1,35 @@
+# tests/conftest.py
+
+import numpy as np
+import pytest
+from vds.core.simulator import Simulator
+from vds.environment.geography import Geography
+from vds.models.vessels.base_vessel import BaseVessel, VesselSpecifications, VesselState
+from vds.models.dynamics.mmg_model import MMGModel
+
+KCS_PARAMS = 'data/vessel_params/kcs_hydrodynamics.json'
+
+@pytest.fixture(scope='session')
+def kcs_specs() -> VesselSpecifications:
+    """Principal particulars of the KCS container ship used throughout the tests."""
+    return VesselSpecifications(loa=232.5, beam=32.2, draft=10.8, mass=5.2e7, inertia_z=2.17e10,
+                                wind_area_longitudinal=800.0, wind_area_transverse=2500.0)
+
+@pytest.fixture
+def kcs_model(kcs_specs) -> MMGModel:
+    return MMGModel(kcs_specs, KCS_PARAMS)
+
+@pytest.fixture
+def make_simulator(kcs_specs):
+    """
+    Factory for a fresh KCS simulator at the origin, making way at 7.7 m/s, over a small
+    deep grid with one shallow cell (40-60 m north, 140-160 m east). `seed` is passed
+    on to the `Simulator`.
+    원점에서 7.7 m/s로 항해하는 KCS 시뮬레이터를 새로 만드는 팩토리.
+    """
+    def make(seed=None) -> Simulator:
+        depth = np.full((10, 10), -50.0)
+        depth[2, 7] = -5.0
+        vessel = BaseVessel(kcs_specs, VesselState(nu=np.array([7.7, 0, 0, 0, 0, 0])))
+        return Simulator(vessel, MMGModel(kcs_specs, KCS_PARAMS), Geography(depth, 20.0), seed=seed)
+    return make
@@ -0,0 +1,69 @@
+# tests/test_autopilot.py
+
+import numpy as np
+import pytest
+from vds.core.autopilot import AutopilotBank, Autopilot
+
+def test_bank_matches_individual_controllers():
+    """
+    A bank of N controllers must give the same rudder demands as N separate ones.
+    N개의 뱅크 제어기는 N개의 개별 제어기와 같은 타각을 내야 합니다.
+    """
+    headings = np.array([0.0, 0.3, -0.5, 2.0])
+    desired = np.array([0.2, 0.0, 0.5, -2.5])
+    kp = np.array([0.8, 1.0, 0.5, 0.8])
+    bank = AutopilotBank(4, kp=kp)
+    for _ in range(3):
+        fleet = bank.heading_control(headings, desired, 0.1)
+
+    for i in range(4):
+        single = AutopilotBank(1, kp=kp[i])
+        for _ in range(3):
+            rudder = single.heading_control(headings[i:i + 1], desired[i:i + 1], 0.1)
+        assert fleet[i] == pytest.approx(rudder[0])
+
+def test_subset_of_bank_leaves_other_controllers_untouched():
+    """Running only some rows uses their own gains and memory and does not advance the rest."""
+    kp = np.array([0.8, 1.0, 0.5])
+    bank = AutopilotBank(3, kp=kp, ki=0.1)
+    rows = np.array([2, 0])
+    for _ in range(3):
+        subset = bank.heading_control(np.zeros(2), np.array([0.5, 0.2]), 0.1, rows=rows)
+    assert not bank._has_previous[1] and bank._integral[1] == 0.0
+    for row, desired, rudder in zip(rows, [0.5, 0.2], subset):
+        single = AutopilotBank(1, kp=kp[row], ki=0.1)
+        for _ in range(3):
+            expected = single.heading_control(np.zeros(1), np.array([desired]), 0.1)
+        assert rudder == pytest.approx(expected[0])
+
+def test_anti_windup_freezes_integrator_in_saturation():
+    """
+    A large, persistent error saturates the rudder; the integrator must not wind up.
+    큰 오차가 지속되어 타각이 포화되면 적분기가 누적되지 않아야 합니다.
+    """
+    bank = AutopilotBank(1, ki=0.5)
+    for _ in range(1000):
+        rudder = bank.heading_control(np.array([0.0]), np.array([np.pi / 2]), 0.1)
+    assert rudder[0] == pytest.approx(35.0)
+    assert bank._integral[0] == pytest.approx(0.0)
+
+def test_los_steers_back_onto_track():
+    """
+    A vessel to starboard of a northbound leg must be commanded to port, and vice versa.
+    북향 항로의 우현 쪽에 있는 선박은 좌현으로, 반대쪽은 우현으로 조타해야 합니다.
+    """
+    bank = AutopilotBank(2, lookahead=500.0)
+    positions = np.array([[0.0, 100.0], [0.0, -100.0]])
+    leg_start = np.zeros((2, 2))
+    leg_end = np.array([[1000.0, 0.0], [1000.0, 0.0]])
+    desired, cross_track = bank.los_heading(positions, leg_start, leg_end)
+    assert cross_track == pytest.approx([100.0, -100.0])
+
+    rudder = bank.track_control(positions, np.zeros(2), leg_start, leg_end, 0.1)
+    assert rudder[0] < 0
+    assert rudder[1] > 0
+
+def test_scalar_autopilot_wrapper():
+    autopilot = Autopilot()
+    rudder = autopilot.calculate_rudder_angle(np.array([0.0, 0.0]), 0.0, np.array([100.0, 100.0]), 0.1)
+    assert 0 < rudder <= autopilot.max_rudder
@@ -0,0 +1,62 @@
+# tests/test_autopilot_tuning.py
+
+import yaml
+import pytest
+from vds.core.autopilot_tuning import TuningConfig, run_waypoint_following, save_autopilot_params, score_gains, tune_gains
+from scenarios.scenario_loader import load_scenario
+
+SCENARIO = 'scenarios/busan_port_approach.yaml'
+
+def test_bad_gains_are_terminated_early():
+    """
+    Gains that steer away from the track must abort long before the time limit.
+    항로에서 벗어나게 조타하는 게인은 시간 제한 전에 조기 종료되어야 합니다.
+    """
+    config = TuningConfig(SCENARIO, max_duration=3000.0)
+    metrics = run_waypoint_following(config, (-2.0, 0.0, 0.0))
+    assert metrics.aborted
+    assert not metrics.completed
+    assert metrics.time < config.max_duration
+
+def test_tuning_improves_on_the_initial_gains():
+    """
+    A short seeded search through the process pool must beat the over-damped gains it starts from.
+    짧은 탐색으로도 초기 게인보다 나은 게인을 찾아야 합니다.
+    """
+    config = TuningConfig(SCENARIO, dt=1.0)
+    initial = (0.1, 0.0, 40.0)
+    result = tune_gains(config, workers=1, maxiter=2, popsize=2, seed=0, x0=initial)
+    assert result['cost'] < score_gains(initial, config)
+    gains = result['gains']
+    assert score_gains((gains['kp'], gains['ki'], gains['kd']), config) == pytest.approx(result['cost'])
+
+def test_tuned_gains_are_read_by_scenario_loader(tmp_path):
+    """
+    Gains written by the tuner must be picked up by `load_scenario`.
+    튜너가 저장한 게인을 시나리오 로더가 읽어야 합니다.
+    """
+    params_path = tmp_path / 'vlcc_autopilot.json'
+    result = {'gains': {'kp': 1.7, 'ki': 0.02, 'kd': 12.0, 'lookahead': 600.0}, 'cost': 0.0, 'metrics': {}}
+    save_autopilot_params(str(params_path), result, TuningConfig(SCENARIO))
+
+    with open(SCENARIO, 'r') as f:
+        config = yaml.safe_load(f)
+    config['vessel']['autopilot_params'] = str(params_path)
+    scenario_path = tmp_path / 'scenario.yaml'
+    scenario_path.write_text(yaml.safe_dump(config))
+
+    autopilot = load_scenario(str(scenario_path))[9]
+    assert autopilot.kp[0] == pytest.approx(1.7)
+    assert autopilot.kd[0] == pytest.approx(12.0)
+    assert autopilot.lookahead[0] == pytest.approx(600.0)
+
+def test_shipped_autopilot_completes_busan_approach():
+    """
+    With the shipped VLCC autopilot config, the port approach must reach every waypoint without hitting a buoy.
+    기본 VLCC 오토파일럿 설정으로 모든 웨이포인트에 부표 충돌 없이 도달해야 합니다.
+    """
+    autopilot = load_scenario(SCENARIO)[9]
+    gains = (autopilot.kp[0], autopilot.ki[0], autopilot.kd[0])
+    metrics = run_waypoint_following(TuningConfig(SCENARIO), gains)
+    assert not metrics.aborted # Aborts on any collision
+    assert metrics.completed
@@ -0,0 +1,22 @@
+# tests/test_benchmarks.py
+
+import os
+from benchmarks.engine import cases, compare, measure, save_baseline, load_baseline
+
+def test_small_cases_run():
+    """Every benchmarked path at its smallest scale runs (a smoke test, not a timing)."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    small = [case for case in cases() if case.scale in ('1', 'small')]
+    assert {case.name for case in small} == {case.name for case in cases()} - {'load_ais'}
+    for case in small:
+        result = measure(case, min_time=0.001, repeat=1)
+        assert result['throughput'] > 0, case.key
+
+def test_regressions_beyond_threshold_are_reported(tmp_path):
+    path = str(tmp_path / 'baseline.json')
+    save_baseline({'a[1]': {'throughput': 100.0}, 'b[1]': {'throughput': 100.0}}, path)
+    save_baseline({'c[1]': {'throughput': 10.0}}, path)
+    baseline = load_baseline(path)
+    assert set(baseline) == {'a[1]', 'b[1]', 'c[1]'}
+    results = {'a[1]': {'throughput': 80.0}, 'b[1]': {'throughput': 70.0}, 'new[1]': {'throughput': 1.0}}
+    assert compare(results, baseline, threshold=0.25) == ['b[1]']
@@ -0,0 +1,40 @@
+# tests/test_events.py
+
+import numpy as np
+from vds.core.events import (AutopilotDisengaged, Collision, EventBus, EventType, Grounding, SimulationReset,
+                             WaypointReached)
+from vds.core.simulator import Simulator
+from vds.environment.geography import Geography
+
+def test_ring_buffer_keeps_last_events_and_notifies_subscribers():
+    bus = EventBus(capacity=4)
+    seen = []
+    bus.subscribe(seen.append, EventType.GROUNDING)
+    for k in range(6):
+        bus.emit(EventType.WAYPOINT_REACHED, float(k), index=k, label=f"WP{k}")
+    bus.emit(EventType.GROUNDING, 6.0, x=1.0, y=2.0, value=-3.0, label='tug')
+    assert bus.total == 7 and len(bus) == 4 and bus.dropped == 3
+    assert bus.records()['time'].tolist() == [3.0, 4.0, 5.0, 6.0]
+    assert bus.events(since=5) == [WaypointReached(5.0, 5, 'WP5'), Grounding(6.0, 1.0, 2.0, -3.0, 'tug')]
+    assert seen == [Grounding(6.0, 1.0, 2.0, -3.0, 'tug')]
+    assert bus.counts()['waypoint_reached'] == 3
+
+def test_simulator_reports_events_without_printing(capsys, make_simulator):
+    base = make_simulator()
+    depth = np.full((100, 10), -50.0)
+    depth[5, 0] = -5.0  # Shallow strip 100-120 m north of the start
+    sim = Simulator(base.vessel, base.dynamics_model, Geography(depth, 20.0))
+    sim.geography.set_obstacles([[1500.0, 0.0]], [20.0])
+    sim.waypoints = [{'name': 'Buoy', 'position': [1000.0, 0.0]}, {'name': 'End', 'position': [1200.0, 0.0]}]
+    sim.set_autopilot(True)
+    control = {'rpm': 100.0, 'rudder_angle': 0.0}
+    while not sim.collision_detected and sim.time < 400.0:
+        sim.step(0.5, control)
+    sim.reset()
+
+    events = sim.events.events()
+    assert [type(event) for event in events] == [Grounding, WaypointReached, WaypointReached, AutopilotDisengaged,
+                                                 Collision, SimulationReset]
+    assert events[1].name == 'Buoy' and events[3].reason == 'all waypoints reached'
+    assert events[4].obstacle == 0 and 1300.0 < events[4].x < 1400.0
+    assert capsys.readouterr().out == ''
@@ -0,0 +1,100 @@
+# tests/test_fleet.py
+
+import time
+import numpy as np
+import pytest
+from vds.core.simulator import Simulator
+from vds.core.fleet import FleetAgent, FleetSimulator, steady_rpm
+from vds.environment.geography import Geography
+from vds.models.vessels.base_vessel import BaseVessel, VesselSpecifications, VesselState
+from vds.models.dynamics.mmg_model import MMGModel
+from vds.models.dynamics.batched_mmg_model import BatchedMMGModel
+from tests.conftest import KCS_PARAMS
+
+VLCC = VesselSpecifications(loa=330.0, beam=60.0, draft=20.8, mass=3.1e8, inertia_z=8.5e11,
+                            wind_area_longitudinal=1500.0, wind_area_transverse=6000.0)
+
+@pytest.fixture(scope='module')
+def models(kcs_specs):
+    return {'kcs': MMGModel(kcs_specs, KCS_PARAMS),
+            'vlcc': MMGModel(VLCC, 'data/vessel_params/vlcc_hydrodynamics.json')}
+
+def open_sea():
+    return Geography(np.full((10, 10), -50.0), 20.0)
+
+def agent(name, specs, model, position, speed, waypoints, rpm, heading=0.0):
+    state = VesselState(eta=np.array([position[0], position[1], 0, 0, 0, heading], dtype=float),
+                        nu=np.array([speed, 0, 0, 0, 0, 0], dtype=float))
+    return FleetAgent(name, BaseVessel(specs, state), model, waypoints, rpm)
+
+def test_heterogeneous_fleet_matches_single_vessel_simulators(models, kcs_specs):
+    """
+    Each agent of a mixed KCS/VLCC fleet must follow the same track as a solo Simulator run.
+    혼합 선단의 각 에이전트는 단독 시뮬레이터와 같은 항적을 따라야 합니다.
+    """
+    setups = [('kcs', kcs_specs, [0, 0], 7.7, [{'name': 'A', 'position': [3000, 800]}], 85.0),
+              ('vlcc', VLCC, [0, 5000], 6.2, [{'name': 'B', 'position': [3000, 4000]}], 70.0)]
+    fleet = FleetSimulator([agent(k, s, models[k], p, u, w, rpm) for k, s, p, u, w, rpm in setups], open_sea())
+
+    solo_positions = []
+    for key, specs, position, speed, waypoints, rpm in setups:
+        vessel = agent(key, specs, models[key], position, speed, waypoints, rpm).vessel
+        sim = Simulator(vessel, models[key], open_sea())
+        sim.waypoints = waypoints
+        sim.set_autopilot(True)
+        control = {'rpm': rpm, 'rudder_angle': 0.0}
+        for _ in range(300):
+            sim.step(0.5, control)
+        solo_positions.append(sim.vessel.state.eta[:2])
+
+    fleet.run(150.0, 0.5)
+    assert fleet.positions == pytest.approx(np.array(solo_positions), abs=1e-6)
+
+def test_head_on_contact_deactivates_both_agents(models, kcs_specs):
+    fleet = FleetSimulator([
+        agent('north', kcs_specs, models['kcs'], [0, 0], 7.7, [{'position': [5000, 0]}], 85.0),
+        agent('south', kcs_specs, models['kcs'], [3000, 0], 7.7, [{'position': [-2000, 0]}], 85.0, np.pi),
+        agent('clear', kcs_specs, models['kcs'], [0, 3000], 7.7, [], 85.0),
+    ], open_sea())
+    fleet.run(400.0, 1.0)
+    assert fleet.collided.tolist() == [True, True, False]
+    assert fleet.active.tolist() == [False, False, True]
+    assert [str(event).split(' at ')[0] for event in fleet.events.events()] == ["COLLISION between 'north' and 'south'"]
+
+def test_agents_stop_at_structures(models, kcs_specs):
+    """
+    An agent sailing into a pier collides with it; one passing well clear does not.
+    부두로 향하는 에이전트는 충돌하고, 충분히 떨어진 에이전트는 충돌하지 않아야 합니다.
+    """
+    geography = open_sea()
+    geography.set_polygons([np.array([[1000.0, -100.0], [1100.0, -100.0], [1100.0, 100.0], [1000.0, 100.0]])])
+    fleet = FleetSimulator([
+        agent('into', kcs_specs, models['kcs'], [0, 0], 7.7, [{'position': [3000, 0]}], 85.0),
+        agent('clear', kcs_specs, models['kcs'], [0, 1000], 7.7, [{'position': [3000, 1000]}], 85.0),
+    ], geography)
+    fleet.run(200.0, 1.0)
+    assert fleet.collided.tolist() == [True, False]
+    assert [str(event).split(' at ')[0] for event in fleet.events.events()] == ["COLLISION between 'into' and structure #0"]
+
+def test_steady_rpm_holds_speed(models):
+    model = BatchedMMGModel.from_models([models['kcs'], models['vlcc']])
+    speeds = np.array([7.0, 6.0])
+    rpm = steady_rpm(model, speeds)
+    nu = np.zeros((2, 6))
+    nu[:, 0] = speeds
+    assert model.calculate_forces(np.zeros((2, 6)), nu, rpm, 0.0)[:, 0] == pytest.approx(0.0, abs=1e-6)
+
+def test_busy_port_runs_faster_than_real_time(models, kcs_specs):
+    """500 agents on individual routes must simulate faster than the wall clock."""
+    rng = np.random.default_rng(0)
+    agents = []
+    for i in range(500):
+        key, specs = ('kcs', kcs_specs) if i % 2 else ('vlcc', VLCC)
+        start = np.array([i // 25, i % 25]) * 1500.0
+        goal = start + rng.uniform(-5000, 5000, 2)
+        agents.append(agent(f"ship-{i}", specs, models[key], start, 6.0, [{'position': goal.tolist()}], 75.0))
+    fleet = FleetSimulator(agents, open_sea())
+    fleet.step(0.5)  # Warm-up
+    started = time.perf_counter()
+    fleet.run(30.0, 0.5)
+    assert time.perf_counter() - started < 30.0 / 10
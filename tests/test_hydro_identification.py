@@ -0,0 +1,61 @@
+# tests/test_hydro_identification.py
+
+import glob
+import numpy as np
+import pytest
+from vds.core.hydro_identification import (DEFAULT_FIT_KEYS, fit_hydro_params, save_hydro_params, trial_from_csv,
+                                           trial_from_run_log)
+from vds.core.simulator import Simulator
+from vds.environment.geography import Geography
+from vds.environment.current import Current
+from vds.models.dynamics.mmg_model import MMGModel
+from vds.models.vessels.base_vessel import BaseVessel, VesselState
+from vds.utils.logger import DataLogger
+from tests.conftest import KCS_PARAMS
+
+def zigzag_trial(tmp_path, kcs_specs, steps=3000, current=None):
+    """Logs a zig-zag with varying rpm, with a reset and a pause in the middle."""
+    vessel = BaseVessel(kcs_specs, VesselState(nu=np.array([5.0, 0, 0, 0, 0, 0])))
+    sim = Simulator(vessel, MMGModel(kcs_specs, KCS_PARAMS), Geography(np.full((10, 10), -50.0), 20.0), current=current)
+    logger = DataLogger(str(tmp_path / 'trial.vdslog'))
+    for k in range(steps):
+        if k == steps // 2:
+            sim.reset()
+        sim.is_paused = steps // 4 <= k < steps // 4 + 10
+        control = {'rpm': 100.0 + 40.0 * np.sin(k / 600.0), 'rudder_angle': 20.0 * np.sign(np.sin(k / 120.0))}
+        sim.step(0.5, control)
+        logger.log(sim, control)
+    logger.save(str(tmp_path))
+    return logger
+
+def test_fit_recovers_the_simulated_hull(tmp_path, kcs_specs):
+    current = Current(speed=1.0, direction=45.0)
+    zigzag_trial(tmp_path, kcs_specs, current=current)
+    data = trial_from_run_log(str(tmp_path / 'trial.vdslog'))
+    assert len(data) == 3000 - 1 - 10 - 1  # Pause and reset pairs dropped
+
+    truth = MMGModel(kcs_specs, KCS_PARAMS)
+    wrong = dict(truth.p)
+    for name, factor in zip(DEFAULT_FIT_KEYS, (1.2, 0.5, 1.3, 0.8, 1.2, 0.7, 1.1, 0.8, 1.3)):
+        wrong[name] *= factor
+    result = fit_hydro_params(MMGModel(kcs_specs, wrong), data, current=current)
+    assert result.cost < 1e-12 * result.initial_cost
+    for name in DEFAULT_FIT_KEYS:
+        assert result.fitted[name] == pytest.approx(truth.p[name], rel=1e-5)
+
+    path = tmp_path / 'kcs_identified_hydrodynamics.json'
+    save_hydro_params(str(path), result)
+    refitted = MMGModel(kcs_specs, str(path))
+    state = VesselState(nu=np.array([5.0, 0.3, 0, 0, 0, 0.01]))
+    control = {'rpm': 90.0, 'rudder_angle': 15.0}
+    assert np.allclose(refitted.calculate_forces(state, control), truth.calculate_forces(state, control))
+
+def test_csv_and_run_log_give_the_same_samples(tmp_path, kcs_specs):
+    zigzag_trial(tmp_path, kcs_specs, steps=400)
+    from_log = trial_from_run_log(str(tmp_path / 'trial.vdslog'))
+    from_csv = trial_from_csv(glob.glob(str(tmp_path / 'simulation_log_*.csv'))[0])
+    assert len(from_csv) == len(from_log)
+    assert np.allclose(from_csv.accel, from_log.accel) and np.allclose(from_csv.rudder, from_log.rudder)
+    assert np.allclose(np.cos(from_csv.heading), np.cos(from_log.heading))
+    with pytest.raises(ValueError, match='force model'):
+        fit_hydro_params(MMGModel(kcs_specs, KCS_PARAMS), from_log, ['Y_vvv_prime'])
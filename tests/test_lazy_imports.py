@@ -0,0 +1,18 @@
+# tests/test_lazy_imports.py
+
+import numpy as np
+from benchmarks.import_time import HEADLESS_ENTRY_POINTS, probe_import
+from vds.data_handler.ais_parser import AISTarget
+
+def test_headless_entry_points_skip_heavy_dependencies():
+    for module in HEADLESS_ENTRY_POINTS:
+        assert probe_import(module)['heavy'] == [], module
+
+def test_ais_track_interpolates_and_extrapolates_linearly():
+    track = {'timestamp': [10.0, 0.0, 20.0], 'x': [100.0, 0.0, 100.0], 'y': [0.0, 0.0, 50.0], 'cog_deg': [0, 0, 90]}
+    target = AISTarget(1, track)
+    np.testing.assert_allclose(target.track_times, [0, 10, 20])
+    np.testing.assert_allclose(target.positions_at(np.array([-10.0, 5.0, 15.0, 30.0])),
+                               [[-100, 0], [50, 0], [100, 25], [100, 100]])
+    target.update(15.0)
+    assert np.isclose(target.state.cog_rad, np.radians(45))
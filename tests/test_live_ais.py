@@ -0,0 +1,110 @@
+# tests/test_live_ais.py
+
+import asyncio
+import socket
+import threading
+import time
+import numpy as np
+from vds.data_handler.ais_parser import AISTarget
+from vds.data_handler.aivdm import decode_position_reports, encode_position_report
+from vds.data_handler.live_ais import LiveAISFeed, LiveAISTarget, LiveTargetTable, LocalFrame, replay_sentences, serve_replay
+
+def free_port(kind=socket.SOCK_DGRAM) -> int:
+    with socket.socket(socket.AF_INET, kind) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def wait_for(feed: LiveAISFeed, now: float, count: int, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while len(feed.poll(now)) < count and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+def test_decodes_known_sentence_and_round_trips():
+    reports = decode_position_reports(['!AIVDM,1,1,,A,15RTgt0PAso;90TKcjM8h6g208CQ,0*4A', 'garbage',
+                                       '!AIVDM,1,1,,A,15RTgt0PAso;90TKcjM8h6g208CQ,0*4B'])
+    assert reports['mmsi'].tolist() == [371798000]
+    assert np.isclose(reports['lat'][0], 48.38163, atol=1e-5) and np.isclose(reports['lon'][0], -123.39538, atol=1e-5)
+    assert reports['sog_kts'][0] == 12.3 and reports['cog_deg'][0] == 224.0 and reports['heading_deg'][0] == 215.0
+
+    sentences = [encode_position_report(244660000 + k, 35.1 + k * 1e-3, 129.05 - k * 1e-3, 7.5, 300.2, msg_type=t)
+                 for k, t in enumerate((1, 18))]
+    reports = decode_position_reports(sentences)
+    assert reports['type'].tolist() == [1, 18] and reports['mmsi'].tolist() == [244660000, 244660001]
+    assert np.allclose(reports['lat'], [35.1, 35.101], atol=1e-6) and np.allclose(reports['cog_deg'], 300.2)
+    assert np.all(np.isnan(reports['heading_deg']))
+
+def test_table_rings_expire_and_evict():
+    table = LiveTargetTable(max_targets=2, history=4, ttl=10.0)
+    for t in range(6):
+        table.ingest(float(t), np.array([1, 1, 2]), np.array([t, t + 0.5, 0.0]), np.zeros(3), np.full(3, 10.0), np.zeros(3))
+    times, positions = table.track(table.slots[1])
+    assert len(times) == 4 and positions[:, 0].tolist() == [4.0, 4.5, 5.0, 5.5]
+    # 10 kn due north, dead-reckoned from the last fix
+    assert np.allclose(table.states_at(7.0)[table.active_slots() == table.slots[1]][0, :2], [5.5 + 2 * 5.14444, 0.0])
+
+    table.ingest(6.0, np.array([3]), np.zeros(1), np.zeros(1), np.zeros(1), np.zeros(1)) # Full: evicts the least recent
+    assert set(table.slots) == {2, 3}
+    assert table.expire(20.0) == 2 and not table.slots and not table.active.any()
+
+def test_forks_keep_live_targets_as_received(make_simulator):
+    """
+    Reports arriving after a fork move the parent's live targets but not the fork's.
+    분기 이후 수신된 보고는 원래 시뮬레이터의 대상만 움직여야 합니다.
+    """
+    table = LiveTargetTable()
+    table.ingest(0.0, np.array([7]), np.zeros(1), np.zeros(1), np.full(1, 10.0), np.zeros(1))
+    sim = make_simulator()
+    sim.ais_targets = [LiveAISTarget(table, table.slots[7])]
+    fork, = sim.fork(1)
+    table.ingest(1.0, np.array([7]), np.array([500.0]), np.array([500.0]), np.zeros(1), np.zeros(1))
+    assert np.allclose(fork.ais_targets[0].positions_at(np.array([10.0])), [[10 * 5.14444, 0.0]], atol=1e-3)
+    assert np.allclose(sim.ais_targets[0].positions_at(np.array([10.0])), [[500.0, 500.0]])
+    fork.step(0.1, {'rpm': 0.0, 'rudder_angle': 0.0})
+    assert fork.ais_targets[0].state.x < 1.0
+
+def run_server(schedule, port, protocol):
+    thread = threading.Thread(target=lambda: asyncio.run(serve_replay(schedule, '127.0.0.1', port, protocol, speedup=50.0)))
+    thread.start()
+    return thread
+
+def track_targets() -> list[AISTarget]:
+    return [AISTarget(100 + k, {'timestamp': [0.0, 100.0], 'x': [100.0 * k, 100.0 * k + 400.0],
+                                'y': [-200.0, -200.0], 'cog_deg': [0.0, 0.0]}) for k in range(3)]
+
+def test_udp_feed_drives_simulator_targets(make_simulator):
+    frame, port = LocalFrame(35.08, 129.08), free_port()
+    feed = LiveAISFeed(frame, port=port, protocol='udp', ttl=30.0).start()
+    try:
+        server = run_server(replay_sentences(track_targets(), frame, np.arange(0.0, 20.0, 2.0)), port, 'udp')
+        sim = make_simulator()
+        sim.live_ais = feed
+        wait_for(feed, sim.time, 3)
+        server.join()
+        time.sleep(0.1)
+        sim.step(0.1, {'rpm': 0.0, 'rudder_angle': 0.0})
+    finally:
+        feed.stop()
+    assert sorted(target.mmsi for target in sim.ais_targets) == [100, 101, 102]
+    assert feed.sentences_received == 30
+    # The last report (t = 18 s) put target 101 near x = 100 + 4 * 18, heading north at 4 m/s
+    target = next(target for target in sim.ais_targets if target.mmsi == 101)
+    assert abs(target.state.x - 172.0) < 2.0 and abs(target.state.y + 200.0) < 2.0
+    assert np.allclose(target.positions_at(np.array([10.0]))[0], [target.state.x + 40.0, target.state.y], atol=0.5)
+
+    sim.live_ais.poll(sim.time + 31.0)
+    assert not sim.live_ais.targets
+
+def test_tcp_feed_reads_lines():
+    frame, port = LocalFrame(35.08, 129.08), free_port(socket.SOCK_STREAM)
+    # Reports start 0.4 s (wall) after the server, once the client has connected
+    schedule = [(0.0, [])] + list(replay_sentences(track_targets(), frame, np.arange(20.0, 24.0, 1.0)))
+    server = run_server(schedule, port, 'tcp')
+    time.sleep(0.2)
+    feed = LiveAISFeed(frame, port=port, protocol='tcp').start()
+    try:
+        wait_for(feed, 0.0, 3)
+        server.join()
+    finally:
+        feed.stop()
+    assert len(feed.targets) == 3
+    assert all(len(feed.table.track(target.slot)[0]) >= 1 for target in feed.targets)
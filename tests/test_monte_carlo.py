@@ -0,0 +1,77 @@
+# tests/test_monte_carlo.py
+
+import os
+import pytest
+from vds.core.monte_carlo import StudyConfig, FileJobQueue, Worker, run_job, run_local
+
+@pytest.fixture
+def config():
+    return StudyConfig(scenario_path='scenarios/car_carrier_test.yaml', jobs=6, seed=7, duration=20.0, dt=0.5,
+                       position_sigma_m=50.0, random_obstacles=3,
+                       obstacle_radius_m=(2.0, 5.0), obstacle_safe_zone_m=50.0)
+
+def test_job_results_depend_only_on_seed_and_job_id(config):
+    """
+    The same job id always gives the same row, whatever ran before it in the worker.
+    같은 작업 번호는 워커에서 먼저 실행된 작업과 무관하게 항상 같은 결과를 냅니다.
+    """
+    first = run_job(config, 3)
+    run_job(config, 4)
+    assert run_job(config, 3) == first
+    assert run_job(config, 4) != first
+
+def test_local_workers_match_serial_runs(config, tmp_path):
+    results = run_local(config, str(tmp_path / 'queue'), workers=2, batch_size=2)
+    assert results['job_id'].tolist() == list(range(config.jobs))
+    for job_id in (0, 5):
+        expected = run_job(config, job_id)
+        row = results.iloc[job_id]
+        assert row['final_x'] == pytest.approx(expected['final_x'])
+        assert row['wind_speed_kts'] == pytest.approx(expected['wind_speed_kts'])
+    assert FileJobQueue(str(tmp_path / 'queue')).counts()['done'] == config.jobs
+
+def test_failing_jobs_are_retried_then_parked(config, tmp_path):
+    config.max_attempts = 2
+    queue = FileJobQueue(str(tmp_path))
+    queue.submit(config)
+    calls = []
+    def flaky(cfg, job_id):
+        calls.append(job_id)
+        if job_id == 1:
+            raise RuntimeError("diverged")
+        return {'job_id': job_id, 'value': float(job_id)}
+
+    assert Worker(queue, 'w0', batch_size=4, job_runner=flaky).run() == config.jobs - 1
+    assert calls.count(1) == 2
+    counts = queue.counts()
+    assert counts['failed'] == 1 and counts['done'] == config.jobs - 1 and counts['pending'] == 0
+    assert queue.collect()['job_id'].tolist() == [0, 2, 3, 4, 5]
+
+def test_stale_running_jobs_are_requeued(config, tmp_path):
+    queue = FileJobQueue(str(tmp_path))
+    queue.submit(config)
+    jobs = queue.claim('dead-worker', 2)
+    for job in jobs:
+        path = os.path.join(str(tmp_path), 'running', f"job-{job['job_id']:09d}.json")
+        os.utime(path, (0, 0))
+    assert queue.requeue_stale(lease=60.0) == 2
+    assert queue.counts()['pending'] == config.jobs
+
+    # Each expiry counts an attempt, so a job that never finishes ends up in failed/
+    for _ in range(config.max_attempts - 1):
+        job, = queue.claim('dead-worker', 1)
+        os.utime(os.path.join(str(tmp_path), 'running', f"job-{job['job_id']:09d}.json"), (0, 0))
+        queue.requeue_stale(lease=60.0)
+    assert os.listdir(os.path.join(str(tmp_path), 'failed')) == ['job-000000000.json']
+
+def test_random_obstacles_keep_clear_of_the_perturbed_start():
+    """
+    Random obstacles avoid a safe zone around each job's own start, not around the map origin.
+    무작위 장애물은 지도 원점이 아니라 각 작업의 시작 위치 주변 안전 구역을 피해야 합니다.
+    """
+    config = StudyConfig(scenario_path='scenarios/busan_port_approach.yaml', jobs=4, seed=5, duration=1.0, dt=0.5,
+                         position_sigma_m=50.0, random_obstacles=300, obstacle_safe_zone_m=400.0)
+    for job_id in range(config.jobs):
+        row = run_job(config, job_id)
+        assert not row['collided']
+        assert row['min_clearance_m'] > config.obstacle_safe_zone_m - config.obstacle_radius_m[1] - 330.0 / 2 - 10.0
@@ -0,0 +1,105 @@
+# tests/test_mpc.py
+
+import time
+import numpy as np
+import pytest
+from vds.core.simulator import Simulator
+from vds.core.mpc import SamplingMPC
+from vds.environment.geography import Geography
+from vds.models.dynamics.batched_mmg_model import BatchedMMGModel
+
+@pytest.fixture
+def buoy_on_track(make_simulator):
+    """
+    Factory for a KCS heading north along a leg that runs straight through a buoy.
+    부이를 관통하는 직선 구간을 북쪽으로 항해하는 KCS.
+    """
+    def make(avoidance: bool) -> Simulator:
+        sim = make_simulator(seed=1)
+        sim.geography.add_obstacle(1500.0, 0.0, 100.0)
+        sim.waypoints = [{'name': 'WP1', 'position': [4000, 0]}]
+        specs = sim.vessel.specs
+        sim.collision_avoidance = SamplingMPC(BatchedMMGModel.from_model(sim.dynamics_model), specs.loa, specs.draft,
+                                              samples=128)
+        sim.avoidance_enabled = avoidance
+        sim.set_autopilot(True)
+        return sim
+    return make
+
+def run_past_buoy(sim: Simulator):
+    control = {'rpm': 85.0, 'rudder_angle': 0.0}
+    while sim.vessel.state.eta[0] < 1800.0 and not sim.collision_detected and sim.time < 600.0:
+        sim.step(1.0, control)
+
+def test_avoidance_clears_obstruction_on_track(buoy_on_track):
+    autopilot_only = buoy_on_track(avoidance=False)
+    run_past_buoy(autopilot_only)
+    assert autopilot_only.collision_detected
+
+    avoiding = buoy_on_track(avoidance=True)
+    run_past_buoy(avoiding)
+    assert not avoiding.collision_detected
+    assert avoiding.vessel.state.eta[0] >= 1800.0
+
+def test_solve_respects_compute_budget(buoy_on_track):
+    sim = buoy_on_track(avoidance=True)
+    mpc = sim.collision_avoidance
+    mpc.nominal_rpm = 85.0
+    mpc.solve(sim)  # Warm-up
+    mpc.iterations, mpc.budget = 1000, 0.3
+    started = time.perf_counter()
+    rudder, rpm = mpc.solve(sim)
+    elapsed = time.perf_counter() - started
+    assert mpc.last_iterations > 1
+    assert elapsed < mpc.budget * 1.5
+    assert -35.0 <= rudder <= 35.0 and rpm > 0
+
+def test_seeded_runs_are_identical(buoy_on_track):
+    """Avoidance manoeuvres depend only on the seed, not on how fast the machine solves."""
+    first, second = buoy_on_track(avoidance=True), buoy_on_track(avoidance=True)
+    second.collision_avoidance.budget = 10.0 # A cap that is never reached changes nothing
+    for sim in (first, second):
+        control = {'rpm': 85.0, 'rudder_angle': 0.0}
+        while sim.time < 90.0:
+            sim.step(1.0, control)
+    assert abs(first.vessel.state.eta[1]) > 1.0 # Already manoeuvring around the buoy
+    assert np.array_equal(first.vessel.state.eta, second.vessel.state.eta)
+
+def test_shallow_water_is_penalized(buoy_on_track):
+    """Straight-ahead rollouts over water shallower than the draft are scored as groundings."""
+    sim = buoy_on_track(avoidance=True)
+    depths = np.full((200, 200), -50.0)
+    depths[30:, :2] = -5.0  # Narrow shoal on the track from 600 m north
+    sim.geography = Geography(depths, 20.0)
+    mpc = sim.collision_avoidance
+    mpc.nominal_rpm = 85.0
+    knots = np.array([[0.0] * 4, [35.0] * 4])
+    rpm = np.full(2, 85.0)
+    positions, headings = mpc.rollout(sim.vessel.state.eta, sim.vessel.state.nu, knots, rpm)
+    cost = mpc.cost(sim, positions, headings, knots, rpm, mpc._hazards(sim, reach=0.0))
+    assert cost[0] >= mpc.weights.grounding
+    assert cost[1] < mpc.weights.grounding
+
+def test_structures_are_penalized(buoy_on_track):
+    """Rollouts brushing a polygonal structure beside the track are scored as collisions."""
+    sim = buoy_on_track(avoidance=True)
+    sim.geography.set_polygons([np.array([[600.0, -200.0], [700.0, -200.0], [700.0, -60.0], [600.0, -60.0]])])
+    mpc = sim.collision_avoidance
+    mpc.nominal_rpm = 85.0
+    knots = np.array([[0.0] * 4, [35.0] * 4])
+    rpm = np.full(2, 85.0)
+    positions, headings = mpc.rollout(sim.vessel.state.eta, sim.vessel.state.nu, knots, rpm)
+    cost = mpc.cost(sim, positions, headings, knots, rpm, mpc._hazards(sim, reach=1000.0))
+    assert cost[0] >= mpc.weights.collision
+    assert cost[1] < mpc.weights.collision
+
+def test_warm_start_advances_by_elapsed_time(buoy_on_track):
+    """A plan re-used one control interval later is shifted by that interval, not a whole segment."""
+    sim = buoy_on_track(avoidance=True)
+    mpc = sim.collision_avoidance
+    rudder, rpm = mpc.solve(sim)  # Before any `update`: nominal rpm from the current speed
+    assert np.isfinite(rudder) and rpm > 0
+    mpc._mean, mpc._mean_time = np.array([0.0, 30.0, 30.0, 30.0]), sim.time
+    shifted = mpc._shifted_mean(sim.time + mpc.control_interval)
+    assert np.isclose(shifted[0], 30.0 * mpc.control_interval / (mpc.horizon / mpc.segments))
+    assert np.allclose(shifted[1:], 30.0)
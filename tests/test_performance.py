@@ -0,0 +1,49 @@
+# tests/test_performance.py
+
+import numpy as np
+import yaml
+from vds.core.fleet import steady_rpm
+from vds.core.performance import PerformanceTable, build_performance_table, solve_equilibrium
+from vds.models.dynamics.batched_mmg_model import BatchedMMGModel
+from vds.environment.wind import Wind
+from scenarios.scenario_loader import load_scenario
+
+def test_equilibria_match_long_simulations(kcs_model):
+    model = BatchedMMGModel.from_model(kcs_model)
+    rpm, rudder = np.array([80.0, 120.0, 120.0]), np.array([0.0, 10.0, -25.0])
+    states, converged = solve_equilibrium(model, rpm, rudder)
+    assert converged.all()
+    nu = np.zeros((3, 6))
+    nu[:, 0] = 3.0
+    for _ in range(20000):
+        nu += 0.1 * model.calculate_forces(np.zeros((3, 6)), nu, rpm, rudder)
+    assert np.allclose(states, nu[:, [0, 1, 5]], rtol=1e-3, atol=1e-6)
+    # A head wind slows the ship
+    windy, _ = solve_equilibrium(model, rpm[:1], 0.0, Wind(speed=30.0, direction=0.0))
+    assert windy[0, 0] < states[0, 0]
+
+def test_table_lookups_and_round_trip(tmp_path, kcs_model):
+    model = BatchedMMGModel.from_model(kcs_model)
+    table = build_performance_table(model, 200.0, n_rpm=21, n_rudder=9, head_wind_kts=(0.0, 20.0))
+    speeds = np.array([2.0, 4.0, 6.0])
+    expected = steady_rpm(model, speeds)
+    assert np.allclose([table.rpm_for_speed(s) for s in speeds], expected, rtol=0.01)
+    assert np.isclose(table.speed_at(table.rpm_for_speed(4.0)), 4.0, rtol=0.01)
+    assert table.rpm_for_speed(4.0, head_wind_kts=20.0) > table.rpm_for_speed(4.0)
+    assert table.turning_radius(100.0, 0.0) == np.inf
+    assert np.isclose(table.turning_radius(100.0, 35.0), table.turning_radius(100.0, -35.0), rtol=1e-3)
+
+    path = tmp_path / 'kcs_performance.json'
+    table.save(str(path))
+    loaded = PerformanceTable.load(str(path))
+    assert np.array_equal(loaded.turn, table.turn, equal_nan=True) and loaded.rpm_for_speed(4.0) == table.rpm_for_speed(4.0)
+
+def test_scenarios_can_trim_rpm_for_their_speed(tmp_path):
+    with open('scenarios/busan_port_approach.yaml', 'r') as f:
+        config = yaml.safe_load(f)
+    config['initial_control']['rpm'] = 'auto'
+    path = tmp_path / 'auto_rpm.yaml'
+    path.write_text(yaml.safe_dump(config))
+    vessel, dynamics_model, *_, initial_control, _, _, _ = load_scenario(str(path))
+    model = BatchedMMGModel.from_model(dynamics_model)
+    assert np.isclose(initial_control['rpm'], steady_rpm(model, np.array([vessel.state.nu[0]]))[0], rtol=0.01)
@@ -0,0 +1,70 @@
+# tests/test_predictor.py
+
+import time
+import numpy as np
+import pytest
+from vds.models.vessels.base_vessel import VesselState
+from vds.models.dynamics.batched_mmg_model import BatchedMMGModel
+from vds.core.kinematics import update_kinematics_6dof
+from vds.core.predictor import TrajectoryPredictor, PredictorWorker
+from vds.environment.wind import Wind
+
+def test_batched_model_matches_scalar_model(kcs_model):
+    """
+    Each row of the batched model must reproduce the scalar MMG model.
+    배치 모델의 각 행은 스칼라 MMG 모델과 같은 결과를 내야 합니다.
+    """
+    rng = np.random.default_rng(0)
+    eta = rng.normal(size=(50, 6)) * [100, 100, 0, 0, 0, 3]
+    nu = rng.normal(size=(50, 6)) * [5, 1, 0, 0, 0, 0.02]
+    rpm = rng.uniform(-100, 150, 50)
+    rudder = rng.uniform(-35, 35, 50)
+    wind = Wind(speed=10.0, direction=45.0)
+
+    batched = BatchedMMGModel.from_model(kcs_model).calculate_forces(eta, nu, rpm, rudder, wind=wind)
+    for i in range(50):
+        state = VesselState(eta=eta[i].copy(), nu=nu[i].copy())
+        expected = kcs_model.calculate_forces(state, {'rpm': rpm[i], 'rudder_angle': rudder[i]}, wind=wind)
+        assert batched[i] == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+def test_current_control_forecast_matches_simulation(kcs_model):
+    predictor = TrajectoryPredictor(BatchedMMGModel.from_model(kcs_model), horizon=60.0, dt=1.0)
+    state = VesselState(nu=np.array([7.7, 0, 0, 0, 0, 0]))
+    control = {'rpm': 85.0, 'rudder_angle': 10.0}
+    tracks = predictor.predict(state, control)
+    assert tracks.shape == (4, 60, 2)
+
+    for _ in range(60):
+        state.nu += kcs_model.calculate_forces(state, control) * 1.0
+        state = update_kinematics_6dof(state, 1.0)
+    assert tracks[0, -1] == pytest.approx(state.eta[:2], rel=1e-9)
+    # Hard port ends up west (port) of hard starboard
+    assert tracks[1, -1, 1] < tracks[3, -1, 1]
+
+def test_worker_refreshes_only_on_control_change(kcs_model):
+    class FakeSimulator:
+        time = 0.0
+        wind = current = waves = None
+        class vessel:
+            state = VesselState(nu=np.array([7.7, 0, 0, 0, 0, 0]))
+
+    worker = PredictorWorker(TrajectoryPredictor(BatchedMMGModel.from_model(kcs_model), horizon=30.0))
+    try:
+        control = {'rpm': 85.0, 'rudder_angle': 0.0}
+        worker.update(FakeSimulator, control)
+        deadline = time.time() + 5.0
+        while worker.version == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        forecast = worker.forecast
+        assert forecast.version == worker.version == 1 and forecast.origin_time == 0.0
+        assert len(forecast.tracks) == len(forecast.rudders) and forecast.rudders[0] == 0.0
+        assert worker._last_key == (85.0, 0.0)
+
+        request_time = worker._last_request_time
+        FakeSimulator.time = 1.0
+        worker.update(FakeSimulator, control)
+        assert worker._last_request_time == request_time
+        worker.update(FakeSimulator, {'rpm': 85.0, 'rudder_angle': 5.0})
+        assert worker._last_request_time == 1.0
+    finally:
+        worker.stop()
@@ -0,0 +1,47 @@
+# tests/test_profiler.py
+
+import json
+import numpy as np
+import pytest
+from vds.utils.profiler import Profiler
+
+@pytest.fixture
+def autopilot_run(make_simulator):
+    """Factory for a KCS following one waypoint with the autopilot, far from a single buoy."""
+    def make():
+        sim = make_simulator(seed=1)
+        sim.geography.add_obstacle(5000.0, 5000.0, 50.0)
+        sim.waypoints = [{'name': 'WP1', 'position': [3000, 500]}]
+        sim.set_autopilot(True)
+        return sim
+    return make
+
+def test_profiled_step_matches_plain_step_and_counts_phases(autopilot_run):
+    plain, profiled = autopilot_run(), autopilot_run()
+    profiled.profiler = Profiler()
+    for _ in range(50):
+        plain.step(0.1, {'rpm': 100.0, 'rudder_angle': 0.0})
+        profiled.step(0.1, {'rpm': 100.0, 'rudder_angle': 0.0})
+    np.testing.assert_array_equal(plain.vessel.state.eta, profiled.vessel.state.eta)
+
+    summary = profiled.profiler.summary()
+    assert summary['counters'] == {'steps': 50, 'obstacles_checked': 50, 'targets_updated': 0}
+    for phase in ('step', 'waypoints', 'autopilot', 'depth', 'forces', 'kinematics', 'collisions', 'ais'):
+        assert summary['phases'][phase]['count'] == 50
+    step = summary['phases']['step']
+    assert 0 < step['p50_ms'] <= step['p99_ms'] <= step['max_ms']
+
+def test_ring_buffer_keeps_latest_samples_and_exports(tmp_path):
+    profiler = Profiler(capacity=4)
+    for _ in range(10):
+        profiler.record('phase', profiler.now())
+    assert profiler.stats('phase')['count'] == 10
+    assert len(profiler.samples('phase')) == 4
+
+    profiler.save_chrome_trace(str(tmp_path / 'trace.json'))
+    with open(tmp_path / 'trace.json') as f:
+        events = json.load(f)['traceEvents']
+    assert len(events) == 4 and all(event['ph'] == 'X' and event['name'] == 'phase' for event in events)
+    profiler.save_json(str(tmp_path / 'profile.json'))
+    with open(tmp_path / 'profile.json') as f:
+        assert json.load(f)['phases']['phase']['count'] == 10
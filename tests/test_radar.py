@@ -0,0 +1,60 @@
+# tests/test_radar.py
+
+import numpy as np
+import pytest
+from vds.core.radar import LAND, NO_RETURN, OBSTRUCTION, TARGET, Radar
+from vds.core.simulator import Simulator
+from vds.data_handler.ais_parser import AISTarget
+from vds.environment.geography import Geography
+
+@pytest.fixture
+def radar_world(make_simulator):
+    """Factory for the test simulator at (3000, 3000) over the given depth grid."""
+    def make(depth: np.ndarray, seed=0) -> Simulator:
+        base = make_simulator()
+        sim = Simulator(base.vessel, base.dynamics_model, Geography(depth, 20.0), seed=seed)
+        sim.vessel.state.eta[:2] = [3000.0, 3000.0]
+        return sim
+    return make
+
+def test_first_returns_from_land_obstructions_and_hulls(radar_world):
+    depth = np.full((300, 300), -50.0)
+    depth[200:, :] = 50.0  # High land from 4000 m north, well above the draft band
+    sim = radar_world(depth)
+    sim.geography.set_obstacles([[3000.0, 3500.0], [4500.0, 3000.0]], [50.0, 50.0])  # The second is behind the land
+    sim.ais_targets = [AISTarget(1, {'timestamp': [0, 1], 'x': [2000, 2000], 'y': [3000, 3000], 'cog_deg': [90, 90]})]
+    sweep = Radar(n_bearings=1024).sweep(sim)
+    north, east, south, west = 0, 256, 512, 768
+    assert sweep.source[north] == LAND and np.isclose(sweep.ranges[north], 1000.0)
+    assert sweep.source[east] == OBSTRUCTION and sweep.index[east] == 0 and np.isclose(sweep.ranges[east], 450.0)
+    assert sweep.source[south] == TARGET and sweep.index[south] == 0 and np.isclose(sweep.ranges[south], 1000.0 - 12.5)
+    assert sweep.source[west] == NO_RETURN and sweep.ranges[west] == 6000.0
+    assert not np.any((sweep.source == OBSTRUCTION) & (sweep.index == 1))
+    assert np.allclose(sweep.points()[0], [4000.0, 3000.0])
+
+def test_obstruction_ranges_match_brute_force(radar_world):
+    sim = radar_world(np.full((10, 10), -50.0))
+    rng = np.random.default_rng(1)
+    centers, radii = rng.uniform(0, 6000, (500, 2)), rng.uniform(5, 60, 500)
+    sim.geography.set_obstacles(centers, radii)
+    radar = Radar(n_bearings=512, max_range=2500.0)
+    sweep = radar.sweep(sim)
+
+    relative = centers - sim.vessel.state.eta[:2]
+    along = radar.directions @ relative.T
+    across_sq = (relative**2).sum(axis=1) - along**2
+    hit = (across_sq <= radii**2) & (along > 0)
+    expected = np.where(hit, along - np.sqrt(np.maximum(radii**2 - across_sq, 0.0)), np.inf).min(axis=1)
+    assert np.allclose(sweep.ranges, np.minimum(expected, 2500.0))
+
+def test_noise_comes_from_the_sensor_stream(radar_world):
+    depth = np.full((300, 300), -50.0)
+    depth[200:, :] = 5.0
+    truth = Radar().sweep(radar_world(depth))
+    radar = Radar(range_sigma=5.0, detection_probability=0.8)
+    first, again = radar.sweep(radar_world(depth, seed=3)), radar.sweep(radar_world(depth, seed=3))
+    assert np.array_equal(first.ranges, again.ranges)
+    land = truth.source == LAND
+    returned = first.source == LAND
+    assert not np.any(returned & ~land) and 0.7 < returned.sum() / land.sum() < 0.9
+    assert 3.0 < np.std(first.ranges[returned] - truth.ranges[returned]) < 7.0
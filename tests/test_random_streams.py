@@ -0,0 +1,49 @@
+# tests/test_random_streams.py
+
+import time
+import numpy as np
+import pytest
+import yaml
+from vds.core.random_streams import RandomStreams
+from vds.environment.geography import Geography
+from scenarios.scenario_loader import load_scenario
+
+def test_streams_are_reproducible_and_independent():
+    """
+    Same seed gives the same streams, and drawing from one stream never shifts another.
+    같은 시드는 같은 스트림을 만들고, 한 스트림의 사용이 다른 스트림에 영향을 주지 않습니다.
+    """
+    a, b = RandomStreams(1234), RandomStreams(1234)
+    a.environment.random(1000)
+    assert a.obstacles.random() == b.obstacles.random()
+    assert a.sensors.random() == b.sensors.random()
+    assert a.obstacles.random() != a.sensors.random()
+    assert RandomStreams.for_job(7, 3).environment.random() == RandomStreams.for_job(7, 3).environment.random()
+    assert RandomStreams.for_job(7, 3).environment.random() != RandomStreams.for_job(7, 4).environment.random()
+
+def test_bulk_obstacle_field():
+    geography = Geography(np.full((500, 500), -50.0), 20.0)
+    started = time.perf_counter()
+    geography.add_random_obstacles(100_000, 5.0, 50.0, safe_zone_radius=2000.0, rng=np.random.default_rng(0))
+    assert time.perf_counter() - started < 0.5
+    assert geography.obstacle_positions.shape == (100_000, 2)
+    assert np.linalg.norm(geography.obstacle_positions, axis=1).min() > 2000.0
+    assert geography.obstacle_positions.max(axis=0) == pytest.approx([10000.0, 10000.0], abs=10.0)
+    assert 5.0 <= geography.obstacle_radii.min() and geography.obstacle_radii.max() <= 50.0
+
+    with pytest.raises(ValueError):
+        geography.add_random_obstacles(1, 5.0, 50.0, safe_zone_radius=20000.0)
+
+def test_scenario_seed_reproduces_random_obstacles(tmp_path):
+    with open('scenarios/vlcc_slalom_test.yaml', 'r') as f:
+        config = yaml.safe_load(f)
+    config['seed'] = 99
+    config['environment']['obstacles'] = {'enabled': True,
+                                          'random': {'count': 20, 'min_radius': 5, 'max_radius': 10}}
+    path = tmp_path / 'seeded.yaml'
+    path.write_text(yaml.safe_dump(config))
+
+    first, second = load_scenario(str(path))[2], load_scenario(str(path))[2]
+    assert np.array_equal(first.obstacle_positions, second.obstacle_positions)
+    overridden = load_scenario(str(path), seed=100)[2]
+    assert not np.array_equal(first.obstacle_positions, overridden.obstacle_positions)
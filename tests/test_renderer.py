@@ -0,0 +1,31 @@
+# tests/test_renderer.py
+
+import numpy as np
+from app.renderer import Renderer
+from vds.data_handler.ais_parser import AISTarget
+
+def make_target(mmsi: int, x: float, y: float, cog_deg: float = 0.0) -> AISTarget:
+    return AISTarget(mmsi, {'timestamp': [0.0, 1000.0], 'x': [x, x], 'y': [y, y], 'cog_deg': [cog_deg, cog_deg]})
+
+def test_text_surfaces_are_cached_with_lru_eviction():
+    renderer = Renderer(200, 100, headless=True)
+    renderer.TEXT_CACHE_SIZE = 2
+    first = renderer._text("a", (255, 255, 255))
+    assert renderer._text("a", (255, 255, 255)) is first
+    assert renderer._text("a", (255, 0, 0)) is not first
+    renderer._text("b", (255, 255, 255))
+    assert len(renderer._text_cache) == 2 and renderer._text("a", (255, 255, 255)) is not first
+
+def test_only_visible_ais_targets_are_drawn(make_simulator):
+    renderer = Renderer(400, 300, headless=True)
+    renderer.zoom, renderer.offset = 1.0, np.array([200.0, 150.0])
+    simulator = make_simulator()
+    simulator.show_minimap = simulator.show_water_depth = False
+    far = [make_target(i, 1e6 + i, 1e6) for i in range(1000)]
+    simulator.ais_targets = far + [make_target(2000, 100.0, 50.0)]
+    visible = renderer._visible(renderer._world_to_screen_array(np.array([[100.0, 50.0], [1e6, 1e6]])), margin=15)
+    assert visible.tolist() == [True, False]
+
+    renderer.render(simulator, {'rpm': 0.0, 'rudder_angle': 0.0})
+    x, y = renderer._world_to_screen(np.array([100.0, 50.0]))
+    assert tuple(renderer.screen.get_at((x, y)))[:3] == (150, 150, 150)
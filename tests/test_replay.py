@@ -0,0 +1,59 @@
+# tests/test_replay.py
+
+import numpy as np
+from app.renderer import Renderer
+from vds.core.replay import ReplayPlayer
+from vds.data_handler.run_log import RunLog
+from vds.utils.logger import DataLogger
+
+def record_run(make_simulator, path: str, steps: int = 300, reset_at: int = 200):
+    """Logs a run with a simulator reset part-way through, as main.py does."""
+    sim = make_simulator()
+    logger = DataLogger(path, attributes={'scenario_path': 'none'}, run_log_chunk_rows=64)
+    control = {'rpm': 100.0, 'rudder_angle': 10.0}
+    states = []
+    for i in range(steps):
+        if i == reset_at:
+            sim.reset()
+        logger.log(sim, control)
+        states.append(sim.vessel.state.eta.copy())
+        sim.step(0.1, control)
+    logger.run_log.close()
+    return np.array(states)
+
+def test_time_index_finds_rows_across_chunks_and_resets(tmp_path, make_simulator):
+    states = record_run(make_simulator, str(tmp_path / 'run.vdslog'))
+    log = RunLog(str(tmp_path / 'run.vdslog'))
+    assert len(log) == 300 and len(log.chunk_starts) == 5 and log.attributes['scenario_path'] == 'none'
+    elapsed = np.asarray(log['elapsed'])
+    assert np.all(np.diff(elapsed) >= 0)
+    for t in (-1.0, 0.0, 3.33, 6.4, 19.95, 25.0, 100.0):
+        assert log.index_at(t) == max(np.searchsorted(elapsed, t, side='right') - 1, 0)
+    np.testing.assert_allclose(log['eta_0'], states[:, 0])
+
+def test_player_seeks_and_plays_in_both_directions(tmp_path, make_simulator):
+    states = record_run(make_simulator, str(tmp_path / 'run.vdslog'))
+    log = RunLog(str(tmp_path / 'run.vdslog'))
+    player = ReplayPlayer(log, make_simulator())
+    sim = player.simulator
+
+    player.seek(15.0)
+    np.testing.assert_allclose(sim.vessel.state.eta, states[player.index])
+    assert len(sim.track_history) == player.index + 1
+
+    player.speed = 4.0
+    player.advance(0.5)  # Two simulated seconds forward: the track is extended, not rebuilt
+    generation = sim.track_history.generation
+    player.advance(0.5)
+    assert sim.track_history.generation == generation and player.time == 19.0
+    np.testing.assert_allclose(sim.track_history.points()[-1], states[player.index][:2])
+
+    player.speed = -8.0
+    player.advance(0.5)
+    assert player.time == 15.0 and sim.track_history.generation > generation
+    player.step_rows(-1)
+    np.testing.assert_allclose(sim.vessel.state.eta, states[player.index])
+
+    renderer = Renderer(320, 240, headless=True)
+    renderer.replay = player
+    renderer.render(sim, player.control())
@@ -0,0 +1,50 @@
+# tests/test_route.py
+
+import numpy as np
+import pytest
+from vds.core.route import Route
+
+WAYPOINTS = [
+    {'name': 'WP1', 'position': [1000, 0]},
+    {'name': 'WP2', 'position': [1000, 1000]},
+    {'name': 'WP3', 'position': [2000, 1000]},
+]
+
+def test_leg_geometry():
+    """
+    Leg lengths, courses and wheel-over distances are precomputed from the waypoints.
+    구간 길이, 침로, 전타 거리가 웨이포인트로부터 미리 계산되어야 합니다.
+    """
+    route = Route(WAYPOINTS, origin=[0, 0], turn_radius=200.0, arrival_radius=100.0)
+    assert route.leg_lengths == pytest.approx([1000.0, 1000.0, 1000.0])
+    assert route.total_length == pytest.approx(3000.0)
+    assert np.degrees(route.leg_courses) == pytest.approx([0.0, 90.0, 0.0])
+    # 90 degree turns: wheel-over distance equals the turn radius
+    assert route.wheel_over_distances == pytest.approx([200.0, 200.0, 100.0])
+    assert route.wheel_over_points[0] == pytest.approx([800.0, 0.0])
+
+def test_cross_and_along_track_errors():
+    route = Route(WAYPOINTS, origin=[0, 0], turn_radius=200.0, arrival_radius=100.0)
+    xte, along = route.leg_errors([300.0, 50.0], 0)
+    assert xte == pytest.approx(50.0) # Starboard of a northbound leg
+    assert along == pytest.approx(300.0)
+    assert route.distance_to_go([300.0, 50.0], 0) == pytest.approx(2700.0)
+
+    xtes, alongs = route.errors(np.array([[300.0, 50.0], [1100.0, 400.0]]), np.array([0, 1]))
+    assert xtes == pytest.approx([50.0, -100.0])
+    assert alongs == pytest.approx([300.0, 400.0])
+
+def test_leg_switching_at_wheel_over_point():
+    route = Route(WAYPOINTS, origin=[0, 0], turn_radius=200.0, arrival_radius=100.0)
+    assert not route.should_switch([790.0, 0.0], 0)
+    assert route.should_switch([810.0, 0.0], 0)
+    assert not route.should_switch([1850.0, 1000.0], 2)
+    assert route.should_switch([1950.0, 1000.0], 2)
+
+def test_route_file_csv(tmp_path):
+    path = tmp_path / 'route.csv'
+    path.write_text("name,x,y\n" + "\n".join(f"WP{i},{i * 100.0},{(i % 2) * 50.0}" for i in range(1, 301)))
+    waypoints = Route.load_waypoints(str(path))
+    route = Route(waypoints, origin=[0, 0], turn_radius=50.0, arrival_radius=20.0)
+    assert route.num_legs == 300
+    assert route.names[-1] == 'WP300'
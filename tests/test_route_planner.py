@@ -0,0 +1,59 @@
+# tests/test_route_planner.py
+
+import numpy as np
+import pytest
+from vds.environment.geography import Geography
+from vds.core.route_planner import RoutePlanner
+
+def make_channel_geography():
+    """
+    Deep water with a shallow bank across the middle and a single deep gap at the east side.
+    중앙을 가로지르는 얕은 뱅크와 동쪽의 깊은 통로 하나가 있는 지형.
+    """
+    depth = np.full((100, 100), -40.0)
+    depth[45:55, :] = -5.0
+    depth[45:55, 80:90] = -40.0
+    return Geography(depth, cell_size=10.0)
+
+def test_route_passes_through_gap_and_stays_clear():
+    geography = make_channel_geography()
+    planner = RoutePlanner(geography, draft=10.0, clearance=10.0)
+    waypoints = planner.plan([50.0, 500.0], [950.0, 500.0])
+
+    assert waypoints[-1]['position'] == pytest.approx([950.0, 500.0])
+    points = np.array([[50.0, 500.0]] + [wp['position'] for wp in waypoints])
+    cost_map = planner.cost_map([points[0], points[-1]])
+    for p, q in zip(points[:-1], points[1:]):
+        assert cost_map.line_of_sight(p, q)
+    # The bank can only be crossed through the gap (east 800-900 m)
+    crossing = points[(points[:, 0] > 400) & (points[:, 0] < 600)]
+    assert len(crossing) == 0 or np.all((crossing[:, 1] > 800) & (crossing[:, 1] < 900))
+
+def test_shallow_draft_goes_straight():
+    """A vessel that fits over the bank needs no detour."""
+    geography = make_channel_geography()
+    planner = RoutePlanner(geography, draft=2.0, clearance=10.0)
+    waypoints = planner.plan([50.0, 500.0], [950.0, 500.0])
+    assert len(waypoints) == 1
+
+def test_obstacles_are_avoided_and_cost_map_is_cached():
+    geography = Geography(np.full((50, 50), -40.0), cell_size=10.0)
+    geography.add_obstacle(250.0, 250.0, 60.0)
+    planner = RoutePlanner(geography, draft=10.0, clearance=20.0)
+    waypoints = planner.plan([20.0, 250.0], [480.0, 250.0])
+    assert len(waypoints) > 1
+    assert planner.cost_map([[20.0, 250.0], [480.0, 250.0]]) is planner.cost_map([[20.0, 250.0], [480.0, 250.0]])
+
+    geography.add_obstacle(100.0, 100.0, 10.0)
+    assert len(planner._cache) == 1
+    planner.cost_map([[20.0, 250.0], [480.0, 250.0]])
+    assert len(planner._cache) == 2
+
+def test_depth_edits_invalidate_cached_cost_map():
+    """A depth grid edited in place (and marked changed) must not get the map of the old grid."""
+    geography = make_channel_geography()
+    planner = RoutePlanner(geography, draft=10.0, clearance=10.0)
+    assert len(planner.plan([50.0, 500.0], [950.0, 500.0])) > 1
+    geography.depth_data[45:55, :] = -40.0  # Dredge the bank
+    geography.mark_depth_changed()
+    assert len(planner.plan([50.0, 500.0], [950.0, 500.0])) == 1
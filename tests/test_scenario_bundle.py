@@ -0,0 +1,62 @@
+# tests/test_scenario_bundle.py
+
+import os
+import shutil
+import numpy as np
+import pytest
+import yaml
+from scenarios.scenario_bundle import ScenarioBundle, compile_scenario, load_bundle, resolve_scenario
+from scenarios.scenario_loader import load_scenario
+
+SCENARIO = 'scenarios/busan_port_approach.yaml'
+
+@pytest.fixture
+def scenario(tmp_path):
+    """
+    A copy of the Busan scenario whose hydro file lives in a temporary directory.
+    수소 파라미터 파일을 임시 디렉터리에 둔 부산 시나리오 사본.
+    """
+    hydro = tmp_path / 'vlcc_hydrodynamics.json'
+    shutil.copy('data/vessel_params/vlcc_hydrodynamics.json', hydro)
+    with open(SCENARIO, 'r') as f:
+        config = yaml.safe_load(f)
+    config['vessel']['hydro_params'] = str(hydro)
+    path = tmp_path / 'busan.yaml'
+    path.write_text(yaml.safe_dump(config))
+    return str(path), hydro
+
+def test_bundle_round_trip_is_memory_mapped(scenario, tmp_path):
+    path, _ = scenario
+    resolved = resolve_scenario(path)
+    opened = ScenarioBundle.open(compile_scenario(path, output_path=str(tmp_path / 'busan.vdsb')))
+    assert opened.content_hash == resolved.content_hash
+    assert isinstance(opened.arrays['depth'], np.memmap)
+    for name, array in resolved.arrays.items():
+        assert np.array_equal(opened.arrays[name], array)
+    assert opened.meta['waypoints'] == resolved.meta['waypoints']
+    assert opened.meta['hydro_params'] == resolved.meta['hydro_params']
+
+def test_source_changes_invalidate_the_bundle(scenario):
+    path, hydro = scenario
+    first = load_bundle(path)
+    assert not first.is_stale()
+
+    # Touching a file without changing it keeps the bundle
+    stat = os.stat(hydro)
+    os.utime(hydro, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert not first.is_stale()
+
+    hydro.write_text(hydro.read_text().replace('"rho": 1025.0', '"rho": 1026.0'))
+    assert first.is_stale()
+    second = load_bundle(path)
+    assert second.content_hash != first.content_hash
+    assert second.meta['hydro_params']['rho'] == 1026.0
+
+def test_bundled_and_direct_loads_agree(scenario):
+    path, _ = scenario
+    direct = load_scenario(path, use_bundle=False)
+    bundled = load_scenario(path)
+    assert np.array_equal(direct[2].depth_data, bundled[2].depth_data)
+    assert np.array_equal(direct[2].obstacle_positions, bundled[2].obstacle_positions)
+    assert direct[8] == bundled[8]
+    assert direct[1].p == bundled[1].p
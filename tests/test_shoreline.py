@@ -0,0 +1,62 @@
+# tests/test_shoreline.py
+
+import json
+import numpy as np
+from vds.core.simulator import Simulator
+from vds.environment.geography import Geography
+from vds.environment.shoreline import SegmentBVH, load_polygons, marching_squares
+
+def test_marching_squares_traces_an_island():
+    n = 100
+    i, j = np.meshgrid(np.arange(n), np.arange(n), indexing='ij')
+    depth = 60.0 - np.hypot((i + 0.5) * 10.0 - 500.0, (j + 0.5) * 10.0 - 500.0)  # Island of radius 60 m
+    segments = marching_squares(depth, 0.0, 10.0)
+    radius = np.hypot(*(segments.reshape(-1, 2) - 500.0).T)
+    assert np.allclose(radius, 60.0, atol=0.2)
+    assert np.isclose(np.hypot(*(segments[:, 1] - segments[:, 0]).T).sum(), 2 * np.pi * 60.0, rtol=0.01)
+    assert len(marching_squares(np.full((5, 5), -10.0), 0.0, 10.0)) == 0
+
+def test_bvh_queries_match_brute_force():
+    rng = np.random.default_rng(2)
+    starts = rng.uniform(0.0, 5000.0, (3000, 2))
+    segments = np.stack([starts, starts + rng.uniform(-40.0, 40.0, (3000, 2))], axis=1)
+    bvh = SegmentBVH(segments, np.arange(3000))
+    points = rng.uniform(0.0, 5000.0, (200, 2))
+
+    distance, owner = bvh.nearest(points)
+    edge = segments[:, 1] - segments[:, 0]
+    rel = points[:, None, :] - segments[None, :, 0]
+    t = np.clip((rel * edge).sum(axis=2) / (edge**2).sum(axis=1), 0.0, 1.0)
+    brute = np.hypot(*(rel - t[..., None] * edge).transpose(2, 0, 1))
+    assert np.allclose(distance, brute.min(axis=1)) and np.array_equal(owner, brute.argmin(axis=1))
+
+    hits = bvh.hull_contacts(points, np.zeros(200), 100.0, 20.0)
+    # A segment touches the north-up 100 x 20 box if a dense sampling of it falls inside
+    samples = segments[:, None, 0] + np.linspace(0.0, 1.0, 200)[None, :, None] * edge[:, None, :]
+    inside = [np.any(np.all(np.abs(samples - p) <= [50.0, 10.0], axis=2)) for p in points]
+    assert np.array_equal(hits >= 0, inside)
+
+def test_structures_load_collide_and_show_on_radar(tmp_path, make_simulator):
+    path = tmp_path / 'pier.json'
+    path.write_text(json.dumps({'polygons': [{'name': 'Pier', 'points': [[1000, -50], [1000, 50], [1050, 50], [1050, -50], [1000, -50]]}]}))
+    csv_path = tmp_path / 'pier.csv'
+    csv_path.write_text("polygon,x,y\n0,1000,-50\n0,1000,50\n0,1050,50\n0,1050,-50\n")
+    polygons = load_polygons(str(path))
+    assert len(polygons) == 1 and polygons[0].shape == (4, 2)
+    assert np.array_equal(load_polygons(str(csv_path))[0], polygons[0])
+
+    base = make_simulator()
+    sim = Simulator(base.vessel, base.dynamics_model, Geography(np.full((100, 10), -50.0), 20.0))
+    sim.geography.set_polygons(polygons)
+    assert np.isclose(sim.geography.distance_to_shore(900.0, 0.0), 100.0)
+
+    from vds.core.radar import STRUCTURE, Radar
+    sweep = Radar().sweep(sim)
+    assert sweep.source[0] == STRUCTURE and sweep.index[0] == 0 and np.isclose(sweep.ranges[0], 1000.0)
+
+    control = {'rpm': 100.0, 'rudder_angle': 0.0}
+    while not sim.collision_detected and sim.time < 400.0:
+        sim.step(0.5, control)
+    bow = sim.vessel.state.eta[0] + sim.vessel.specs.loa / 2
+    assert sim.collision_detected and 1000.0 <= bow < 1010.0
+    assert sim.events.events()[-1].label == 'own ship and structure #0'
@@ -0,0 +1,55 @@
+# tests/test_sim_server.py
+
+import asyncio
+import numpy as np
+from vds.core.sim_server import SimulationClient, SimulationServer
+from vds.core.state_codec import StateDecoder, StateEncoder, decode_varints, encode_varints, quantize
+from vds.data_handler.ais_parser import AISTarget
+
+def test_varints_round_trip_signed_values():
+    values = np.array([0, 1, -1, 63, -64, 64, 300, -300, 2**40, -2**62, 2**63 - 1, -2**63], dtype=np.int64)
+    data = b'xx' + encode_varints(values) + b'tail'
+    decoded, end = decode_varints(data, 2, len(values))
+    assert np.array_equal(decoded, values) and data[end:] == b'tail'
+    assert len(encode_varints(np.array([5, -5]))) == 2
+
+def test_deltas_are_exact_and_small(make_simulator):
+    sim = make_simulator()
+    sim.ais_targets = [AISTarget(7, {'timestamp': [0.0, 100.0], 'x': [0.0, 500.0], 'y': [0.0, 0.0], 'cog_deg': [0.0, 0.0]})]
+    control = {'rpm': 100.0, 'rudder_angle': 5.0}
+    encoder, decoder = StateEncoder(), StateDecoder()
+    for i in range(20):
+        sim.step(0.1, control)
+        keyframe, delta = encoder.encode(*quantize(sim, control))
+        frame = decoder.decode(keyframe if i == 0 else delta)
+    # 20 values would be 160 bytes as float64
+    assert len(keyframe) < 50 and len(delta) < 25
+    assert np.allclose(frame.eta, sim.vessel.state.eta, atol=1e-3) and np.isclose(frame.time, sim.time)
+    assert frame.ais_mmsi.tolist() == [7] and np.allclose(frame.ais_states[0, :2], [sim.ais_targets[0].state.x, 0.0], atol=0.01)
+    assert frame.rpm == 100.0 and frame.rudder_angle == 5.0 and not frame.autopilot
+
+def test_clients_share_one_simulation(make_simulator):
+    async def session():
+        server = SimulationServer(make_simulator(), {'rpm': 0.0, 'rudder_angle': 0.0}, port=0, dt=0.1, rate=200.0, speed=20.0)
+        await server.start()
+        instructor = await SimulationClient().connect(port=server.port)
+        trainee = await SimulationClient().connect(port=server.port)
+        running = asyncio.ensure_future(server.run(duration=3.0))
+        await trainee.send_control(120.0, 50.0)
+        await instructor.set_autopilot(True)
+        frames = []
+        while not frames or frames[-1].time < 2.95:
+            frames.append(await trainee.receive())
+        observed = await instructor.receive()
+        await running
+        await instructor.close(); await trainee.close()
+        server.close()
+        return server, frames, observed
+
+    server, frames, observed = asyncio.run(session())
+    # 200 wall-clock frames per second at 20x speed: one per 0.1 s step
+    assert len(frames) == 30 and [f.seq for f in frames] == list(range(1, 31))
+    assert frames[-1].rpm == 120.0 and frames[-1].rudder_angle == 35.0 and frames[-1].autopilot
+    assert observed.seq == 1 and np.allclose(frames[-1].eta, server.simulator.vessel.state.eta, atol=1e-3)
+    # Two clients, 30 frames each: mostly deltas
+    assert server.bytes_sent < 2 * 30 * 80
@@ -0,0 +1,65 @@
+# tests/test_snapshot.py
+
+import numpy as np
+import pytest
+from vds.core.snapshot import SimulationSnapshot
+
+@pytest.fixture
+def simulator(make_simulator):
+    """
+    A KCS on a two-leg route with the autopilot engaged.
+    두 구간 항로에서 오토파일럿이 작동 중인 KCS.
+    """
+    sim = make_simulator(seed=42)
+    sim.waypoints = [{'name': 'WP1', 'position': [3000, 500]}, {'name': 'WP2', 'position': [6000, -500]}]
+    sim.set_autopilot(True)
+    return sim
+
+def run(sim, control, steps=200):
+    for _ in range(steps):
+        sim.step(0.1, control)
+    return sim.vessel.state.eta.copy()
+
+def test_restore_replays_identically(simulator):
+    control = {'rpm': 85.0, 'rudder_angle': 0.0}
+    run(simulator, control)
+    snap = simulator.snapshot(control)
+    draw = simulator.rng.random()
+    expected = run(simulator, control)
+
+    control = simulator.restore(snap)
+    assert simulator.rng.random() == draw
+    assert np.array_equal(run(simulator, control), expected)
+
+def test_snapshot_bytes_round_trip(simulator):
+    run(simulator, {'rpm': 85.0, 'rudder_angle': 0.0})
+    snap = simulator.snapshot({'rpm': 85.0, 'rudder_angle': 5.0})
+    restored = SimulationSnapshot.from_bytes(snap.to_bytes())
+    assert np.array_equal(restored.values, snap.values)
+    assert np.array_equal(restored.rng_words, snap.rng_words)
+    assert restored.control == {'rpm': 85.0, 'rudder_angle': 5.0}
+
+def test_forks_are_independent(simulator):
+    """
+    Forked branches evolve independently and leave the original untouched.
+    분기된 시뮬레이션은 서로 독립적으로 진행되며 원본에 영향을 주지 않아야 합니다.
+    """
+    run(simulator, {'rpm': 85.0, 'rudder_angle': 0.0})
+    origin = simulator.vessel.state.eta.copy()
+    port, starboard = simulator.fork(2)
+    port.autopilot_enabled = starboard.autopilot_enabled = False
+    run(port, {'rpm': 85.0, 'rudder_angle': -35.0})
+    run(starboard, {'rpm': 85.0, 'rudder_angle': 35.0})
+
+    assert port.vessel.state.nu[5] < 0 < starboard.vessel.state.nu[5]
+    assert np.array_equal(simulator.vessel.state.eta, origin)
+
+def test_grounding_state_is_restored(simulator):
+    """A grounding already reported before the snapshot is not reported again after restoring it."""
+    simulator._grounded = True
+    snap = simulator.snapshot()
+    simulator._grounded = False
+    simulator.restore(snap)
+    assert simulator._grounded
+    simulator._grounded = False
+    assert all(fork._grounded for fork in simulator.fork(2, snap))
@@ -0,0 +1,27 @@
+# tests/test_track_history.py
+
+import numpy as np
+from vds.core.track_history import TrackHistory, simplify_polyline
+
+def test_ring_buffer_keeps_latest_points_in_order():
+    history = TrackHistory(maxlen=4)
+    for k in range(6):
+        history.append(np.array([k, -k, 0.0]))
+    assert len(history) == 4 and history.first == 2 and history.total == 6
+    np.testing.assert_array_equal(history.points()[:, 0], [2, 3, 4, 5])
+    np.testing.assert_array_equal(history.points(4)[:, 1], [-4, -5])
+    generation = history.generation
+    history.clear()
+    assert len(history) == 0 and history.generation == generation + 1
+
+def test_simplified_polyline_stays_within_tolerance():
+    t = np.linspace(0, 4 * np.pi, 2000)
+    points = np.column_stack([t * 100, np.sin(t) * 50])
+    kept = simplify_polyline(points, 1.0)
+    assert kept[0] == 0 and kept[-1] == len(points) - 1 and len(kept) < 200
+    # Every dropped point lies within the tolerance of its simplified segment
+    for a, b in zip(kept[:-1], kept[1:]):
+        chord, offsets = points[b] - points[a], points[a + 1:b] - points[a]
+        distance = np.abs(chord[0] * offsets[:, 1] - chord[1] * offsets[:, 0]) / np.hypot(*chord)
+        assert np.all(distance <= 1.0)
+    assert list(simplify_polyline(np.column_stack([t, 2 * t]), 1e-6)) == [0, len(t) - 1]
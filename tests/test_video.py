@@ -0,0 +1,35 @@
+# tests/test_video.py
+
+import io
+import os
+import numpy as np
+from app.renderer import Renderer
+from app.video import PngSequenceSink, RawVideoSink, frame_interval, record
+
+def test_record_writes_every_kth_step_offscreen(tmp_path, make_simulator):
+    renderer = Renderer(160, 120, headless=True)
+    stream = io.BytesIO()
+    frames = record(make_simulator(), renderer, RawVideoSink(stream), duration=2.0, dt=0.1,
+                    control={'rpm': 100.0, 'rudder_angle': 0.0}, every=5)
+    assert frames == 4 and len(stream.getvalue()) == 4 * 160 * 120 * 3
+    assert frame_interval(dt=0.1, fps=30, speedup=60) == 20
+
+    sink = PngSequenceSink(str(tmp_path / 'frames'))
+    record(make_simulator(), renderer, sink, duration=0.3, dt=0.1, control={'rpm': 0.0, 'rudder_angle': 0.0})
+    assert sorted(os.listdir(tmp_path / 'frames')) == ['frame_000000.png', 'frame_000001.png', 'frame_000002.png']
+
+def test_static_layer_matches_world_and_is_cached(make_simulator):
+    renderer = Renderer(400, 300, headless=True)
+    renderer.zoom, renderer.offset = 2.0, np.array([0.0, 250.0])
+    simulator = make_simulator()
+    simulator.show_minimap = False
+    renderer.render(simulator, {'rpm': 0.0, 'rudder_angle': 0.0})
+    # The shallow cell is drawn where its centre (50 m N, 150 m E) lands on screen
+    x, y = renderer._world_to_screen(np.array([50.0, 150.0]))
+    assert tuple(renderer.screen.get_at((x, y)))[:3] == (217, 102, 79)
+    assert tuple(renderer.screen.get_at((x, y - 25)))[:3] != (217, 102, 79)
+
+    layer = renderer._static_layer
+    renderer.offset = renderer.offset + 10.0
+    renderer.render(simulator, {'rpm': 0.0, 'rudder_angle': 0.0})
+    assert renderer._static_layer is layer
@@ -0,0 +1,36 @@
+# tune_autopilot.py
+
+import argparse
+import json
+import logging
+import yaml
+from vds.core.autopilot_tuning import TuningConfig, tune_gains, save_autopilot_params
+from scenarios.scenario_loader import default_autopilot_params_path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune autopilot PID gains with parallel headless simulations.")
+    parser.add_argument('scenario', type=str, help="Path to a scenario YAML file with waypoints.")
+    parser.add_argument('--hydro', type=str, default=None,
+                        help="Hydro parameter JSON to use instead of the scenario's own.")
+    parser.add_argument('--output', type=str, default=None,
+                        help="Autopilot config to write. Defaults to <vessel>_autopilot.json next to the hydro file.")
+    parser.add_argument('--workers', type=int, default=None, help="Number of worker processes.")
+    parser.add_argument('--maxiter', type=int, default=20, help="Optimizer generations.")
+    parser.add_argument('--popsize', type=int, default=8, help="Population size multiplier.")
+    parser.add_argument('--dt', type=float, default=0.5, help="Simulation time step (s).")
+    parser.add_argument('--seed', type=int, default=0, help="Optimizer random seed.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    config = TuningConfig(scenario_path=args.scenario, hydro_params_path=args.hydro, dt=args.dt)
+    result = tune_gains(config, workers=args.workers, maxiter=args.maxiter, popsize=args.popsize, seed=args.seed)
+    print(json.dumps(result, indent=4))
+
+    output_path = args.output
+    if output_path is None:
+        hydro_path = args.hydro
+        if hydro_path is None:
+            with open(args.scenario, 'r') as f:
+                hydro_path = yaml.safe_load(f)['vessel']['hydro_params']
+        output_path = default_autopilot_params_path(hydro_path)
+    save_autopilot_params(output_path, result, config)
@@ -2,57 +2,163 @@
 
 import numpy as np
 
+def wrap_angle(angle):
+    """Wraps an angle (or array of angles) in radians to [-pi, pi)."""
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+class AutopilotBank:
+    """
+    A bank of PID heading controllers with line-of-sight (LOS) track-keeping,
+    operating on arrays so that one call steers a whole fleet.
+    여러 선박의 상태 배열을 한 번에 처리하는 PID/LOS 오토파일럿 뱅크.
+
+    All controller state (gains, integrators, previous errors) is held in
+    arrays of length `n`, one entry per vessel. Gains may be given as scalars
+    (shared by every vessel) or as arrays (one value per vessel).
+    """
+    GUIDANCE_MODES = ('los', 'pursuit')
+
+    def __init__(self, n: int = 1, kp=0.8, ki=0.01, kd=1.5, max_rudder_angle=35.0,
+                 integral_limit=0.5, lookahead=800.0, guidance: str = 'los'):
+        if guidance not in self.GUIDANCE_MODES:
+            raise ValueError(f"Unknown guidance mode '{guidance}'. Expected one of {self.GUIDANCE_MODES}.")
+        self.n = n
+        self.kp = np.broadcast_to(np.asarray(kp, dtype=float), (n,)).copy()
+        self.ki = np.broadcast_to(np.asarray(ki, dtype=float), (n,)).copy()
+        self.kd = np.broadcast_to(np.asarray(kd, dtype=float), (n,)).copy()
+        self.max_rudder = np.broadcast_to(np.asarray(max_rudder_angle, dtype=float), (n,)).copy()
+        self.integral_limit = np.broadcast_to(np.asarray(integral_limit, dtype=float), (n,)).copy()
+        self.lookahead = np.broadcast_to(np.asarray(lookahead, dtype=float), (n,)).copy()
+        self.guidance = guidance
+
+        self._integral = np.zeros(n)
+        self._previous_error = np.zeros(n)
+        self._has_previous = np.zeros(n, dtype=bool)
+
+    def reset(self, mask=None):
+        """
+        Resets the integrator and derivative memory.
+        If `mask` is given, only the selected vessels are reset.
+        """
+        if mask is None:
+            mask = slice(None)
+        self._integral[mask] = 0.0
+        self._previous_error[mask] = 0.0
+        self._has_previous[mask] = False
+
+    def heading_control(self, heading_rad, desired_heading_rad, dt: float, rows=None) -> np.ndarray:
+        """
+        Computes rudder demands (degrees) that drive each heading to its desired value.
+
+        Args:
+            heading_rad (array-like): Current headings, shape (n,).
+            desired_heading_rad (array-like): Desired headings, shape (n,).
+            dt (float): Control time step (seconds).
+            rows (array-like, optional): Bank indices the inputs belong to; the other
+                vessels' controller memory is left untouched. Default: all vessels.
+
+        Returns:
+            np.ndarray: Rudder demands in degrees, clipped to +/- max_rudder, shape (n,).
+        """
+        rows = slice(None) if rows is None else rows
+        kp, ki, kd, max_rudder = self.kp[rows], self.ki[rows], self.kd[rows], self.max_rudder[rows]
+        error = wrap_angle(np.asarray(desired_heading_rad, dtype=float) - np.asarray(heading_rad, dtype=float))
+
+        # D: no derivative kick on the first sample after a reset
+        derivative = np.where(self._has_previous[rows], wrap_angle(error - self._previous_error[rows]) / dt, 0.0)
+        self._previous_error[rows] = error
+        self._has_previous[rows] = True
+
+        # I: conditional integration (anti-windup). The integrator is frozen for
+        # vessels whose unsaturated output is already at the rudder limit and
+        # whose error would push it further into saturation.
+        integral = self._integral[rows]
+        integral_limit = self.integral_limit[rows]
+        integral_candidate = np.clip(integral + error * dt, -integral_limit, integral_limit)
+        unsaturated_deg = np.degrees(kp * error + ki * integral_candidate + kd * derivative)
+        winding_up = (np.abs(unsaturated_deg) > max_rudder) & (np.sign(error) == np.sign(unsaturated_deg))
+        integral = np.where(winding_up, integral, integral_candidate)
+        self._integral[rows] = integral
+
+        demanded_rudder_rad = kp * error + ki * integral + kd * derivative
+        return np.clip(np.degrees(demanded_rudder_rad), -max_rudder, max_rudder)
+
+    def los_heading(self, positions, leg_start, leg_end, rows=None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Lookahead-based line-of-sight guidance against the leg from `leg_start` to `leg_end`.
+
+        Args:
+            positions (array-like): Vessel positions (north, east), shape (n, 2).
+            leg_start (array-like): Start points of the active legs, shape (n, 2).
+            leg_end (array-like): End points of the active legs, shape (n, 2).
+            rows (array-like, optional): Bank indices the inputs belong to. Default: all vessels.
+
+        Returns:
+            tuple: (desired headings in radians, signed cross-track errors in metres).
+                   Cross-track error is positive when the vessel is to starboard of the leg.
+        """
+        positions = np.asarray(positions, dtype=float)
+        leg_start = np.asarray(leg_start, dtype=float)
+        leg = np.asarray(leg_end, dtype=float) - leg_start
+        path_angle = np.arctan2(leg[:, 1], leg[:, 0])
+        rel = positions - leg_start
+        cross_track = -rel[:, 0] * np.sin(path_angle) + rel[:, 1] * np.cos(path_angle)
+        lookahead = self.lookahead if rows is None else self.lookahead[rows]
+        desired = path_angle + np.arctan2(-cross_track, lookahead)
+        return wrap_angle(desired), cross_track
+
+    def pursuit_heading(self, positions, targets) -> np.ndarray:
+        """Desired headings pointing straight at each target (pure pursuit)."""
+        to_target = np.asarray(targets, dtype=float) - np.asarray(positions, dtype=float)
+        return np.arctan2(to_target[:, 1], to_target[:, 0])
+
+    def track_control(self, positions, heading_rad, leg_start, leg_end, dt: float, rows=None) -> np.ndarray:
+        """
+        Computes rudder demands (degrees) for track-keeping along the active legs,
+        using the bank's guidance mode to produce the desired headings.
+        `rows` selects the vessels of the bank the inputs belong to (default: all).
+        """
+        if self.guidance == 'los':
+            desired, _ = self.los_heading(positions, leg_start, leg_end, rows)
+        else:
+            desired = self.pursuit_heading(positions, leg_end)
+        return self.heading_control(heading_rad, desired, dt, rows)
+
 class Autopilot:
     """
     A simple PID-based autopilot for track-keeping.
     항로 유지를 위한 간단한 PID 기반 오토파일럿.
+
+    Single-vessel convenience wrapper around `AutopilotBank`.
     """
-    def __init__(self, max_rudder_angle: float = 35.0):
+    def __init__(self, max_rudder_angle: float = 35.0, kp: float = 0.8, ki: float = 0.01, kd: float = 1.5):
         # PID 제어기 계수 (이 값들을 조정하여 성능 튜닝 가능)
-        self.kp = 0.8  # Proportional gain (주 제어)
-        self.ki = 0.01 # Integral gain (정상상태 오차 보정)
-        self.kd = 1.5  # Derivative gain (급격한 변화 억제)
-        
-        self.max_rudder = max_rudder_angle
-        self._integral = 0.0
-        self._previous_error = 0.0
+        self.bank = AutopilotBank(1, kp=kp, ki=ki, kd=kd, max_rudder_angle=max_rudder_angle, guidance='pursuit')
+
+    @property
+    def kp(self) -> float:
+        return float(self.bank.kp[0])
+
+    @property
+    def ki(self) -> float:
+        return float(self.bank.ki[0])
+
+    @property
+    def kd(self) -> float:
+        return float(self.bank.kd[0])
+
+    @property
+    def max_rudder(self) -> float:
+        return float(self.bank.max_rudder[0])
 
     def reset(self):
         """Resets the PID controller's internal state."""
-        self._integral = 0.0
-        self._previous_error = 0.0
+        self.bank.reset()
 
     def calculate_rudder_angle(self, current_pos, current_heading_rad, target_pos, dt) -> float:
         """
         Calculates the required rudder angle to steer towards the target.
         목표 지점으로 향하기 위해 필요한 타각을 계산합니다.
         """
-        # 1. 목표 방위각 계산 (Bearing to target)
-        vector_to_target = target_pos - current_pos
-        target_bearing_rad = np.arctan2(vector_to_target[1], vector_to_target[0])
-
-        # 2. 방위각 오차 계산 (Angle error)
-        error = target_bearing_rad - current_heading_rad
-        # 오차를 -pi ~ +pi 범위로 정규화
-        error = (error + np.pi) % (2 * np.pi) - np.pi
-
-        # 3. PID 제어 계산
-        # P (Proportional)
-        p_term = self.kp * error
-
-        # I (Integral)
-        self._integral += error * dt
-        i_term = self.ki * self._integral
-
-        # D (Derivative)
-        derivative = (error - self._previous_error) / dt
-        d_term = self.kd * derivative
-        self._previous_error = error
-        
-        # 최종 타각 계산
-        demanded_rudder_rad = p_term + i_term + d_term
-        
-        # 최대 타각 제한
-        demanded_rudder_deg = np.degrees(demanded_rudder_rad)
-        
-        return np.clip(demanded_rudder_deg, -self.max_rudder, self.max_rudder)
+        desired = self.bank.pursuit_heading(np.atleast_2d(current_pos), np.atleast_2d(target_pos))
+        return float(self.bank.heading_control(np.atleast_1d(current_heading_rad), desired, dt)[0])
@@ -0,0 +1,175 @@
+# vds/core/autopilot_tuning.py
+
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+import numpy as np
+from scipy.optimize import differential_evolution
+from .autopilot import AutopilotBank
+from .simulator import Simulator
+
+log = logging.getLogger(__name__)
+
+@dataclass
+class TuningConfig:
+    """Settings shared by every headless tuning run."""
+    scenario_path: str
+    hydro_params_path: str = None
+    dt: float = 0.5
+    max_duration: float = None   # Defaults to twice the nominal route transit time
+    abort_xte_lengths: float = 4.0  # Early termination when |XTE| exceeds this many ship lengths
+    weight_xte: float = 1.0
+    weight_rudder: float = 0.2        # On mean |rudder| relative to 35 deg
+    weight_rudder_rate: float = 0.2   # On mean |rudder rate| relative to `rudder_rate_scale`
+    rudder_rate_scale: float = 2.3    # deg/s; about the slew rate of a conventional steering gear
+    weight_overshoot: float = 1.0
+
+@dataclass
+class RunMetrics:
+    """Scores of a single waypoint-following run."""
+    rms_xte: float          # RMS cross-track error (m)
+    max_xte: float          # Maximum |cross-track error| (m)
+    mean_rudder: float      # Mean |rudder| (deg)
+    mean_rudder_rate: float # Mean |rudder rate| (deg/s)
+    overshoot: float        # Mean per-leg overshoot after first crossing the track (m)
+    completed: bool         # All waypoints reached
+    aborted: bool           # Terminated early (collision or excessive XTE)
+    progress: float         # Fraction of waypoints reached
+    time: float             # Simulated time (s)
+
+    def cost(self, config: TuningConfig, loa: float) -> float:
+        cost = (config.weight_xte * self.rms_xte / loa
+                + config.weight_rudder * self.mean_rudder / 35.0
+                + config.weight_rudder_rate * self.mean_rudder_rate / config.rudder_rate_scale
+                + config.weight_overshoot * self.overshoot / loa)
+        # Unfinished runs are always worse than any finished one
+        if not self.completed:
+            cost += 10.0 * (2.0 - self.progress)
+        return cost
+
+# Simulators are cached per worker process and reset between runs
+_SIMULATOR_CACHE = {}
+
+def _get_simulator(config: TuningConfig) -> Simulator:
+    from scenarios.scenario_loader import load_scenario
+    key = (config.scenario_path, config.hydro_params_path)
+    if key not in _SIMULATOR_CACHE:
+        vessel, dynamics_model, geography, ais_targets, wind, current, waves, initial_control, waypoints, autopilot, streams = \
+            load_scenario(config.scenario_path, config.hydro_params_path)
+        if not waypoints:
+            raise ValueError(f"Scenario '{config.scenario_path}' has no waypoints to tune against.")
+        simulator = Simulator(vessel, dynamics_model, geography, ais_targets, wind, current, waves, autopilot, seed=streams)
+        simulator.waypoints = waypoints
+        simulator.show_obstacles = geography.has_obstructions
+        _SIMULATOR_CACHE[key] = (simulator, initial_control)
+    return _SIMULATOR_CACHE[key]
+
+def _nominal_duration(simulator: Simulator) -> float:
+    speed = max(np.linalg.norm(simulator.initial_vessel_state.nu[:2]), 1.0)
+    return simulator.route.total_length / speed
+
+def run_waypoint_following(config: TuningConfig, gains) -> RunMetrics:
+    """
+    Runs one headless waypoint-following simulation with the given (kp, ki, kd) gains.
+    주어진 PID 게인으로 헤드리스 항로 추종 시뮬레이션을 한 번 수행합니다.
+    """
+    kp, ki, kd = gains
+    simulator, initial_control = _get_simulator(config)
+    simulator.reset()
+    loa = simulator.vessel.specs.loa
+    simulator.autopilot = AutopilotBank(1, kp=kp, ki=ki, kd=kd, lookahead=simulator.autopilot.lookahead[0],
+                                        max_rudder_angle=simulator.autopilot.max_rudder[0])
+    simulator.set_autopilot(True)
+    control = dict(initial_control)
+
+    dt = config.dt
+    max_duration = config.max_duration or 2.0 * _nominal_duration(simulator)
+    abort_xte = config.abort_xte_lengths * loa
+
+    xte_sq_sum, max_xte, abs_rudder_sum, rudder_rate_sum = 0.0, 0.0, 0.0, 0.0
+    overshoots, leg_overshoot, leg_index, leg_sign, leg_crossed = [], 0.0, -1, 0.0, False
+    previous_rudder = control.get('rudder_angle', 0.0)
+    steps, aborted = 0, False
+    while simulator.time < max_duration:
+        if simulator.active_leg() is None:
+            break
+        if simulator.current_waypoint_index != leg_index:
+            if leg_crossed:
+                overshoots.append(leg_overshoot)
+            leg_index, leg_sign, leg_crossed, leg_overshoot = simulator.current_waypoint_index, 0.0, False, 0.0
+
+        simulator.step(dt, control)
+        steps += 1
+
+        xte = simulator.cross_track_error
+        xte_sq_sum += xte**2
+        max_xte = max(max_xte, abs(xte))
+        rudder = control['rudder_angle']
+        abs_rudder_sum += abs(rudder)
+        rudder_rate_sum += abs(rudder - previous_rudder) / dt
+        previous_rudder = rudder
+
+        sign = np.sign(xte)
+        if leg_sign != 0.0 and sign != 0.0 and sign != leg_sign:
+            leg_crossed = True
+        if sign != 0.0 and not leg_crossed:
+            leg_sign = sign
+        if leg_crossed:
+            leg_overshoot = max(leg_overshoot, abs(xte))
+
+        if simulator.collision_detected or abs(xte) > abort_xte:
+            aborted = True
+            break
+    if leg_crossed:
+        overshoots.append(leg_overshoot)
+
+    steps = max(steps, 1)
+    return RunMetrics(
+        rms_xte=float(np.sqrt(xte_sq_sum / steps)), max_xte=max_xte,
+        mean_rudder=abs_rudder_sum / steps, mean_rudder_rate=rudder_rate_sum / steps,
+        overshoot=float(np.mean(overshoots)) if overshoots else 0.0,
+        completed=simulator.current_waypoint_index >= len(simulator.waypoints) and not aborted,
+        aborted=aborted, progress=simulator.current_waypoint_index / len(simulator.waypoints),
+        time=simulator.time)
+
+def score_gains(gains, config: TuningConfig) -> float:
+    """Objective for the optimizer: scalar cost of a run with the given gains (lower is better)."""
+    metrics = run_waypoint_following(config, gains)
+    simulator, _ = _get_simulator(config)
+    return metrics.cost(config, simulator.vessel.specs.loa)
+
+def tune_gains(config: TuningConfig, bounds=((0.1, 5.0), (0.0, 0.2), (0.0, 40.0)), workers: int = None,
+               maxiter: int = 20, popsize: int = 8, seed: int = 0, x0=None) -> dict:
+    """
+    Searches the (kp, ki, kd) space with differential evolution (derivative-free),
+    evaluating each generation of candidates in parallel across a process pool.
+    `x0` (e.g. the current gains) joins the first generation, so the result is never worse.
+
+    Returns:
+        dict: Best gains and the metrics of the corresponding run.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        result = differential_evolution(score_gains, bounds, args=(config,), workers=executor.map,
+                                        updating='deferred', maxiter=maxiter, popsize=popsize,
+                                        polish=False, seed=seed, x0=x0)
+    kp, ki, kd = (float(x) for x in result.x)
+    metrics = run_waypoint_following(config, (kp, ki, kd))
+    simulator, _ = _get_simulator(config)
+    return {
+        'gains': {'kp': kp, 'ki': ki, 'kd': kd, 'lookahead': float(simulator.autopilot.lookahead[0])},
+        'cost': float(result.fun),
+        'metrics': asdict(metrics),
+        'evaluations': int(result.nfev),
+    }
+
+def save_autopilot_params(path: str, result: dict, config: TuningConfig):
+    """Writes tuned gains to a per-vessel autopilot config that `load_scenario` reads."""
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    data = {**result, 'tuned_on': {'scenario': config.scenario_path, 'hydro_params': config.hydro_params_path}}
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=4)
+    log.info("Autopilot parameters saved to %s", path)
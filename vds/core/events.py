@@ -0,0 +1,163 @@
+# vds/core/events.py
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Callable, ClassVar
+import numpy as np
+
+class EventType(IntEnum):
+    SIMULATION_RESET = 0
+    WAYPOINT_REACHED = 1
+    COLLISION = 2
+    GROUNDING = 3
+    AUTOPILOT_DISENGAGED = 4
+
+@dataclass(frozen=True)
+class Event:
+    time: float
+
+@dataclass(frozen=True)
+class SimulationReset(Event):
+    kind: ClassVar[EventType] = EventType.SIMULATION_RESET
+
+    def __str__(self) -> str:
+        return "--- Simulation Reset ---"
+
+@dataclass(frozen=True)
+class WaypointReached(Event):
+    kind: ClassVar[EventType] = EventType.WAYPOINT_REACHED
+    index: int
+    name: str
+
+    def __str__(self) -> str:
+        return f"Waypoint '{self.name}' reached!"
+
+@dataclass(frozen=True)
+class Collision(Event):
+    """`obstacle` is the index of the obstruction hit, or -1 for a ship-ship contact described by `label`."""
+    kind: ClassVar[EventType] = EventType.COLLISION
+    x: float
+    y: float
+    obstacle: int
+    label: str
+
+    def __str__(self) -> str:
+        if self.obstacle < 0:
+            what = f"between {self.label}"
+        else:
+            what = f"{'of ' + self.label + ' ' if self.label else ''}with obstruction #{self.obstacle}"
+        return f"COLLISION {what} at ({self.x:.1f}, {self.y:.1f}) m, t={self.time:.1f}s"
+
+@dataclass(frozen=True)
+class Grounding(Event):
+    kind: ClassVar[EventType] = EventType.GROUNDING
+    x: float
+    y: float
+    depth: float
+    label: str
+
+    def __str__(self) -> str:
+        who = f"'{self.label}' " if self.label else ''
+        return f"GROUNDING {who}at ({self.x:.1f}, {self.y:.1f}) m in {abs(self.depth):.1f} m of water, t={self.time:.1f}s"
+
+@dataclass(frozen=True)
+class AutopilotDisengaged(Event):
+    kind: ClassVar[EventType] = EventType.AUTOPILOT_DISENGAGED
+    reason: str
+
+    def __str__(self) -> str:
+        return f"Autopilot disengaged ({self.reason})."
+
+# Builds the typed event from one ring buffer row: (time, index, x, y, value, label)
+_FROM_ROW = {
+    EventType.SIMULATION_RESET: lambda t, i, x, y, v, s: SimulationReset(t),
+    EventType.WAYPOINT_REACHED: lambda t, i, x, y, v, s: WaypointReached(t, i, s),
+    EventType.COLLISION: lambda t, i, x, y, v, s: Collision(t, x, y, i, s),
+    EventType.GROUNDING: lambda t, i, x, y, v, s: Grounding(t, x, y, v, s),
+    EventType.AUTOPILOT_DISENGAGED: lambda t, i, x, y, v, s: AutopilotDisengaged(t, s),
+}
+
+EVENT_DTYPE = np.dtype([('kind', 'u1'), ('time', 'f8'), ('index', 'i8'), ('x', 'f8'), ('y', 'f8'), ('value', 'f8')])
+
+class EventBus:
+    """
+    Records simulation events in a preallocated ring buffer and notifies subscribers.
+    시뮬레이션 이벤트를 미리 할당된 링 버퍼에 기록하고 구독자에게 알립니다.
+
+    `emit` writes one fixed-layout row (kind, time, index, x, y, value, label) and builds a
+    typed event object only when someone subscribed to that kind, so recording costs a few
+    array stores and nothing is printed unless a sink such as `print_event` is subscribed.
+    Only the last `capacity` events are held; `total` counts every event emitted.
+    """
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self._rows = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self._labels = np.full(capacity, '', dtype=object)
+        self.total = 0
+        self._subscribers: dict[EventType, list[Callable[[Event], None]]] = {}
+
+    def subscribe(self, callback: Callable[[Event], None], *kinds: EventType):
+        """Calls `callback(event)` for every event of the given kinds (all kinds if none are given)."""
+        for kind in kinds or tuple(EventType):
+            self._subscribers.setdefault(kind, []).append(callback)
+
+    def unsubscribe(self, callback: Callable[[Event], None]):
+        for callbacks in self._subscribers.values():
+            while callback in callbacks:
+                callbacks.remove(callback)
+
+    def emit(self, kind: EventType, time: float, index: int = -1, x: float = np.nan, y: float = np.nan,
+             value: float = np.nan, label: str = ''):
+        slot = self.total % self.capacity
+        self._rows[slot] = (kind, time, index, x, y, value)
+        self._labels[slot] = label
+        self.total += 1
+        callbacks = self._subscribers.get(kind)
+        if callbacks:
+            event = _FROM_ROW[kind](time, index, x, y, value, label)
+            for callback in callbacks:
+                callback(event)
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    @property
+    def dropped(self) -> int:
+        """Events overwritten because the buffer was full."""
+        return self.total - len(self)
+
+    def _slots(self, since: int) -> np.ndarray:
+        start = max(since, self.total - len(self))
+        return np.arange(start, self.total) % self.capacity
+
+    def records(self, since: int = 0) -> np.ndarray:
+        """Held events with sequence number >= `since` as a structured array (`EVENT_DTYPE`), oldest first."""
+        return self._rows[self._slots(since)]
+
+    def events(self, since: int = 0, kind: EventType = None) -> list[Event]:
+        """Held events with sequence number >= `since` as typed objects, optionally of one kind only."""
+        slots = self._slots(since)
+        if kind is not None:
+            slots = slots[self._rows['kind'][slots] == kind]
+        return [_FROM_ROW[EventType(int(row['kind']))](float(row['time']), int(row['index']), float(row['x']),
+                                                       float(row['y']), float(row['value']), label)
+                for row, label in zip(self._rows[slots], self._labels[slots])]
+
+    def counts(self) -> dict[str, int]:
+        """Number of held events per kind."""
+        counts = np.bincount(self.records()['kind'], minlength=len(EventType))
+        return {kind.name.lower(): int(counts[kind]) for kind in EventType}
+
+    def clear(self):
+        self.total = 0
+
+def print_event(event: Event):
+    """Console sink: prints the event's description."""
+    print(event)
+
+def logging_sink(logger) -> Callable[[Event], None]:
+    """Sink that forwards events to a `logging.Logger` (collisions and groundings as warnings)."""
+    warnings = (EventType.COLLISION, EventType.GROUNDING)
+    def sink(event: Event):
+        (logger.warning if event.kind in warnings else logger.info)("%s", event)
+    return sink
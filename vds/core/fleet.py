@@ -0,0 +1,286 @@
+# vds/core/fleet.py
+
+from dataclasses import dataclass, field
+import numpy as np
+from scipy.spatial import cKDTree
+from vds.models.vessels.base_vessel import BaseVessel, VesselSpecifications, VesselState
+from vds.models.dynamics.mmg_model import MMGModel
+from vds.models.dynamics.batched_mmg_model import BatchedMMGModel
+from vds.environment.geography import Geography
+from vds.environment.wind import Wind
+from vds.environment.current import Current
+from vds.environment.waves import Waves
+from vds.data_handler.ais_parser import AISTarget
+from .kinematics import update_kinematics_batch
+from .autopilot import AutopilotBank
+from .route import Route
+from .events import EventBus, EventType
+
+@dataclass
+class FleetAgent:
+    """One vessel of a multi-agent simulation: hull, dynamics, route and controls."""
+    name: str
+    vessel: BaseVessel
+    model: MMGModel
+    waypoints: list[dict] = field(default_factory=list)
+    rpm: float = 0.0
+    gains: dict = field(default_factory=dict)  # Optional kp/ki/kd/lookahead overrides
+
+def steady_rpm(model: BatchedMMGModel, speeds: np.ndarray, max_rpm: float = 300.0, iterations: int = 40) -> np.ndarray:
+    """
+    Propeller rpm that holds each row of `model` at a steady straight-ahead speed.
+    Solved by batched bisection on the surge acceleration, which increases with rpm.
+    """
+    speeds = np.asarray(speeds, dtype=float)
+    n = len(speeds)
+    eta = np.zeros((n, 6))
+    nu = np.zeros((n, 6))
+    nu[:, 0] = speeds
+    low, high = np.zeros(n), np.full(n, max_rpm)
+    for _ in range(iterations):
+        mid = 0.5 * (low + high)
+        accelerating = model.calculate_forces(eta, nu, mid, 0.0)[:, 0] > 0
+        high = np.where(accelerating, mid, high)
+        low = np.where(accelerating, low, mid)
+    return 0.5 * (low + high)
+
+class SpatialIndex:
+    """
+    k-d tree over vessel positions, rebuilt once per step and shared by every proximity query.
+    매 스텝 한 번 재구성되어 모든 근접 질의가 공유하는 선박 위치 k-d 트리.
+    """
+    def __init__(self):
+        self.tree = None
+        self.ids = np.zeros(0, dtype=int)
+
+    def rebuild(self, positions: np.ndarray, ids: np.ndarray):
+        self.ids = ids
+        self.tree = cKDTree(positions) if len(positions) else None
+
+    def pairs_within(self, radius: float) -> np.ndarray:
+        """Agent id pairs closer than `radius`, shape (k, 2)."""
+        if self.tree is None:
+            return np.zeros((0, 2), dtype=int)
+        return self.ids[self.tree.query_pairs(radius, output_type='ndarray')]
+
+    def neighbours(self, point, radius: float) -> np.ndarray:
+        """Ids of agents within `radius` of `point`."""
+        if self.tree is None:
+            return np.zeros(0, dtype=int)
+        return self.ids[np.asarray(self.tree.query_ball_point(point, radius), dtype=int)]
+
+class FleetSimulator:
+    """
+    Multi-agent simulation where every vessel is a dynamic MMG agent.
+    모든 선박을 동적 MMG 에이전트로 다루는 다중 선박 시뮬레이션.
+
+    Agent states are held in (n, 6) arrays and every per-step stage
+    (waypoint switching, autopilot, hydrodynamic forces, kinematics,
+    collision and grounding checks) is evaluated for all active agents with
+    one batched call, so heterogeneous hulls cost no more than identical ones.
+    Agents that collide, ground or reach their final waypoint become inactive
+    and are no longer integrated.
+    """
+    def __init__(self, agents: list[FleetAgent], geography: Geography, wind: Wind = None,
+                 current: Current = None, waves: Waves = None, check_obstacles: bool = True):
+        self.agents = agents
+        self.geography = geography
+        self.wind = wind
+        self.current = current
+        self.waves = waves
+        self.check_obstacles = check_obstacles
+        self.n = n = len(agents)
+        self.names = [agent.name for agent in agents]
+
+        self.eta = np.array([agent.vessel.state.eta for agent in agents], dtype=float).reshape(n, 6)
+        self.nu = np.array([agent.vessel.state.nu for agent in agents], dtype=float).reshape(n, 6)
+        self.initial_eta, self.initial_nu = self.eta.copy(), self.nu.copy()
+        self.rpm = np.array([agent.rpm for agent in agents], dtype=float)
+        self.rudder = np.zeros(n)
+        self.loa = np.array([agent.vessel.specs.loa for agent in agents], dtype=float)
+        self.beam = np.array([agent.vessel.specs.beam for agent in agents], dtype=float)
+        self.draft = np.array([agent.vessel.specs.draft for agent in agents], dtype=float)
+        self.model = BatchedMMGModel.from_models([agent.model for agent in agents])
+
+        gain = lambda key, default: np.array([agent.gains.get(key, default(agent)) for agent in agents], dtype=float)
+        self.autopilot = AutopilotBank(n, kp=gain('kp', lambda a: 0.8), ki=gain('ki', lambda a: 0.01),
+                                       kd=gain('kd', lambda a: 1.5),
+                                       lookahead=gain('lookahead', lambda a: 2.5 * a.vessel.specs.loa))
+        self._pack_routes()
+
+        self._obstacle_positions = geography.obstacle_positions.copy()
+        self._obstacle_radii = geography.obstacle_radii.copy()
+        self._obstacle_tree = cKDTree(self._obstacle_positions) if len(self._obstacle_radii) else None
+        self.index = SpatialIndex()
+        self.events = EventBus()
+
+        self.time = 0.0
+        self.reset()
+
+    def _pack_routes(self):
+        """Stores every agent's route geometry in padded (n, legs, ...) arrays."""
+        routes = [Route.for_vessel(agent.waypoints, agent.vessel.state.eta[:2], agent.vessel.specs.loa)
+                  if agent.waypoints else None for agent in self.agents]
+        self.routes = routes
+        self.num_legs = np.array([r.num_legs if r is not None else 0 for r in routes], dtype=int)
+        legs = max(int(self.num_legs.max(initial=0)), 1)
+        self.route_points = np.zeros((self.n, legs + 1, 2))
+        self.leg_tangents = np.tile([1.0, 0.0], (self.n, legs, 1))
+        self.switch_along = np.zeros((self.n, legs))  # Along-track distance of each wheel-over point
+        self.arrival_radius = np.zeros(self.n)
+        for i, route in enumerate(routes):
+            if route is None:
+                self.route_points[i] = self.eta[i, :2]
+                continue
+            m = route.num_legs
+            self.route_points[i, :m + 1] = route.points
+            self.route_points[i, m + 1:] = route.points[-1]
+            self.leg_tangents[i, :m] = route.leg_tangents
+            self.switch_along[i, :m] = route.leg_lengths - route.wheel_over_distances
+            self.arrival_radius[i] = route.arrival_radius
+
+    def reset(self):
+        self.eta = self.initial_eta.copy()
+        self.nu = self.initial_nu.copy()
+        self.rudder[:] = 0.0
+        self.time = 0.0
+        self.leg_index = np.zeros(self.n, dtype=int)
+        self.active = np.ones(self.n, dtype=bool)
+        self.arrived = np.zeros(self.n, dtype=bool)
+        self.collided = np.zeros(self.n, dtype=bool)
+        self.grounded = np.zeros(self.n, dtype=bool)
+        self.autopilot.reset()
+        self._active_ids = None
+        self._active_model = None
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self.eta[:, :2]
+
+    def _models_for(self, ids: np.ndarray) -> BatchedMMGModel:
+        """Hydro parameters of the active agents, re-gathered only when the active set changes."""
+        if self._active_ids is None or not np.array_equal(self._active_ids, ids):
+            self._active_ids = ids
+            self._active_model = self.model.select(ids)
+        return self._active_model
+
+    def _update_waypoints(self, ids: np.ndarray):
+        """Vectorized wheel-over switching for the agents in `ids`; marks finished routes as arrived."""
+        ids = ids[self.leg_index[ids] < self.num_legs[ids]]
+        if not len(ids):
+            return
+        leg = self.leg_index[ids]
+        pos = self.eta[ids, :2]
+        along = np.einsum('ij,ij->i', pos - self.route_points[ids, leg], self.leg_tangents[ids, leg])
+        last = leg >= self.num_legs[ids] - 1
+        to_end = np.linalg.norm(self.route_points[ids, leg + 1] - pos, axis=1)
+        switch = np.where(last, to_end < self.arrival_radius[ids], along >= self.switch_along[ids, leg])
+        self.leg_index[ids] += switch
+        finished = ids[self.leg_index[ids] >= self.num_legs[ids]]
+        self.arrived[finished] = True
+        self.active[finished] = False
+
+    def _steer(self, ids: np.ndarray, dt: float):
+        """Runs the autopilot bank for the agents `ids` and keeps the rudder of route-less agents amidships."""
+        steering = self.leg_index[ids] < self.num_legs[ids]
+        leg = np.minimum(self.leg_index[ids], self.route_points.shape[1] - 2)
+        rudder = self.autopilot.track_control(self.eta[ids, :2], self.eta[ids, 5], self.route_points[ids, leg],
+                                              self.route_points[ids, leg + 1], dt, rows=ids)
+        self.rudder[ids] = np.where(steering, rudder, 0.0)
+
+    def _check_contacts(self, ids: np.ndarray):
+        """Ship-ship contacts through the shared spatial index, plus obstructions, structures, shore and grounding."""
+        pos = self.eta[ids, :2]
+        self.index.rebuild(pos, ids)
+        if len(ids) > 1:
+            pairs = self.index.pairs_within(self.loa[ids].max())
+            if len(pairs):
+                gap = np.linalg.norm(self.eta[pairs[:, 0], :2] - self.eta[pairs[:, 1], :2], axis=1)
+                hit = pairs[gap < (self.loa[pairs[:, 0]] + self.loa[pairs[:, 1]]) / 2]
+                if len(hit):
+                    self.collided[hit.ravel()] = True
+                    for i, j in hit.tolist():
+                        self.events.emit(EventType.COLLISION, self.time, x=self.eta[i, 0], y=self.eta[i, 1],
+                                         label=f"'{self.names[i]}' and '{self.names[j]}'")
+
+        if self.check_obstacles and self._obstacle_tree is not None:
+            reach = self.loa[ids].max() / 2 + self._obstacle_radii.max()
+            candidates = self._obstacle_tree.query_ball_point(pos, reach)
+            counts = np.array([len(c) for c in candidates])
+            if counts.any():
+                rows = np.repeat(np.arange(len(ids)), counts)
+                obs = np.concatenate([np.asarray(c, dtype=int) for c in candidates])
+                gap = np.linalg.norm(pos[rows] - self._obstacle_positions[obs], axis=1)
+                inside = gap < self.loa[ids[rows]] / 2 + self._obstacle_radii[obs]
+                hit, first = np.unique(ids[rows[inside]], return_index=True)
+                self.collided[hit] = True
+                for i, k in zip(hit.tolist(), obs[inside][first].tolist()):
+                    self.events.emit(EventType.COLLISION, self.time, index=k, x=self.eta[i, 0], y=self.eta[i, 1],
+                                     label=f"'{self.names[i]}'")
+
+        if self.check_obstacles and len(self.geography.shore):
+            # Exact hull tests only for agents whose bounding circle reaches a structure edge or the coastline
+            reach = np.hypot(self.loa[ids], self.beam[ids]) / 2.0
+            near = ~self.collided[ids] & (self.geography.distance_to_shore(pos[:, 0], pos[:, 1]) < reach)
+            for i in ids[near].tolist():
+                owner = self.geography.hull_contact(self.eta[i, :2], self.eta[i, 5], self.loa[i], self.beam[i])
+                if owner is not None:
+                    self.collided[i] = True
+                    what = f"structure #{owner}" if owner >= 0 else "the shore"
+                    self.events.emit(EventType.COLLISION, self.time, x=self.eta[i, 0], y=self.eta[i, 1],
+                                     label=f"'{self.names[i]}' and {what}")
+
+        depths = self.geography.get_depths_at(pos[:, 0], pos[:, 1])
+        aground = np.abs(depths) < self.draft[ids]
+        self.grounded[ids[aground]] = True
+        for i, depth in zip(ids[aground].tolist(), depths[aground].tolist()):
+            self.events.emit(EventType.GROUNDING, self.time, x=self.eta[i, 0], y=self.eta[i, 1], value=depth,
+                             label=self.names[i])
+        self.active &= ~(self.collided | self.grounded)
+
+    def step(self, dt: float):
+        ids = np.flatnonzero(self.active)
+        if not len(ids):
+            self.time += dt
+            return
+        self._update_waypoints(ids)
+        ids = np.flatnonzero(self.active)
+        self._steer(ids, dt)
+
+        eta, nu = self.eta[ids], self.nu[ids]
+        nu += self._models_for(ids).calculate_forces(eta, nu, self.rpm[ids], self.rudder[ids],
+                                                    wind=self.wind, current=self.current, waves=self.waves) * dt
+        update_kinematics_batch(eta, nu, dt)
+        self.eta[ids], self.nu[ids] = eta, nu
+
+        self._check_contacts(ids)
+        self.time += dt
+
+    def run(self, duration: float, dt: float):
+        for _ in range(int(duration / dt)):
+            self.step(dt)
+
+    @staticmethod
+    def agents_from_ais(targets: list[AISTarget], specs: VesselSpecifications, model: MMGModel) -> list[FleetAgent]:
+        """
+        Turns replayed AIS targets into dynamic agents with the given hull.
+        Each target starts at its first track point with the course and speed of its first track segment
+        and follows the remaining track points as waypoints at the rpm that holds that speed.
+        """
+        if not targets:
+            return []
+        starts, speeds, agents = [], [], []
+        for target in targets:
+            times, points = target.track_times, target.track_positions
+            first_leg = points[1] - points[0]
+            speeds.append(np.linalg.norm(first_leg) / max(times[1] - times[0], 1e-9))
+            # Heading from the track itself, so it is consistent with the waypoints whatever the CoG convention
+            starts.append((points[0], np.arctan2(first_leg[1], first_leg[0])))
+            waypoints = [{'name': f"{target.mmsi}-{k}", 'position': p.tolist()} for k, p in enumerate(points[1:], 1)]
+            agents.append(FleetAgent(str(target.mmsi), None, model, waypoints))
+        rpm = steady_rpm(BatchedMMGModel.from_model(model), np.array(speeds))
+        for agent, (start, heading), speed, agent_rpm in zip(agents, starts, speeds, rpm):
+            eta = np.array([start[0], start[1], 0, 0, 0, heading])
+            agent.vessel = BaseVessel(specs, VesselState(eta=eta, nu=np.array([speed, 0, 0, 0, 0, 0])))
+            agent.rpm = float(agent_rpm)
+        return agents
@@ -0,0 +1,213 @@
+# vds/core/hydro_identification.py
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+import numpy as np
+from vds.models.dynamics.mmg_model import MMGModel
+from vds.models.dynamics.batched_mmg_model import BatchedMMGModel, HYDRO_KEYS
+from vds.data_handler.run_log import RunLog
+from vds.environment.wind import Wind
+from vds.environment.current import Current
+from vds.environment.waves import Waves
+
+log = logging.getLogger(__name__)
+
+# Derivatives fitted when none are named: hull resistance and manoeuvring terms and the propeller curve
+DEFAULT_FIT_KEYS = ('R_0_prime', 'X_vv_prime', 'Y_v_prime', 'Y_r_prime', 'N_v_prime', 'N_r_prime', 'k_0', 'k_1', 'k_2')
+
+@dataclass
+class TrialData:
+    """
+    Samples of a logged trial: the state and control at each sample and the measured
+    body-fixed accelerations (du/dt, dv/dt, dr/dt) that followed.
+    """
+    heading: np.ndarray # (n,) rad
+    nu: np.ndarray      # (n, 6)
+    rpm: np.ndarray     # (n,)
+    rudder: np.ndarray  # (n,) deg
+    accel: np.ndarray   # (n, 3)
+
+    def __len__(self) -> int:
+        return len(self.rpm)
+
+    @classmethod
+    def concatenate(cls, trials: list['TrialData']) -> 'TrialData':
+        return cls(*(np.concatenate([getattr(t, name) for t in trials]) for name in cls.__dataclass_fields__))
+
+def _differences(time, heading, nu, rpm, rudder) -> TrialData:
+    """
+    Pairs every row with the next one. The simulator logs the state after a step together with
+    the control applied in it, so the step from row k to k + 1 starts from row k's state and uses
+    row k + 1's control; its explicit-Euler velocity change divided by dt is the acceleration.
+    Pairs that do not advance time (pauses, collisions) or go back (resets) are dropped.
+    """
+    dt = np.diff(time)
+    valid = dt > 0
+    accel = (nu[1:, [0, 1, 5]] - nu[:-1, [0, 1, 5]])[valid] / dt[valid, None]
+    return TrialData(heading[:-1][valid], nu[:-1][valid], rpm[1:][valid], rudder[1:][valid], accel)
+
+def trial_from_run_log(log) -> TrialData:
+    """Samples of a run log (a `RunLog` or its directory)."""
+    if isinstance(log, str):
+        log = RunLog(log)
+    nu = np.column_stack([log[f"nu_{k}"] for k in range(6)]).astype(float)
+    return _differences(np.asarray(log['time'], dtype=float), np.asarray(log['eta_5'], dtype=float), nu,
+                        np.asarray(log['rpm'], dtype=float), np.asarray(log['rudder_angle'], dtype=float))
+
+def trial_from_csv(file_path: str) -> TrialData:
+    """Samples of a `DataLogger` CSV, or field data with the same columns."""
+    import pandas as pd
+    table = pd.read_csv(file_path)
+    nu = np.zeros((len(table), 6))
+    nu[:, 0], nu[:, 1], nu[:, 5] = table['u_mps'], table['v_mps'], table['r_rad_s']
+    return _differences(table['timestamp'].to_numpy(float), np.radians(table['heading_deg'].to_numpy(float)), nu,
+                        table['control_rpm'].to_numpy(float), table['control_rudder_deg'].to_numpy(float))
+
+@dataclass
+class IdentificationResult:
+    """Outcome of a fit: the complete parameter set and the fitted values with their standard errors."""
+    params: dict
+    fitted: dict
+    initial: dict
+    std_errors: dict
+    cost: float          # Mean squared normalized acceleration error
+    initial_cost: float  # At the initial parameters, on the first stage's samples
+    iterations: int
+    samples: int
+    history: list = field(default_factory=list)
+
+class _Objective:
+    """Residuals and their Jacobian over all samples, accumulated chunk by chunk as normal equations."""
+    def __init__(self, model: MMGModel, data: TrialData, names, weights, wind, current, waves, chunk_rows):
+        self.model, self.data, self.names = model, data, list(names)
+        self.weights = weights # Per acceleration component, so yaw errors count as much as surge errors
+        self.environment = {'wind': wind, 'current': current, 'waves': waves}
+        self.chunk_rows = chunk_rows
+        self.eta = np.zeros((min(chunk_rows, len(data)), 6))
+
+    def _batched(self, theta: np.ndarray) -> BatchedMMGModel:
+        params = {key: self.model.p[key] for key in HYDRO_KEYS}
+        params.update(zip(self.names, theta))
+        spec = self.model.spec
+        return BatchedMMGModel(params, self.model.mass, self.model.Iz, spec.wind_area_longitudinal, spec.wind_area_transverse)
+
+    def _residual(self, model: BatchedMMGModel, rows: slice) -> np.ndarray:
+        data = self.data
+        eta = self.eta[:rows.stop - rows.start]
+        eta[:, 5] = data.heading[rows]
+        predicted = model.calculate_forces(eta, data.nu[rows], data.rpm[rows], data.rudder[rows], **self.environment)
+        return (predicted[:, [0, 1, 5]] - data.accel[rows]) * self.weights
+
+    def cost(self, theta: np.ndarray) -> float:
+        model = self._batched(theta)
+        total = 0.0
+        for start in range(0, len(self.data), self.chunk_rows):
+            residual = self._residual(model, slice(start, min(start + self.chunk_rows, len(self.data))))
+            total += float(np.einsum('ij,ij->', residual, residual))
+        return total / (3 * len(self.data))
+
+    def normal_equations(self, theta: np.ndarray, steps: np.ndarray) -> tuple[np.ndarray, np.ndarray, float]:
+        """J^T J, J^T r and the cost at `theta`, with a forward-difference Jacobian."""
+        base = self._batched(theta)
+        perturbed = []
+        for i, step in enumerate(steps):
+            shifted = theta.copy()
+            shifted[i] += step
+            perturbed.append(self._batched(shifted))
+        p = len(theta)
+        jtj, jtr, total = np.zeros((p, p)), np.zeros(p), 0.0
+        for start in range(0, len(self.data), self.chunk_rows):
+            rows = slice(start, min(start + self.chunk_rows, len(self.data)))
+            residual = self._residual(base, rows).ravel()
+            jacobian = np.column_stack([(self._residual(model, rows).ravel() - residual) / step
+                                        for model, step in zip(perturbed, steps)])
+            jtj += jacobian.T @ jacobian
+            jtr += jacobian.T @ residual
+            total += float(residual @ residual)
+        return jtj, jtr, total / (3 * len(self.data))
+
+def _levenberg_marquardt(objective: _Objective, theta: np.ndarray, scale: np.ndarray, max_iterations: int,
+                         tol: float, history: list) -> tuple[np.ndarray, np.ndarray, float, int]:
+    """Damped Gauss-Newton from `theta`; returns the parameters, the final J^T J and cost, and the iterations."""
+    damping = 1e-3
+    jtj, jtr, cost = objective.normal_equations(theta, 1e-6 * np.maximum(np.abs(theta), 1e-3))
+    history.append(cost)
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        # Solved in parameter units relative to `scale`, so the damping treats all parameters alike
+        a = jtj * np.outer(scale, scale)
+        step = np.linalg.solve(a + damping * np.diag(np.maximum(np.diag(a), 1e-30)), -jtr * scale) * scale
+        trial_cost = objective.cost(theta + step)
+        if trial_cost >= cost:
+            damping *= 5.0
+            if damping > 1e6:
+                break
+            continue
+        theta, damping = theta + step, max(damping / 3.0, 1e-9)
+        if np.max(np.abs(step) / scale) < tol:
+            cost = trial_cost
+            history.append(cost)
+            break
+        jtj, jtr, cost = objective.normal_equations(theta, 1e-6 * np.maximum(np.abs(theta), 1e-3))
+        history.append(cost)
+    return theta, jtj, cost, iterations
+
+def fit_hydro_params(model: MMGModel, data: TrialData, names=DEFAULT_FIT_KEYS, wind: Wind = None,
+                     current: Current = None, waves: Waves = None, max_iterations: int = 30, tol: float = 1e-6,
+                     chunk_rows: int = 1 << 16, first_stage_rows: int = 1 << 14, seed: int = 0) -> IdentificationResult:
+    """
+    Fits the hydro parameters `names` of `model` so its accelerations match the measured ones.
+    파라미터 식별: 기록된 시험 데이터의 가속도에 맞도록 유체역학 계수를 추정합니다.
+
+    Levenberg-Marquardt-damped Gauss-Newton on the normalized (du/dt, dv/dt, dr/dt) errors of
+    every sample, with a forward-difference Jacobian. The batched model evaluates samples in
+    chunks of `chunk_rows`, so memory stays bounded. Large trials are fitted progressively:
+    first on a random subset of `first_stage_rows` samples, then on subsets eight times
+    larger, up to all samples. Each stage starts next to its optimum, so the passes over the
+    full data (one per fitted parameter plus two per iteration) are only needed once or twice.
+    The fit stops when no parameter moves by more than `tol` of its magnitude.
+    `wind`, `current` and `waves` are the conditions the trial was run in.
+    """
+    if not len(data):
+        raise ValueError("No usable samples: the trial needs rows with increasing time.")
+    names = list(names)
+    unknown = [name for name in names if name not in HYDRO_KEYS]
+    if unknown:
+        raise ValueError(f"Cannot fit {unknown}: the force model only uses {list(HYDRO_KEYS)}.")
+    initial = np.array([float(model.p[name]) for name in names])
+    scale = np.maximum(np.abs(initial), 1e-3)
+    weights = 1.0 / np.maximum(data.accel.std(axis=0), 1e-12)
+    order = np.random.default_rng(seed).permutation(len(data))
+    theta, history, iterations = initial.copy(), [], 0
+    rows = min(first_stage_rows, len(data))
+    while True:
+        subset = data if rows == len(data) else \
+            TrialData(*(getattr(data, name)[np.sort(order[:rows])] for name in TrialData.__dataclass_fields__))
+        objective = _Objective(model, subset, names, weights, wind, current, waves, chunk_rows)
+        theta, jtj, cost, stage_iterations = _levenberg_marquardt(objective, theta, scale, max_iterations, tol, history)
+        iterations += stage_iterations
+        if rows == len(data):
+            break
+        rows = min(rows * 8, len(data))
+
+    dof = max(3 * len(data) - len(names), 1)
+    covariance = np.linalg.pinv(jtj) * cost * 3 * len(data) / dof
+    params = dict(model.p)
+    params.update({name: float(value) for name, value in zip(names, theta)})
+    return IdentificationResult(params, dict(zip(names, theta.tolist())), dict(zip(names, initial.tolist())),
+                                dict(zip(names, np.sqrt(np.maximum(np.diag(covariance), 0.0)).tolist())),
+                                cost, history[0], iterations, len(data), history)
+
+def save_hydro_params(path: str, result: IdentificationResult, source: dict = None):
+    """Writes the fitted parameter set as a hydro JSON that `MMGModel` and scenarios read."""
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    data = {**result.params, 'identified_from': {**(source or {}), 'fitted': result.fitted,
+                                                 'std_errors': result.std_errors, 'cost': result.cost,
+                                                 'samples': result.samples}}
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=4)
+    log.info("Hydro parameters saved to %s", path)
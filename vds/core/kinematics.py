@@ -68,3 +68,33 @@ def update_kinematics_6dof(state: VesselState, dt: float) -> VesselState:
 
     return state
 
+
+def update_kinematics_batch(eta: np.ndarray, nu: np.ndarray, dt: float) -> np.ndarray:
+    """
+    Vectorized `update_kinematics_6dof` for many vessels at once.
+
+    Args:
+        eta (np.ndarray): Positions and orientations, shape (n, 6). Updated in place.
+        nu (np.ndarray): Body-fixed velocities, shape (n, 6).
+        dt (float): The time step for the simulation update (in seconds).
+
+    Returns:
+        np.ndarray: The updated eta array.
+    """
+    phi, theta, psi = eta[:, 3], eta[:, 4], eta[:, 5]
+    c_phi, s_phi = np.cos(phi), np.sin(phi)
+    c_theta, s_theta, t_theta = np.cos(theta), np.sin(theta), np.tan(theta)
+    c_psi, s_psi = np.cos(psi), np.sin(psi)
+    u, v, w, p, q, r = nu.T
+
+    eta_dot = np.empty_like(eta)
+    eta_dot[:, 0] = (c_psi * c_theta) * u + (-s_psi * c_phi + c_psi * s_theta * s_phi) * v + (s_psi * s_phi + c_psi * c_phi * s_theta) * w
+    eta_dot[:, 1] = (s_psi * c_theta) * u + (c_psi * c_phi + s_phi * s_theta * s_psi) * v + (-c_psi * s_phi + s_theta * s_psi * c_phi) * w
+    eta_dot[:, 2] = -s_theta * u + (c_theta * s_phi) * v + (c_theta * c_phi) * w
+    eta_dot[:, 3] = p + (s_phi * t_theta) * q + (c_phi * t_theta) * r
+    eta_dot[:, 4] = c_phi * q - s_phi * r
+    eta_dot[:, 5] = (s_phi / c_theta) * q + (c_phi / c_theta) * r
+
+    eta += eta_dot * dt
+    eta[:, 5] = (eta[:, 5] + np.pi) % (2 * np.pi) - np.pi
+    return eta
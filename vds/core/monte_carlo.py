@@ -0,0 +1,313 @@
+# vds/core/monte_carlo.py
+
+import json
+import multiprocessing
+import os
+import socket
+import time
+import traceback
+from dataclasses import dataclass, asdict
+from typing import TYPE_CHECKING
+import numpy as np
+from vds.environment.wind import Wind
+from vds.environment.current import Current
+from vds.environment.waves import Waves
+from .simulator import Simulator
+from .random_streams import RandomStreams
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+@dataclass
+class StudyConfig:
+    """
+    A Monte Carlo study: one scenario YAML and the distributions its variants are drawn from.
+    Ranges are (low, high) pairs sampled uniformly per job.
+    """
+    scenario_path: str
+    jobs: int
+    seed: int = 0
+    hydro_params_path: str = None
+    duration: float = 600.0
+    dt: float = 0.5
+    wind_speed_kts: tuple = (0.0, 30.0)
+    current_speed_kts: tuple = (0.0, 2.0)
+    wave_height_m: tuple = (0.0, 3.0)
+    position_sigma_m: float = 0.0     # Std. dev. of the initial position offset
+    heading_sigma_deg: float = 0.0    # Std. dev. of the initial heading offset
+    random_obstacles: int = 0         # Extra obstacles per job (Geography.add_random_obstacles)
+    obstacle_radius_m: tuple = (20.0, 80.0)
+    obstacle_safe_zone_m: float = 500.0  # Obstacle-free radius around the (perturbed) start
+    autopilot: bool = True            # Follow the scenario route when it has one
+    max_attempts: int = 3
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=4)
+
+    @classmethod
+    def from_json(cls, text: str) -> 'StudyConfig':
+        data = json.loads(text)
+        return cls(**{k: tuple(v) if isinstance(v, list) else v for k, v in data.items()})
+
+def job_streams(config: StudyConfig, job_id: int) -> RandomStreams:
+    """Random streams of one job. They depend only on the study seed and the job id, never on the worker."""
+    return RandomStreams.for_job(config.seed, job_id)
+
+# Scenario components are loaded once per worker process and reset between jobs
+_SCENARIO_CACHE = {}
+
+def _get_scenario(config: StudyConfig):
+    from scenarios.scenario_loader import load_scenario
+    key = (config.scenario_path, config.hydro_params_path)
+    if key not in _SCENARIO_CACHE:
+        vessel, dynamics_model, geography, ais_targets, wind, current, waves, initial_control, waypoints, autopilot, streams = \
+            load_scenario(config.scenario_path, config.hydro_params_path)
+        simulator = Simulator(vessel, dynamics_model, geography, ais_targets, wind, current, waves, autopilot, seed=streams)
+        simulator.waypoints = waypoints
+        _SCENARIO_CACHE[key] = (simulator, initial_control, geography.obstacle_positions, geography.obstacle_radii)
+    return _SCENARIO_CACHE[key]
+
+def run_job(config: StudyConfig, job_id: int) -> dict:
+    """
+    Runs one scenario variant headlessly and returns a flat row of inputs and outcomes.
+    하나의 시나리오 변형을 헤드리스로 실행하고 입력과 결과를 한 행으로 반환합니다.
+    """
+    streams = job_streams(config, job_id)
+    rng = streams.environment
+    simulator, initial_control, base_positions, base_radii = _get_scenario(config)
+    geography = simulator.geography
+
+    row = {'job_id': job_id,
+           'wind_speed_kts': rng.uniform(*config.wind_speed_kts), 'wind_dir_deg': rng.uniform(0, 360),
+           'current_speed_kts': rng.uniform(*config.current_speed_kts), 'current_dir_deg': rng.uniform(0, 360),
+           'wave_height_m': rng.uniform(*config.wave_height_m), 'wave_dir_deg': rng.uniform(0, 360)}
+    simulator.wind = Wind(speed=row['wind_speed_kts'], direction=row['wind_dir_deg'])
+    simulator.current = Current(speed=row['current_speed_kts'], direction=row['current_dir_deg'])
+    simulator.waves = Waves(significant_height=row['wave_height_m'], period=8.0, direction=row['wave_dir_deg'])
+
+    simulator.reset()
+    simulator.random = streams
+    offset = rng.normal(0.0, config.position_sigma_m, 2)
+    simulator.vessel.state.eta[:2] += offset
+    simulator.vessel.state.eta[5] += np.radians(rng.normal(0.0, config.heading_sigma_deg))
+    row['start_x'], row['start_y'] = simulator.vessel.state.eta[:2]
+    # Random obstacles keep clear of the perturbed start, wherever the scenario puts it
+    geography.set_obstacles(base_positions, base_radii)
+    geography.add_random_obstacles(config.random_obstacles, *config.obstacle_radius_m,
+                                   safe_zone_radius=config.obstacle_safe_zone_m, rng=streams.obstacles,
+                                   center=simulator.vessel.state.eta[:2])
+    simulator.show_obstacles = geography.has_obstructions
+    simulator.set_autopilot(config.autopilot and simulator.route is not None)
+
+    obs_pos = geography.obstacle_positions
+    obs_edge = geography.obstacle_radii + simulator.vessel.specs.loa / 2
+    min_clearance, xte_sq_sum, steps = np.inf, 0.0, 0
+    control = dict(initial_control)
+    while simulator.time < config.duration and not simulator.collision_detected:
+        simulator.step(config.dt, control)
+        steps += 1
+        xte_sq_sum += simulator.cross_track_error**2
+        if len(obs_pos):
+            min_clearance = min(min_clearance, float(np.min(np.linalg.norm(obs_pos - simulator.vessel.state.eta[:2], axis=1) - obs_edge)))
+        if simulator.route is not None and simulator.current_waypoint_index >= simulator.route.num_legs:
+            break
+
+    legs = simulator.route.num_legs if simulator.route is not None else 0
+    row.update({'collided': simulator.collision_detected, 'time': simulator.time,
+                'final_x': simulator.vessel.state.eta[0], 'final_y': simulator.vessel.state.eta[1],
+                'min_clearance_m': min_clearance, 'rms_xte_m': float(np.sqrt(xte_sq_sum / max(steps, 1))),
+                'progress': simulator.current_waypoint_index / legs if legs else 0.0})
+    return {k: (float(v) if isinstance(v, (float, np.floating)) else v) for k, v in row.items()}
+
+class FileJobQueue:
+    """
+    Work queue kept in a directory, usable from any machine that mounts it.
+    공유 디렉터리에 저장되어 여러 머신에서 사용할 수 있는 작업 큐.
+
+    Jobs are small JSON files moved between `pending/`, `running/`, `done/`
+    and `failed/`. Claiming a job is an atomic `os.rename` out of `pending/`,
+    so several workers can pull from one queue without locks. Results are
+    written by workers as columnar `.npz` shards under `results/`.
+    """
+    STATES = ('pending', 'running', 'done', 'failed', 'results')
+
+    def __init__(self, root: str):
+        self.root = root
+        for state in self.STATES:
+            os.makedirs(os.path.join(root, state), exist_ok=True)
+
+    def _path(self, state: str, name: str = '') -> str:
+        return os.path.join(self.root, state, name)
+
+    @staticmethod
+    def _name(job_id: int) -> str:
+        return f"job-{job_id:09d}.json"
+
+    def _write(self, path: str, data: dict):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    @property
+    def config(self) -> StudyConfig:
+        with open(os.path.join(self.root, 'study.json'), 'r') as f:
+            return StudyConfig.from_json(f.read())
+
+    def submit(self, config: StudyConfig):
+        """Writes the study definition and one pending entry per job id."""
+        with open(os.path.join(self.root, 'study.json'), 'w') as f:
+            f.write(config.to_json())
+        for job_id in range(config.jobs):
+            self._write(self._path('pending', self._name(job_id)), {'job_id': job_id, 'attempts': 0})
+
+    def claim(self, worker: str, count: int) -> list[dict]:
+        """Atomically moves up to `count` pending jobs into `running/` for this worker."""
+        claimed = []
+        for name in sorted(os.listdir(self._path('pending'))):
+            if len(claimed) >= count:
+                break
+            if not name.endswith('.json'):
+                continue
+            target = self._path('running', name)
+            try:
+                os.rename(self._path('pending', name), target)
+            except FileNotFoundError:
+                continue  # Another worker got it first
+            with open(target, 'r') as f:
+                job = json.load(f)
+            job['worker'] = worker
+            self._write(target, job)
+            claimed.append(job)
+        return claimed
+
+    def complete(self, job: dict):
+        os.replace(self._path('running', self._name(job['job_id'])), self._path('done', self._name(job['job_id'])))
+
+    def renew(self, jobs: list[dict]):
+        """Refreshes the lease of running jobs, so `requeue_stale` leaves them to their worker."""
+        for job in jobs:
+            try:
+                os.utime(self._path('running', self._name(job['job_id'])))
+            except FileNotFoundError:
+                continue  # Already requeued by someone else
+
+    def fail(self, job: dict, error: str, max_attempts: int, source: str = None):
+        """Returns a failed job to `pending/`, or parks it in `failed/` once it has used all its attempts."""
+        job = {**job, 'attempts': job['attempts'] + 1, 'error': error}
+        state = 'pending' if job['attempts'] < max_attempts else 'failed'
+        self._write(self._path(state, self._name(job['job_id'])), job)
+        os.remove(source or self._path('running', self._name(job['job_id'])))
+
+    def requeue_stale(self, lease: float, max_attempts: int = None) -> int:
+        """
+        Fails jobs whose lease has not been renewed for `lease` seconds (dead or stuck workers),
+        so they count an attempt like any other failure. `max_attempts` defaults to the study's.
+        """
+        if max_attempts is None:
+            max_attempts = self.config.max_attempts
+        now, count = time.time(), 0
+        for name in os.listdir(self._path('running')):
+            if not name.endswith('.json'):
+                continue
+            path = self._path('running', name)
+            try:
+                if now - os.path.getmtime(path) <= lease:
+                    continue
+                # Take the job out of `running/` first, so only one caller requeues it
+                stale = f"{path}.stale"
+                os.rename(path, stale)
+            except FileNotFoundError:
+                continue
+            with open(stale, 'r') as f:
+                job = json.load(f)
+            self.fail(job, f"Lease of {lease:.0f} s expired on worker {job.get('worker')}", max_attempts, source=stale)
+            count += 1
+        return count
+
+    def counts(self) -> dict:
+        return {state: len([n for n in os.listdir(self._path(state)) if n.endswith(('.json', '.npz'))])
+                for state in self.STATES}
+
+    def write_shard(self, worker: str, rows: list[dict]):
+        """Stores result rows column by column in one `.npz` shard."""
+        columns = {key: np.array([row[key] for row in rows]) for key in rows[0]}
+        name = f"shard-{worker}-{time.time_ns()}.npz"
+        tmp = self._path('results', name + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez(f, **columns)
+        os.replace(tmp, self._path('results', name))
+
+    def collect(self) -> 'pd.DataFrame':
+        """All result shards as one table ordered by job id (retried jobs keep their latest row)."""
+        import pandas as pd
+        frames = []
+        for name in sorted(os.listdir(self._path('results'))):
+            if name.endswith('.npz'):
+                with np.load(self._path('results', name)) as shard:
+                    frames.append(pd.DataFrame({key: shard[key] for key in shard.files}))
+        if not frames:
+            return pd.DataFrame()
+        table = pd.concat(frames, ignore_index=True)
+        return table.drop_duplicates('job_id', keep='last').sort_values('job_id').reset_index(drop=True)
+
+class Worker:
+    """
+    Pulls jobs from a `FileJobQueue` in batches, runs them and writes one result shard per batch.
+    The leases of the batch's remaining jobs are renewed before each job starts, so the
+    requeue lease only has to outlast a single job. `job_runner(config, job_id) -> dict` defaults to `run_job`.
+    """
+    def __init__(self, queue: FileJobQueue, worker_id: str = None, batch_size: int = 16, job_runner=run_job):
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.job_runner = job_runner
+
+    def run(self, wait: float = 0.0, poll_interval: float = 1.0) -> int:
+        """
+        Processes jobs until the queue is drained. With `wait` > 0 an empty queue
+        is polled for up to `wait` seconds before giving up. Returns the number of jobs completed.
+        """
+        config = self.queue.config
+        completed, idle_since = 0, time.time()
+        while True:
+            jobs = self.queue.claim(self.worker_id, self.batch_size)
+            if not jobs:
+                if time.time() - idle_since >= wait:
+                    return completed
+                time.sleep(poll_interval)
+                continue
+            rows, finished = [], []
+            for i, job in enumerate(jobs):
+                self.queue.renew(jobs[i:])
+                try:
+                    rows.append(self.job_runner(config, job['job_id']))
+                    finished.append(job)
+                except Exception:
+                    self.queue.fail(job, traceback.format_exc(limit=3), config.max_attempts)
+            if rows:
+                # The shard is durable before its jobs are marked done, so a crash can only cause a rerun
+                self.queue.write_shard(self.worker_id, rows)
+            for job in finished:
+                self.queue.complete(job)
+            completed += len(finished)
+            idle_since = time.time()
+
+def _worker_main(root: str, worker_id: str, batch_size: int):
+    Worker(FileJobQueue(root), worker_id, batch_size).run()
+
+def run_local(config: StudyConfig, root: str, workers: int = None, batch_size: int = 16) -> 'pd.DataFrame':
+    """
+    Single-machine stand-in for a cluster: submits the study to a queue in `root`,
+    drains it with `workers` local processes and returns the collected results.
+    """
+    queue = FileJobQueue(root)
+    queue.submit(config)
+    workers = workers or os.cpu_count() or 1
+    processes = [multiprocessing.Process(target=_worker_main, args=(root, f"local-{i}", batch_size))
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return queue.collect()
@@ -0,0 +1,247 @@
+# vds/core/mpc.py
+
+import time
+from dataclasses import dataclass
+import numpy as np
+from vds.models.dynamics.batched_mmg_model import BatchedMMGModel
+from .kinematics import update_kinematics_batch
+from .autopilot import wrap_angle
+
+@dataclass
+class MPCWeights:
+    """Relative weights of the rollout cost terms."""
+    collision: float = 1e4     # Any predicted contact with an obstruction, structure or the shore
+    proximity: float = 50.0    # Intrusion into the safety margin around obstructions, structures and the shore
+    grounding: float = 1e4     # Any predicted position over no-go depth
+    traffic: float = 200.0     # Intrusion into the safety domain of AIS targets
+    cross_track: float = 1.0   # Mean squared cross-track error (in ship lengths)
+    heading: float = 0.5       # Terminal heading error against the active leg (rad^2)
+    rudder: float = 0.02       # Mean squared rudder (per 10 deg)
+    rpm: float = 2.0           # Squared relative deviation from the nominal rpm
+
+class SamplingMPC:
+    """
+    Sampling-based model-predictive controller for collision and grounding avoidance.
+    샘플링 기반 모델 예측 제어기를 이용한 충돌 및 좌초 회피.
+
+    Every `control_interval` seconds it samples candidate rudder sequences
+    (piecewise constant over `segments` knots) and rpm levels, rolls all of
+    them out together through a `BatchedMMGModel`, and scores them against
+    obstructions, polygonal structures and the coastline, no-go depth, AIS target
+    forecasts and the active route leg.
+    `iterations` cross-entropy refinement rounds are run, and the first action of
+    the best sequence is applied until the next solve. Every solve draws the
+    candidates of all rounds up front from the simulator's `control` random stream,
+    so runs are reproducible from the simulation seed and across fork/restore.
+    `budget` (seconds of compute) optionally stops the rounds early for real-time
+    use; the draws are the same, but the chosen action then depends on the machine.
+    """
+    def __init__(self, model: BatchedMMGModel, loa: float, draft: float, horizon: float = 120.0,
+                 dt: float = 1.0, control_interval: float = 5.0, samples: int = 256, segments: int = 4,
+                 iterations: int = 2, budget: float = None, max_rudder: float = 35.0, safety_factor: float = 1.2,
+                 weights: MPCWeights = None):
+        self.model = model
+        self.loa = loa
+        self.draft = draft
+        self.horizon = horizon
+        self.dt = dt
+        self.steps = int(round(horizon / dt))
+        self.control_interval = control_interval
+        self.samples = samples
+        self.segments = segments
+        self.iterations = iterations
+        self.budget = budget
+        self.max_rudder = max_rudder
+        self.safety_factor = safety_factor
+        self.weights = weights if weights is not None else MPCWeights()
+        self.rpm_levels = np.array([1.0, 0.6, 0.3])  # Fractions of the nominal rpm
+        self.shore_stride = min(max(int(round(5.0 / dt)), 1), self.steps)  # Shore distance is sampled every 5 s of a rollout
+
+        self.nominal_rpm = None
+        self.action = None
+        self.last_solve_time = None
+        self.last_iterations = 0
+        self.last_cost = np.inf
+        self._mean = np.zeros(segments)
+        self._mean_time = None # Simulation time the stored plan starts at
+        self._segment_of_step = np.minimum((np.arange(self.steps) * segments) // self.steps, segments - 1)
+
+    def reset(self):
+        self.nominal_rpm = None
+        self.action = None
+        self.last_solve_time = None
+        self.last_iterations = 0
+        self.last_cost = np.inf
+        self._mean = np.zeros(self.segments)
+        self._mean_time = None
+
+    def _shifted_mean(self, time: float) -> np.ndarray:
+        """The stored plan advanced to `time`: knots re-sampled at their segment centres, holding the last one."""
+        if self._mean_time is None:
+            return self._mean.copy()
+        length = self.horizon / self.segments
+        centres = (np.arange(self.segments) + 0.5) * length
+        return np.interp(centres + (time - self._mean_time), centres, self._mean)
+
+    def rollout(self, eta0: np.ndarray, nu0: np.ndarray, rudder_knots: np.ndarray, rpm: np.ndarray,
+                wind=None, current=None, waves=None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Integrates N candidate control sequences from one initial state.
+
+        Returns:
+            tuple: positions (N, steps, 2) and headings (N, steps).
+        """
+        n = len(rudder_knots)
+        eta = np.tile(eta0, (n, 1))
+        nu = np.tile(nu0, (n, 1))
+        positions = np.empty((n, self.steps, 2))
+        headings = np.empty((n, self.steps))
+        rudders = rudder_knots[:, self._segment_of_step]
+        # Explicit Euler can diverge for extreme candidates; those rows become non-finite and are rejected by `cost`
+        with np.errstate(all='ignore'):
+            for k in range(self.steps):
+                nu += self.model.calculate_forces(eta, nu, rpm, rudders[:, k], wind=wind, current=current, waves=waves) * self.dt
+                update_kinematics_batch(eta, nu, self.dt)
+                positions[:, k] = eta[:, :2]
+                headings[:, k] = eta[:, 5]
+        return positions, headings
+
+    def _hazards(self, simulator, reach: float):
+        """
+        Obstructions within reach of own ship, whether structures or the coastline are within
+        reach, and AIS target forecasts over the horizon.
+        """
+        own = simulator.vessel.state.eta[:2]
+        geography = simulator.geography
+        obs_pos, obs_rad = geography.obstacle_positions, geography.obstacle_radii
+        shore = False
+        if simulator.show_obstacles:
+            near = np.linalg.norm(obs_pos - own, axis=1) < reach + obs_rad
+            obs_pos, obs_rad = obs_pos[near], obs_rad[near]
+            shore = bool(len(geography.shore)) and float(geography.distance_to_shore(own[0], own[1])) < reach
+        else:
+            obs_pos, obs_rad = np.zeros((0, 2)), np.zeros(0)
+        times = simulator.time + (np.arange(self.steps) + 1) * self.dt
+        if simulator.ais_targets:
+            targets = np.stack([t.positions_at(times) for t in simulator.ais_targets])  # (M, steps, 2)
+        else:
+            targets = np.zeros((0, self.steps, 2))
+        return obs_pos, obs_rad, shore, targets
+
+    def cost(self, simulator, positions, headings, rudder_knots, rpm, hazards) -> np.ndarray:
+        """Scores candidate rollouts (lower is better)."""
+        w = self.weights
+        obs_pos, obs_rad, shore, targets = hazards
+        n = len(positions)
+        cost = np.zeros(n)
+        diverged = ~np.isfinite(positions).all(axis=(1, 2))
+        if diverged.any():
+            positions = np.where(diverged[:, None, None], 0.0, positions)
+            headings = np.where(diverged[:, None], 0.0, headings)
+
+        min_gap = np.full(n, np.inf)
+        if len(obs_pos):
+            # (N, steps, M) clearance to each obstruction edge
+            gap = np.linalg.norm(positions[:, :, None, :] - obs_pos[None, None], axis=-1) - obs_rad - self.loa / 2
+            min_gap = gap.min(axis=(1, 2))
+        if shore:
+            sampled = positions[:, self.shore_stride - 1::self.shore_stride]
+            gap = simulator.geography.distance_to_shore(sampled[..., 0], sampled[..., 1]) - self.loa / 2
+            min_gap = np.minimum(min_gap, gap.min(axis=1))
+        cost += w.collision * (min_gap < 0)
+        cost += w.proximity * np.clip(1.0 - min_gap / self.loa, 0.0, None).clip(max=1.0) ** 2
+
+        depths = simulator.geography.get_depths_at(positions[..., 0], positions[..., 1])
+        cost += w.grounding * (np.abs(depths) < self.draft * self.safety_factor).any(axis=1)
+
+        if len(targets):
+            separation = np.linalg.norm(positions[:, None] - targets[None], axis=-1).min(axis=(1, 2))
+            cost += w.traffic * np.clip(1.0 - separation / (2.0 * self.loa), 0.0, None) ** 2
+
+        leg = simulator.active_leg()
+        if leg is not None:
+            start, end = leg
+            tangent = (end - start) / max(np.linalg.norm(end - start), 1e-9)
+            rel = positions - start
+            xte = rel[..., 1] * tangent[0] - rel[..., 0] * tangent[1]
+            cost += w.cross_track * np.mean((xte / self.loa) ** 2, axis=1)
+            course = np.arctan2(tangent[1], tangent[0])
+            cost += w.heading * wrap_angle(headings[:, -1] - course) ** 2
+
+        cost += w.rudder * np.mean((rudder_knots / 10.0) ** 2, axis=1)
+        if self.nominal_rpm:
+            cost += w.rpm * ((rpm - self.nominal_rpm) / self.nominal_rpm) ** 2
+        cost[diverged] = np.inf
+        return cost
+
+    def _sample(self, mean: np.ndarray, std: float, noise: np.ndarray, levels: np.ndarray,
+                nominal_rpm: float) -> tuple[np.ndarray, np.ndarray]:
+        """Candidates of one round from its pre-drawn unit `noise` (n, segments) and rpm `levels` (n,)."""
+        knots = mean + std * noise
+        # Always include constant-rudder sweeps so hard manoeuvres are never missed
+        sweep = np.linspace(-self.max_rudder, self.max_rudder, 8)
+        knots[:len(sweep)] = sweep[:, None]
+        knots[len(sweep)] = mean
+        knots = np.clip(knots, -self.max_rudder, self.max_rudder)
+        rpm = nominal_rpm * levels
+        rpm[:len(sweep) + 1] = nominal_rpm
+        return knots, rpm
+
+    def solve(self, simulator, rpm: float = None) -> tuple[float, float]:
+        """
+        Runs `iterations` sampling rounds (fewer if `budget` runs out). The nominal rpm is the
+        one `update` recorded; otherwise `rpm`, or the rpm that holds the current speed.
+
+        Returns:
+            tuple: (rudder angle in degrees, rpm) to apply now.
+        """
+        started = time.perf_counter()
+        state = simulator.vessel.state
+        speed = max(np.linalg.norm(state.nu[:2]), 1.0)
+        hazards = self._hazards(simulator, reach=speed * self.horizon + self.loa)
+        env = dict(wind=simulator.wind, current=simulator.current, waves=simulator.waves)
+
+        nominal_rpm = self.nominal_rpm if self.nominal_rpm is not None else rpm
+        if nominal_rpm is None:
+            from .fleet import steady_rpm
+            nominal_rpm = float(steady_rpm(self.model, np.array([max(state.nu[0], 0.0)]))[0])
+
+        # Warm start: the previous best sequence, advanced by the time since it was planned
+        mean = self._shifted_mean(simulator.time)
+        std = self.max_rudder / 2
+        best_cost, best_knots, best_rpm = np.inf, mean, nominal_rpm
+        # Every round's draws are taken up front, so the stream advances the same whatever the budget
+        rng = simulator.random.control
+        noise = rng.standard_normal((self.iterations, self.samples, self.segments))
+        levels = rng.choice(self.rpm_levels, size=(self.iterations, self.samples), p=[0.6, 0.25, 0.15])
+        iterations = 0
+        for round_noise, round_levels in zip(noise, levels):
+            knots, rpm = self._sample(mean, std, round_noise, round_levels, nominal_rpm)
+            positions, headings = self.rollout(state.eta, state.nu, knots, rpm, **env)
+            cost = self.cost(simulator, positions, headings, knots, rpm, hazards)
+            order = np.argsort(cost)
+            if cost[order[0]] < best_cost:
+                best_cost, best_knots, best_rpm = cost[order[0]], knots[order[0]], rpm[order[0]]
+            elite = knots[order[:max(self.samples // 10, 2)]]
+            mean, std = elite.mean(axis=0), max(elite.std(axis=0).mean(), 1.0)
+            iterations += 1
+            if self.budget is not None:
+                elapsed = time.perf_counter() - started
+                # Stop if another round would overrun the budget
+                if elapsed * (iterations + 1) / iterations > self.budget:
+                    break
+
+        self._mean, self._mean_time = best_knots, simulator.time
+        self.last_iterations = iterations
+        self.last_cost = float(best_cost)
+        return float(best_knots[0]), float(best_rpm)
+
+    def update(self, simulator, control: dict):
+        """Re-solves every `control_interval` seconds and writes the current action into `control`."""
+        if self.nominal_rpm is None:
+            self.nominal_rpm = control.get('rpm', 0.0)
+        due = self.last_solve_time is None or simulator.time - self.last_solve_time >= self.control_interval - 1e-9
+        if due:
+            self.action = self.solve(simulator, control.get('rpm'))
+            self.last_solve_time = simulator.time
+        control['rudder_angle'], control['rpm'] = self.action
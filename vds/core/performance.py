@@ -0,0 +1,163 @@
+# vds/core/performance.py
+
+import json
+import os
+from dataclasses import dataclass
+import numpy as np
+from vds.models.dynamics.batched_mmg_model import BatchedMMGModel
+from vds.environment.wind import Wind
+
+# Finite-difference steps and Newton step limits for (u, v, r)
+_FD_STEP = np.array([1e-4, 1e-4, 1e-6])
+_MAX_STEP = np.array([1.0, 0.5, 0.005])
+
+def default_performance_path(hydro_params_path: str) -> str:
+    """Per-vessel performance tables stored next to the hydro file (e.g. kcs_performance.json)."""
+    base = os.path.basename(hydro_params_path).replace('_hydrodynamics', '').replace('.json', '')
+    return os.path.join(os.path.dirname(hydro_params_path), f"{base}_performance.json")
+
+def solve_equilibrium(model: BatchedMMGModel, rpm, rudder_deg, wind: Wind = None, guess: np.ndarray = None,
+                      iterations: int = 60, tol: float = 1e-7) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Steady states (u, v, r) where surge, sway and yaw accelerations vanish, one per row of
+    `rpm` / `rudder_deg`, heading north so `wind` keeps a fixed relative direction.
+    Batched Newton iterations with a finite-difference Jacobian and limited steps; rows
+    stop moving once converged. Returns the (n, 3) states and the converged mask.
+    """
+    rpm, rudder_deg = np.broadcast_arrays(np.asarray(rpm, dtype=float), np.asarray(rudder_deg, dtype=float))
+    n = rpm.size
+    rpm, rudder_deg = rpm.ravel(), rudder_deg.ravel()
+    if guess is None:
+        # Thrust at J = 0 against bare-hull resistance: an overestimate Newton comes down from
+        p = model.p
+        n_rps = np.maximum(rpm, 0.0) / 60.0
+        guess = np.zeros((n, 3))
+        guess[:, 0] = n_rps * p['D_P']**2 * np.sqrt(p['k_0'] / (0.5 * p['R_0_prime'] * p['Lpp'] * p['d']))
+    x = np.array(guess, dtype=float).reshape(n, 3)
+    eta = np.zeros((4 * n, 6))
+    scale = np.array([1.0, 1.0, 1.0 / np.max(np.atleast_1d(model.p['Lpp']))])
+    converged = np.zeros(n, dtype=bool)
+    for _ in range(iterations):
+        # One batched evaluation for the residuals and the three perturbed states
+        states = np.repeat(x[None], 4, axis=0)
+        for k in range(3):
+            states[k + 1, :, k] += _FD_STEP[k]
+        nu = np.zeros((4 * n, 6))
+        nu[:, [0, 1, 5]] = states.reshape(-1, 3)
+        accel = model.calculate_forces(eta, nu, np.tile(rpm, 4), np.tile(rudder_deg, 4), wind=wind)[:, [0, 1, 5]]
+        accel = accel.reshape(4, n, 3)
+        residual = accel[0]
+        jacobian = ((accel[1:] - residual) / _FD_STEP[:, None, None]).transpose(1, 2, 0) # (n, equation, variable)
+        converged = np.all(np.abs(residual) * scale < tol, axis=1)
+        if converged.all():
+            break
+        active = ~converged & (np.abs(np.linalg.det(jacobian)) > 0)
+        step = np.zeros((n, 3))
+        step[active] = np.linalg.solve(jacobian[active], -residual[active, :, None])[:, :, 0]
+        # Limit the step as a whole, so its direction is kept
+        shrink = np.min(np.where(np.abs(step) > _MAX_STEP, _MAX_STEP / np.maximum(np.abs(step), 1e-300), 1.0), axis=1)
+        x += step * shrink[:, None]
+    return x, converged
+
+@dataclass
+class PerformanceTable:
+    """
+    Precomputed steady-state performance of one hull: speed against rpm (optionally into a
+    head wind) and steady turning (u, v, r) against rpm and rudder angle.
+    선체의 정상 상태 성능표: 회전수-속력 및 정상 선회 특성.
+
+    Grids are uniform, so every lookup is an index computation and a linear (or bilinear)
+    interpolation. `rpm_for_speed` inverts the speed table through a precomputed
+    speed -> rpm table, so trimming for a speed costs the same as the forward lookup.
+    """
+    rpm: np.ndarray           # (n_rpm,) uniform, from 0
+    head_wind_kts: np.ndarray # (n_wind,) uniform
+    speed: np.ndarray         # (n_rpm, n_wind) steady straight-ahead speed (m/s)
+    speed_grid: np.ndarray    # (n_speed,) uniform speeds (m/s) for the inverse table
+    rpm_by_speed: np.ndarray  # (n_speed, n_wind) rpm holding each speed
+    rudder: np.ndarray        # (n_rudder,) uniform rudder angles (deg)
+    turn: np.ndarray          # (n_rpm, n_rudder, 3) steady (u, v, r) in calm water
+    converged: np.ndarray     # (n_rpm, n_rudder) Newton convergence of the turning solves; NaN turns where False
+
+    def speed_at(self, rpm: float, head_wind_kts: float = 0.0) -> float:
+        """Steady straight-ahead speed (m/s) at `rpm`."""
+        return float(_interp2(self.speed, self.rpm, self.head_wind_kts, rpm, head_wind_kts))
+
+    def rpm_for_speed(self, speed: float, head_wind_kts: float = 0.0) -> float:
+        """Rpm that holds `speed` (m/s) straight ahead; clamped to the table's rpm range."""
+        return float(_interp2(self.rpm_by_speed, self.speed_grid, self.head_wind_kts, speed, head_wind_kts))
+
+    def turn_at(self, rpm: float, rudder_deg: float) -> np.ndarray:
+        """Steady turning state (u, v, r) at `rpm` and a fixed rudder angle."""
+        return np.array([_interp2(self.turn[:, :, k], self.rpm, self.rudder, rpm, rudder_deg) for k in range(3)])
+
+    def turning_radius(self, rpm: float, rudder_deg: float) -> float:
+        """Radius (m) of the steady turn; inf with the rudder amidships."""
+        u, v, r = self.turn_at(rpm, rudder_deg)
+        return float(np.hypot(u, v) / abs(r)) if r != 0 else np.inf
+
+    def save(self, path: str, source: dict = None):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        data = {name: np.where(np.isnan(value), None, value).tolist() if value.dtype.kind == 'f' else value.tolist()
+                for name, value in ((name, getattr(self, name)) for name in self.__dataclass_fields__)}
+        data['computed_from'] = source or {}
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'PerformanceTable':
+        return cls(**{name: np.asarray(data[name], dtype=bool if name == 'converged' else float)
+                      for name in cls.__dataclass_fields__})
+
+    @classmethod
+    def load(cls, path: str) -> 'PerformanceTable':
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+def _interp2(table: np.ndarray, xs: np.ndarray, ys: np.ndarray, x: float, y: float) -> float:
+    """Bilinear interpolation on uniform axes (a single-point axis is constant), clamped to the grid."""
+    def locate(axis, value):
+        if len(axis) == 1:
+            return 0, 0, 0.0
+        position = np.clip((value - axis[0]) / (axis[1] - axis[0]), 0.0, len(axis) - 1.0)
+        i = min(int(position), len(axis) - 2)
+        fraction = position - i
+        return i, (i + 1 if fraction > 0 else i), fraction # On a grid line, the next row is not needed
+    i0, i1, a = locate(xs, x)
+    j0, j1, b = locate(ys, y)
+    return ((1 - a) * ((1 - b) * table[i0, j0] + b * table[i0, j1])
+            + a * ((1 - b) * table[i1, j0] + b * table[i1, j1]))
+
+def build_performance_table(model: BatchedMMGModel, max_rpm: float, n_rpm: int = 31, max_rudder: float = 35.0,
+                            n_rudder: int = 15, head_wind_kts=(0.0,), n_speed: int = 64) -> PerformanceTable:
+    """Solves every grid point of the speed and turning tables with batched Newton iterations."""
+    rpm = np.linspace(0.0, max_rpm, n_rpm)
+    winds = np.asarray(head_wind_kts, dtype=float)
+    running = rpm > 0 # No thrust, no way on: the zero-rpm row stays at rest
+    speed = np.zeros((n_rpm, len(winds)))
+    for k, wind_kts in enumerate(winds):
+        wind = Wind(speed=wind_kts, direction=0.0) if wind_kts else None
+        straight, _ = solve_equilibrium(model, rpm[running], 0.0, wind)
+        speed[running, k] = straight[:, 0]
+
+    speed_grid = np.linspace(0.0, speed.max(), n_speed)
+    # Speed rises with rpm, so each column inverts by interpolation
+    rpm_by_speed = np.column_stack([np.interp(speed_grid, np.maximum.accumulate(speed[:, k]), rpm) for k in range(len(winds))])
+
+    rudder = np.linspace(-max_rudder, max_rudder, n_rudder)
+    turn = np.zeros((n_rpm, n_rudder, 3))
+    converged = np.ones((n_rpm, n_rudder), dtype=bool)
+    rpm_grid, rudder_grid = np.meshgrid(rpm[running], rudder, indexing='ij')
+    # Continuation in rudder angle from the straight-ahead state keeps Newton in the right basin
+    guess = np.zeros((rpm_grid.size, 3))
+    guess[:, 0] = np.repeat(speed[running, 0], n_rudder)
+    for fraction in (0.25, 0.5, 0.75, 1.0):
+        states, ok = solve_equilibrium(model, rpm_grid.ravel(), fraction * rudder_grid.ravel(), guess=guess)
+        guess = states
+    # Directionally unstable hulls have no steady turn at small rudder angles
+    states[~ok] = np.nan
+    turn[running] = states.reshape(rpm_grid.shape + (3,))
+    converged[running] = ok.reshape(rpm_grid.shape)
+    return PerformanceTable(rpm, winds, speed, speed_grid, rpm_by_speed, rudder, turn, converged)
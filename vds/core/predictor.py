@@ -0,0 +1,130 @@
+# vds/core/predictor.py
+
+import threading
+from dataclasses import dataclass
+import numpy as np
+from vds.models.vessels.base_vessel import VesselState
+from vds.models.dynamics.batched_mmg_model import BatchedMMGModel
+from .kinematics import update_kinematics_batch
+
+class TrajectoryPredictor:
+    """
+    Faster-than-real-time forecast of own-ship tracks under several control hypotheses.
+    여러 조종 가정에 대해 자선의 미래 항적을 실시간보다 빠르게 예측합니다.
+
+    Hypothesis 0 is always the current control; the others keep the current rpm
+    with each of `alternative_rudders`. All hypotheses are integrated together
+    through a `BatchedMMGModel`.
+    """
+    def __init__(self, model: BatchedMMGModel, horizon: float = 360.0, dt: float = 1.0,
+                 marker_times=(60.0, 180.0, 360.0), alternative_rudders=(-35.0, 0.0, 35.0)):
+        self.model = model
+        self.horizon = horizon
+        self.dt = dt
+        self.marker_times = tuple(marker_times)
+        self.alternative_rudders = tuple(alternative_rudders)
+        self.times = np.arange(1, int(round(horizon / dt)) + 1) * dt
+
+    def hypotheses(self, control: dict) -> tuple[np.ndarray, np.ndarray]:
+        """(rpm, rudder) arrays for the current control followed by the alternatives."""
+        rpm = control.get('rpm', 0.0)
+        rudders = [control.get('rudder_angle', 0.0)] + list(self.alternative_rudders)
+        return np.full(len(rudders), rpm, dtype=float), np.array(rudders, dtype=float)
+
+    def predict(self, state: VesselState, control: dict, wind=None, current=None, waves=None) -> np.ndarray:
+        """
+        Integrates every hypothesis from `state` over the horizon.
+
+        Returns:
+            np.ndarray: Predicted (x, y) positions, shape (hypotheses, steps, 2),
+                        sampled at `self.times` seconds ahead.
+        """
+        rpm, rudder = self.hypotheses(control)
+        n = len(rpm)
+        eta = np.tile(state.eta, (n, 1))
+        nu = np.tile(state.nu, (n, 1))
+        tracks = np.empty((n, len(self.times), 2))
+        for k in range(len(self.times)):
+            nu += self.model.calculate_forces(eta, nu, rpm, rudder, wind=wind, current=current, waves=waves) * self.dt
+            update_kinematics_batch(eta, nu, self.dt)
+            tracks[:, k] = eta[:, :2]
+        return tracks
+
+    def marker_indices(self) -> np.ndarray:
+        """Indices into `times` of the 1/3/6-minute (or configured) markers."""
+        return np.searchsorted(self.times, self.marker_times).clip(0, len(self.times) - 1)
+
+@dataclass(frozen=True)
+class Forecast:
+    """One finished forecast, published as a whole so readers never see parts of two."""
+    version: int
+    origin_time: float      # Simulation time the forecast starts at
+    tracks: np.ndarray      # (hypotheses, steps, 2) predicted positions
+    rudders: np.ndarray     # Rudder angle of each hypothesis
+
+class PredictorWorker:
+    """
+    Runs a `TrajectoryPredictor` on a background thread so forecasts never block the caller.
+    예측 계산을 백그라운드 스레드에서 수행하여 렌더링을 막지 않습니다.
+
+    `update` is cheap and may be called every frame: a new forecast is only
+    requested when the controls change or the last forecast is older than
+    `refresh_interval` seconds of simulation time. The latest finished forecast
+    is available as `forecast` (None until the first one completes). It is replaced
+    by a single assignment, so other threads should read it once and use that object.
+    """
+    def __init__(self, predictor: TrajectoryPredictor, refresh_interval: float = 10.0):
+        self.predictor = predictor
+        self.refresh_interval = refresh_interval
+        self.forecast: Forecast = None
+        self._last_key = None
+        self._last_request_time = None
+        self._pending = None
+        self._condition = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def version(self) -> int:
+        """Incremented with every published forecast (0 before the first)."""
+        forecast = self.forecast
+        return forecast.version if forecast is not None else 0
+
+    @property
+    def tracks(self) -> np.ndarray:
+        forecast = self.forecast
+        return forecast.tracks if forecast is not None else None
+
+    def update(self, simulator, control: dict):
+        """Requests a new forecast if the controls changed or the current one is stale."""
+        key = (round(control.get('rpm', 0.0), 3), round(control.get('rudder_angle', 0.0), 3))
+        stale = self._last_request_time is None or abs(simulator.time - self._last_request_time) >= self.refresh_interval
+        if key == self._last_key and not stale:
+            return
+        self._last_key = key
+        self._last_request_time = simulator.time
+        state = VesselState(eta=simulator.vessel.state.eta.copy(), nu=simulator.vessel.state.nu.copy())
+        request = (simulator.time, state, dict(control), simulator.wind, simulator.current, simulator.waves)
+        with self._condition:
+            # Only the newest request matters; older unstarted ones are dropped
+            self._pending = request
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and self._running:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                time, state, control, wind, current, waves = self._pending
+                self._pending = None
+            tracks = self.predictor.predict(state, control, wind, current, waves)
+            self.forecast = Forecast(self.version + 1, time, tracks, self.predictor.hypotheses(control)[1])
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._thread.join(timeout=1.0)
@@ -0,0 +1,86 @@
+# vds/core/replay.py
+
+import numpy as np
+from vds.data_handler.run_log import RunLog
+from .simulator import Simulator
+
+class ReplayPlayer:
+    """
+    Plays a recorded run log back through a `Simulator`, so the normal `Renderer` can draw it.
+    기록된 실행 로그를 시뮬레이터를 통해 재생하여 기존 렌더러로 그릴 수 있게 합니다.
+
+    The simulator is never stepped: each `seek` copies the logged row into its state, moves
+    the AIS targets to the logged time and rebuilds the track from the log. Playback runs at
+    `speed` times real time (negative plays backwards); forward play only appends the new
+    rows to the track, while seeks and backward play rebuild it from a slice of the
+    memory-mapped log.
+    """
+    def __init__(self, log: RunLog, simulator: Simulator):
+        self.log = log
+        self.simulator = simulator
+        self.speed = 1.0
+        self.playing = True
+        self.index = -1
+        self.time = log.start_time
+        self._columns = {name: log[name] for name in log.columns}
+        self.seek(self.time)
+
+    @property
+    def start_time(self) -> float:
+        return self.log.start_time
+
+    @property
+    def end_time(self) -> float:
+        return self.log.end_time
+
+    def advance(self, wall_dt: float):
+        """Moves playback on by `wall_dt` seconds of real time; stops at either end of the log."""
+        if not self.playing or self.speed == 0:
+            return
+        target = self.time + wall_dt * self.speed
+        if target >= self.end_time or target <= self.start_time:
+            self.playing = False
+        self.seek(target)
+
+    def seek(self, t: float):
+        """Shows the state at time `t` (in the log's `elapsed` time index)."""
+        self.time = float(np.clip(t, self.start_time, self.end_time))
+        index = self.log.index_at(self.time)
+        if index == self.index:
+            return
+        previous, self.index = self.index, index
+        self._apply_row(index)
+        track = self.simulator.track_history
+        columns = self._columns
+        if previous >= 0 and previous < index and index - previous < track.maxlen:
+            track.extend(np.column_stack([columns['eta_0'][previous + 1:index + 1], columns['eta_1'][previous + 1:index + 1]]))
+        else:
+            start = max(0, index + 1 - track.maxlen)
+            track.clear()
+            track.extend(np.column_stack([columns['eta_0'][start:index + 1], columns['eta_1'][start:index + 1]]))
+
+    def step_rows(self, rows: int):
+        """Moves `rows` logged steps forwards (or backwards if negative)."""
+        index = int(np.clip(self.index + rows, 0, len(self.log) - 1))
+        self.seek(float(self._columns['elapsed'][index]))
+
+    def _apply_row(self, index: int):
+        columns = self._columns
+        sim = self.simulator
+        state = sim.vessel.state
+        state.eta = np.array([columns[f"eta_{k}"][index] for k in range(6)], dtype=float)
+        state.nu = np.array([columns[f"nu_{k}"][index] for k in range(6)], dtype=float)
+        sim.time = float(columns['time'][index])
+        sim.current_waypoint_index = int(columns['waypoint_index'][index])
+        sim.cross_track_error = float(columns['cross_track_m'][index])
+        sim.distance_to_go = float(columns['distance_to_go_m'][index])
+        sim.autopilot_enabled = bool(columns['autopilot'][index])
+        sim.avoidance_enabled = bool(columns['avoidance'][index])
+        sim.collision_detected = bool(columns['collision'][index])
+        for target in sim.ais_targets:
+            target.update(sim.time)
+
+    def control(self) -> dict:
+        """The logged control at the current row."""
+        return {'rpm': float(self._columns['rpm'][self.index]),
+                'rudder_angle': float(self._columns['rudder_angle'][self.index])}
@@ -0,0 +1,114 @@
+# vds/core/route.py
+
+import os
+import numpy as np
+import yaml
+from .autopilot import wrap_angle
+
+class Route:
+    """
+    A waypoint route with leg geometry precomputed into arrays.
+    항로 구간(leg)의 기하 정보를 배열로 미리 계산해 두는 웨이포인트 항로.
+
+    Point 0 is the route origin (normally the vessel's start position) and
+    points 1..M are the waypoints, so leg `i` runs from point `i` to point
+    `i + 1` and targets waypoint `i`. All per-step queries only touch the
+    active leg, so their cost does not depend on the number of legs.
+    """
+    def __init__(self, waypoints: list[dict], origin, turn_radius: float, arrival_radius: float,
+                 min_switch_distance: float = 0.0):
+        self.waypoints = waypoints
+        self.names = [wp.get('name', f"WP{i + 1}") for i, wp in enumerate(waypoints)]
+        self.points = np.vstack([np.asarray(origin, dtype=float)[:2]] +
+                                [np.asarray(wp['position'], dtype=float) for wp in waypoints])
+        self.num_legs = len(waypoints)
+
+        self.leg_vectors = np.diff(self.points, axis=0)
+        self.leg_lengths = np.linalg.norm(self.leg_vectors, axis=1)
+        safe_lengths = np.where(self.leg_lengths > 0, self.leg_lengths, 1.0)
+        self.leg_tangents = np.where(self.leg_lengths[:, None] > 0, self.leg_vectors / safe_lengths[:, None], [1.0, 0.0])
+        self.leg_courses = np.arctan2(self.leg_tangents[:, 1], self.leg_tangents[:, 0])
+        self.cumulative_lengths = np.concatenate([[0.0], np.cumsum(self.leg_lengths)])
+
+        # Course change at the end of each leg (zero after the final waypoint)
+        self.turn_angles = np.zeros(self.num_legs)
+        self.turn_angles[:-1] = wrap_angle(self.leg_courses[1:] - self.leg_courses[:-1])
+        self.turn_radii = np.array([wp.get('turn_radius', turn_radius) for wp in waypoints], dtype=float)
+
+        # Wheel-over: start the turn R*tan(|dchi|/2) before the waypoint so the
+        # arc is tangent to both legs. The final leg ends on an arrival circle.
+        self.wheel_over_distances = np.maximum(self.turn_radii * np.tan(np.abs(self.turn_angles) / 2),
+                                               min_switch_distance)
+        self.wheel_over_distances = np.minimum(self.wheel_over_distances, self.leg_lengths)
+        if self.num_legs:
+            self.wheel_over_distances[-1] = arrival_radius
+        self.wheel_over_points = self.points[1:] - self.leg_tangents * self.wheel_over_distances[:, None]
+        self.arrival_radius = arrival_radius
+
+    @classmethod
+    def for_vessel(cls, waypoints: list[dict], origin, loa: float):
+        """
+        Route with the default geometry for a vessel of the given length. Legs are never
+        switched later than two ship lengths before their waypoint, so slow-turning hulls
+        start gentle course changes early enough to stay near the track.
+        """
+        return cls(waypoints, origin, turn_radius=2.0 * loa, arrival_radius=2.0 * loa, min_switch_distance=2.0 * loa)
+
+    @staticmethod
+    def load_waypoints(file_path: str) -> list[dict]:
+        """
+        Reads waypoints from a route file.
+        CSV files have a `name,x,y[,turn_radius]` header; YAML files hold a `waypoints` list
+        in the same format as scenario files.
+        """
+        if os.path.splitext(file_path)[1].lower() == '.csv':
+            table = np.genfromtxt(file_path, delimiter=',', names=True, dtype=None, encoding='utf-8')
+            table = np.atleast_1d(table)
+            waypoints = []
+            for row in table:
+                wp = {'name': str(row['name']), 'position': [float(row['x']), float(row['y'])]}
+                if 'turn_radius' in table.dtype.names:
+                    wp['turn_radius'] = float(row['turn_radius'])
+                waypoints.append(wp)
+            return waypoints
+        with open(file_path, 'r') as f:
+            return yaml.safe_load(f)['waypoints']
+
+    @property
+    def total_length(self) -> float:
+        return float(self.cumulative_lengths[-1])
+
+    def leg(self, index: int) -> tuple[np.ndarray, np.ndarray]:
+        """Start and end points of leg `index`."""
+        return self.points[index], self.points[index + 1]
+
+    def leg_errors(self, position, index: int) -> tuple[float, float]:
+        """
+        Cross-track and along-track error of `position` relative to leg `index`.
+        Cross-track error is positive when the vessel is to starboard of the leg.
+        """
+        rel = np.asarray(position, dtype=float)[:2] - self.points[index]
+        t = self.leg_tangents[index]
+        return float(rel[1] * t[0] - rel[0] * t[1]), float(rel[0] * t[0] + rel[1] * t[1])
+
+    def errors(self, positions, indices) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorized `leg_errors` for many positions, each against its own leg index."""
+        indices = np.minimum(np.asarray(indices), self.num_legs - 1)
+        rel = np.asarray(positions, dtype=float)[:, :2] - self.points[indices]
+        t = self.leg_tangents[indices]
+        return rel[:, 1] * t[:, 0] - rel[:, 0] * t[:, 1], rel[:, 0] * t[:, 0] + rel[:, 1] * t[:, 1]
+
+    def should_switch(self, position, index: int) -> bool:
+        """True once the vessel has reached the wheel-over point (or arrival circle) of leg `index`."""
+        if index >= self.num_legs - 1:
+            return np.linalg.norm(self.points[index + 1] - np.asarray(position, dtype=float)[:2]) < self.arrival_radius
+        _, along = self.leg_errors(position, index)
+        return along >= self.leg_lengths[index] - self.wheel_over_distances[index]
+
+    def distance_to_go(self, position, index: int) -> float:
+        """Remaining route distance measured along the legs from `position`."""
+        if index >= self.num_legs:
+            return 0.0
+        _, along = self.leg_errors(position, index)
+        remaining_on_leg = max(self.leg_lengths[index] - along, 0.0)
+        return float(remaining_on_leg + self.total_length - self.cumulative_lengths[index + 1])
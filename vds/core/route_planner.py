@@ -0,0 +1,271 @@
+# vds/core/route_planner.py
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import numpy as np
+from scipy.ndimage import distance_transform_edt
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra
+from vds.environment.geography import Geography
+from vds.environment.shoreline import polygon_edges
+
+_SQRT2 = np.sqrt(2.0)
+# Half of the 8-neighbourhood; the graph is undirected
+_NEIGHBOURS = [(1, 0, 1.0), (0, 1, 1.0), (1, 1, _SQRT2), (1, -1, _SQRT2)]
+
+@dataclass
+class CostMap:
+    """
+    Rasterized no-go map of a rectangular planning domain.
+    Row `i` runs north (x) and column `j` runs east (y), like `Geography.depth_data`.
+    """
+    origin: np.ndarray          # World (x, y) of the corner of cell (0, 0)
+    resolution: float           # Cell size (m)
+    blocked: np.ndarray         # Fine no-go mask, inflated by the clearance
+    levels: list                # Conservative (any-blocked) masks, each coarse_factor times coarser
+    coarse_factor: int
+    nearest_free: np.ndarray    # (2, H, W) indices of the nearest free cell, for snapping
+
+    def to_cell(self, point) -> tuple[int, int]:
+        i, j = np.floor((np.asarray(point, dtype=float)[:2] - self.origin) / self.resolution).astype(int)
+        return int(np.clip(i, 0, self.blocked.shape[0] - 1)), int(np.clip(j, 0, self.blocked.shape[1] - 1))
+
+    def to_world(self, cells: np.ndarray) -> np.ndarray:
+        return self.origin + (np.asarray(cells, dtype=float) + 0.5) * self.resolution
+
+    def line_of_sight(self, p: np.ndarray, q: np.ndarray) -> bool:
+        """True if the straight segment p-q crosses no blocked cell (sampled at half-cell spacing)."""
+        n = int(np.ceil(np.linalg.norm(q - p) / (0.5 * self.resolution))) + 1
+        samples = p + np.linspace(0.0, 1.0, n)[:, None] * (q - p)
+        cells = np.floor((samples - self.origin) / self.resolution).astype(int)
+        return not self.blocked[cells[:, 0], cells[:, 1]].any()
+
+def _grid_path(blocked: np.ndarray, start: tuple[int, int], goal: tuple[int, int], allowed: np.ndarray = None):
+    """
+    Shortest 8-connected path between two free cells, or None.
+    The graph is built with array operations over the free cells (optionally limited
+    to an `allowed` corridor) and searched with scipy's compiled Dijkstra.
+    """
+    height, width = blocked.shape
+    free = ~blocked if allowed is None else (allowed & ~blocked)
+    if not (free[start] and free[goal]):
+        return None
+    rows, cols = np.nonzero(free)
+    node_of = np.full(blocked.shape, -1, dtype=np.int64)
+    node_of[rows, cols] = np.arange(len(rows))
+
+    sources, targets, weights = [], [], []
+    for di, dj, step in _NEIGHBOURS:
+        ni, nj = rows + di, cols + dj
+        valid = (ni >= 0) & (ni < height) & (nj >= 0) & (nj < width)
+        valid[valid] &= node_of[ni[valid], nj[valid]] >= 0
+        if di and dj:
+            # No corner cutting between two blocked orthogonal neighbours
+            valid[valid] &= free[rows[valid], nj[valid]] & free[ni[valid], cols[valid]]
+        sources.append(node_of[rows[valid], cols[valid]])
+        targets.append(node_of[ni[valid], nj[valid]])
+        weights.append(np.full(valid.sum(), step))
+    graph = coo_matrix((np.concatenate(weights), (np.concatenate(sources), np.concatenate(targets))),
+                       shape=(len(rows), len(rows))).tocsr()
+
+    start_node, goal_node = node_of[start], node_of[goal]
+    distances, predecessors = dijkstra(graph, directed=False, indices=start_node, return_predecessors=True)
+    if not np.isfinite(distances[goal_node]):
+        return None
+    path = [goal_node]
+    while path[-1] != start_node:
+        path.append(predecessors[path[-1]])
+    path = np.array(path[::-1])
+    return np.stack([rows[path], cols[path]], axis=1)
+
+class RoutePlanner:
+    """
+    Plans collision-free routes over the bathymetry grid and obstructions.
+    수심 격자와 장애물을 고려하여 충돌 없는 항로를 자동으로 계획합니다.
+
+    Cells shallower than `draft * safety_factor`, cells covered by obstructions and
+    cells crossed by the outline of a polygonal structure are no-go; all are inflated by
+    `clearance`. The search runs Dijkstra on a coarse grid first, then on the fine grid
+    restricted to a corridor around the coarse path, and finally shortens the result with
+    any-angle line-of-sight pulls. Cost maps are cached per domain and geography version.
+    """
+    def __init__(self, geography: Geography, draft: float, clearance: float, safety_factor: float = 1.2,
+                 resolution: float = None, coarse_factor: int = 4, corridor_width: int = 1, coarsest_size: int = 64,
+                 cache_size: int = 8):
+        self.geography = geography
+        self.draft = draft
+        self.clearance = clearance
+        self.safety_factor = safety_factor
+        self.resolution = resolution if resolution is not None else float(geography.cell_size)
+        self.coarse_factor = coarse_factor
+        self.corridor_width = corridor_width
+        self.coarsest_size = coarsest_size
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def _obstacle_arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.geography.obstacle_positions, self.geography.obstacle_radii
+
+    def _domain(self, points, obstacle_positions) -> tuple[np.ndarray, np.ndarray]:
+        """Planning bounds covering the grid, the obstacles and the given points, snapped to tiles."""
+        corners = [np.zeros(2), np.array([self.geography.map_height, self.geography.map_width], dtype=float)]
+        corners += [np.asarray(p, dtype=float)[:2] for p in points]
+        if len(obstacle_positions):
+            corners += [obstacle_positions.min(axis=0), obstacle_positions.max(axis=0)]
+        corners = np.array(corners)
+        pad = self.clearance + 2 * self.resolution
+        tile = self.resolution * self.coarse_factor * 8
+        low = np.floor((corners.min(axis=0) - pad) / tile) * tile
+        high = np.ceil((corners.max(axis=0) + pad) / tile) * tile
+        return low, high
+
+    def cost_map(self, points=()) -> CostMap:
+        """Returns the (cached) cost map of a domain containing `points`."""
+        obstacle_positions, obstacle_radii = self._obstacle_arrays()
+        low, high = self._domain(points, obstacle_positions)
+        geography = self.geography
+        # The geography bumps its versions on every change, so the key costs nothing to build
+        key = (tuple(low), tuple(high), geography.depth_version, geography.obstacles_version,
+               geography.polygons_version, float(geography.cell_size), self.draft, self.safety_factor, self.clearance)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        res = self.resolution
+        shape = tuple(np.round((high - low) / res).astype(int))
+        centers_x = low[0] + (np.arange(shape[0]) + 0.5) * res
+        centers_y = low[1] + (np.arange(shape[1]) + 0.5) * res
+        depths = self.geography.get_depths_at(centers_x[:, None], centers_y[None, :])
+        blocked = np.abs(depths) < self.draft * self.safety_factor
+
+        for position, radius in zip(obstacle_positions, obstacle_radii):
+            lo = np.maximum(np.floor((position - radius - low) / res).astype(int), 0)
+            hi = np.minimum(np.ceil((position + radius - low) / res).astype(int) + 1, shape)
+            if np.any(hi <= lo):
+                continue
+            dx = centers_x[lo[0]:hi[0], None] - position[0]
+            dy = centers_y[None, lo[1]:hi[1]] - position[1]
+            inside = dx**2 + dy**2 <= radius**2
+            # Obstacles smaller than a cell still block the cell containing their centre
+            if not inside.any():
+                ci, cj = np.floor((position - low) / res).astype(int)
+                inside[ci - lo[0], cj - lo[1]] = True
+            blocked[lo[0]:hi[0], lo[1]:hi[1]] |= inside
+
+        edges, _ = polygon_edges(geography.polygons)
+        if len(edges):
+            # Structure outlines, sampled at half-cell spacing; the closed outline keeps paths out of the inside
+            lengths = np.hypot(*(edges[:, 1] - edges[:, 0]).T)
+            counts = np.ceil(lengths / (0.5 * res)).astype(int) + 1
+            owner = np.repeat(np.arange(len(edges)), counts)
+            t = (np.arange(owner.size) - np.repeat(np.cumsum(counts) - counts, counts)) / (counts[owner] - 1)
+            samples = edges[owner, 0] + t[:, None] * (edges[owner, 1] - edges[owner, 0])
+            cells = np.floor((samples - low) / res).astype(int)
+            cells = cells[np.all((cells >= 0) & (cells < shape), axis=1)]
+            blocked[cells[:, 0], cells[:, 1]] = True
+
+        if blocked.any() and self.clearance > 0:
+            blocked = distance_transform_edt(~blocked) * res < self.clearance
+        if blocked.all():
+            nearest_free = np.indices(shape)
+        else:
+            _, nearest_free = distance_transform_edt(blocked, return_indices=True)
+
+        k = self.coarse_factor
+        levels = [blocked]
+        while max(levels[-1].shape) > self.coarsest_size:
+            finer = levels[-1]
+            padded = np.pad(finer, ((0, -finer.shape[0] % k), (0, -finer.shape[1] % k)), constant_values=True)
+            levels.append(padded.reshape(padded.shape[0] // k, k, padded.shape[1] // k, k).any(axis=(1, 3)))
+
+        cost_map = CostMap(low, res, blocked, levels, k, nearest_free)
+        self._cache[key] = cost_map
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return cost_map
+
+    def _snap(self, cost_map: CostMap, cell: tuple[int, int]) -> tuple[int, int]:
+        return int(cost_map.nearest_free[0][cell]), int(cost_map.nearest_free[1][cell])
+
+    def _search(self, cost_map: CostMap, start: tuple[int, int], goal: tuple[int, int]):
+        """
+        Multi-resolution search: solve on the coarsest level, then refine level by level
+        inside a corridor around the coarser path. Any level whose corridor search fails
+        (the conservative coarse masks can close narrow channels) is solved in full.
+        """
+        k = cost_map.coarse_factor
+        w = self.corridor_width
+        path = None
+        for level in range(len(cost_map.levels) - 1, -1, -1):
+            blocked = cost_map.levels[level]
+            scale = k ** level
+            level_start, level_goal = (start[0] // scale, start[1] // scale), (goal[0] // scale, goal[1] // scale)
+            if level > 0:
+                blocked = blocked.copy()
+                blocked[level_start] = blocked[level_goal] = False
+            refined = None
+            if path is not None:
+                corridor = np.zeros(cost_map.levels[level + 1].shape, dtype=bool)
+                for di in range(-w, w + 1):
+                    for dj in range(-w, w + 1):
+                        corridor[np.clip(path[:, 0] + di, 0, corridor.shape[0] - 1),
+                                 np.clip(path[:, 1] + dj, 0, corridor.shape[1] - 1)] = True
+                corridor = np.repeat(np.repeat(corridor, k, axis=0), k, axis=1)[:blocked.shape[0], :blocked.shape[1]]
+                refined = _grid_path(blocked, level_start, level_goal, corridor)
+            path = refined if refined is not None else _grid_path(blocked, level_start, level_goal)
+            if path is None and level == 0:
+                return None
+        return path
+
+    def _shorten(self, cost_map: CostMap, points: np.ndarray) -> np.ndarray:
+        """Any-angle path shortening: keep extending each straight segment while it stays clear."""
+        # Drop cells where the grid path does not change direction
+        if len(points) > 2:
+            steps = np.diff(points, axis=0)
+            turning = np.any(steps[1:] != steps[:-1], axis=1)
+            points = np.concatenate([points[:1], points[1:-1][turning], points[-1:]])
+        kept = [0]
+        anchor = 0
+        for index in range(2, len(points)):
+            if not cost_map.line_of_sight(points[anchor], points[index]):
+                anchor = index - 1
+                kept.append(anchor)
+        kept.append(len(points) - 1)
+        return points[kept]
+
+    def plan(self, start, goal, name_prefix: str = "WP") -> list[dict]:
+        """
+        Plans a route from `start` to `goal` (world x/north, y/east).
+
+        Returns:
+            list[dict]: Waypoints `{'name', 'position'}` after the start, ending at the goal,
+                        in the same format as scenario waypoints.
+
+        Raises:
+            ValueError: If no navigable route exists.
+        """
+        start = np.asarray(start, dtype=float)[:2]
+        goal = np.asarray(goal, dtype=float)[:2]
+        cost_map = self.cost_map([start, goal])
+        start_cell, goal_cell = cost_map.to_cell(start), cost_map.to_cell(goal)
+        start_snapped = cost_map.blocked[start_cell]
+        goal_snapped = cost_map.blocked[goal_cell]
+        if start_snapped:
+            start_cell = self._snap(cost_map, start_cell)
+        if goal_snapped:
+            goal_cell = self._snap(cost_map, goal_cell)
+
+        path = self._search(cost_map, start_cell, goal_cell)
+        if path is None:
+            raise ValueError(f"No navigable route from {start.tolist()} to {goal.tolist()} for draft {self.draft} m.")
+
+        points = self._shorten(cost_map, cost_map.to_world(path))
+        if not goal_snapped:
+            points[-1] = goal
+        if not start_snapped:
+            points[0] = start
+        route_points = points if start_snapped else points[1:]
+        if len(route_points) == 0:
+            route_points = goal[None, :]
+        return [{'name': f"{name_prefix}{i + 1}", 'position': [float(p[0]), float(p[1])]}
+                for i, p in enumerate(route_points)]
@@ -0,0 +1,160 @@
+# vds/core/sim_server.py
+
+import asyncio
+import struct
+from .state_codec import StateDecoder, StateEncoder, StateFrame, quantize
+
+# Messages are framed as (type, payload length) followed by the payload
+_FRAME = struct.Struct('<BI')
+MSG_STATE, MSG_CONTROL, MSG_AUTOPILOT = 1, 2, 3
+_CONTROL = struct.Struct('<dd')  # rpm, rudder angle (deg)
+_AUTOPILOT = struct.Struct('<b') # 0: disengage, 1: engage, -1: toggle
+MAX_MESSAGE_BYTES = 1 << 20
+
+RPM_LIMITS = (-200.0, 300.0)
+RUDDER_LIMIT = 35.0
+
+async def read_message(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    kind, length = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    if length > MAX_MESSAGE_BYTES:
+        raise ValueError(f"Message of {length} bytes exceeds the limit.")
+    return kind, await reader.readexactly(length)
+
+def frame_message(kind: int, payload: bytes) -> bytes:
+    return _FRAME.pack(kind, len(payload)) + payload
+
+class _Client:
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.synced = False # True once the client holds the previous broadcast frame
+
+class SimulationServer:
+    """
+    Hosts one authoritative `Simulator` and shares it with remote stations over TCP.
+    하나의 시뮬레이터를 TCP로 여러 원격 스테이션과 공유하는 서버.
+
+    The physics loop steps the simulator every `dt` of wall time divided by `speed`; every
+    client may send control (rpm, rudder) and autopilot messages, and the last message
+    received wins. The state is broadcast `rate` times per wall-clock second (fewer if the
+    loop falls behind real time) with `StateEncoder`: a client gets a delta when it received
+    the previous frame, and a keyframe when it just connected or was skipped because its
+    send buffer was over `max_buffered_bytes`.
+    """
+    def __init__(self, simulator, control: dict, host: str = '127.0.0.1', port: int = 8765,
+                 dt: float = 0.1, rate: float = 10.0, speed: float = 1.0, keyframe_interval: int = 100,
+                 max_buffered_bytes: int = 1 << 16):
+        self.simulator = simulator
+        self.control = dict(control)
+        self.host, self.port = host, port
+        self.dt, self.speed = dt, speed
+        # `speed` simulated seconds pass per wall second, so `rate` wall-clock broadcasts span speed / rate of them
+        self.steps_per_broadcast = max(1, int(round(speed / (rate * dt))))
+        self.keyframe_interval = keyframe_interval
+        self.max_buffered_bytes = max_buffered_bytes
+        self.clients: list[_Client] = []
+        self.encoder = StateEncoder()
+        self.bytes_sent = 0
+        self.steps = 0
+        self._server: asyncio.AbstractServer = None
+
+    async def start(self):
+        """Starts listening; with port 0 the chosen port is stored in `self.port`."""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def run(self, duration: float = None):
+        """Runs the physics loop in real time for `duration` simulated seconds (forever if None)."""
+        if self._server is None:
+            await self.start()
+        loop = asyncio.get_running_loop()
+        next_step = loop.time()
+        while duration is None or self.steps * self.dt < duration - 1e-9:
+            self.simulator.step(self.dt, self.control)
+            self.steps += 1
+            if self.steps % self.steps_per_broadcast == 0:
+                await self.broadcast()
+            next_step += self.dt / self.speed
+            # Always yield so client messages are handled; skip the wait if the loop is behind
+            await asyncio.sleep(max(0.0, next_step - loop.time()))
+
+    async def broadcast(self):
+        keyframe, delta = self.encoder.encode(*quantize(self.simulator, self.control))
+        if self.encoder.seq % self.keyframe_interval == 0:
+            delta = None
+        key_message = frame_message(MSG_STATE, keyframe)
+        delta_message = frame_message(MSG_STATE, delta) if delta is not None else None
+        for client in list(self.clients):
+            if client.writer.is_closing():
+                self.clients.remove(client)
+                continue
+            if client.writer.transport.get_write_buffer_size() > self.max_buffered_bytes:
+                client.synced = False # Slow client: drop this frame and resync with a keyframe
+                continue
+            message = delta_message if client.synced and delta_message is not None else key_message
+            client.writer.write(message)
+            client.synced = True
+            self.bytes_sent += len(message)
+
+    def close(self):
+        for client in self.clients:
+            client.writer.close()
+        self.clients.clear()
+        if self._server is not None:
+            self._server.close()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = _Client(writer)
+        self.clients.append(client)
+        try:
+            while True:
+                kind, payload = await read_message(reader)
+                self.apply_message(kind, payload)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError, struct.error):
+            pass
+        finally:
+            if client in self.clients:
+                self.clients.remove(client)
+            writer.close()
+
+    def apply_message(self, kind: int, payload: bytes):
+        """Applies one client message to the shared control and simulator."""
+        if kind == MSG_CONTROL:
+            rpm, rudder = _CONTROL.unpack(payload)
+            self.control['rpm'] = min(max(rpm, RPM_LIMITS[0]), RPM_LIMITS[1])
+            self.control['rudder_angle'] = min(max(rudder, -RUDDER_LIMIT), RUDDER_LIMIT)
+        elif kind == MSG_AUTOPILOT:
+            (engage,) = _AUTOPILOT.unpack(payload)
+            self.simulator.set_autopilot(not self.simulator.autopilot_enabled if engage < 0 else bool(engage))
+
+class SimulationClient:
+    """Remote station: sends controls to a `SimulationServer` and decodes its state broadcasts."""
+    def __init__(self):
+        self.decoder = StateDecoder()
+        self.reader: asyncio.StreamReader = None
+        self.writer: asyncio.StreamWriter = None
+
+    async def connect(self, host: str = '127.0.0.1', port: int = 8765) -> 'SimulationClient':
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        return self
+
+    async def send_control(self, rpm: float, rudder_angle: float):
+        self.writer.write(frame_message(MSG_CONTROL, _CONTROL.pack(rpm, rudder_angle)))
+        await self.writer.drain()
+
+    async def set_autopilot(self, enabled: bool = None):
+        """Engages or disengages the autopilot; `None` toggles it."""
+        self.writer.write(frame_message(MSG_AUTOPILOT, _AUTOPILOT.pack(-1 if enabled is None else int(enabled))))
+        await self.writer.drain()
+
+    async def receive(self) -> StateFrame:
+        while True:
+            kind, payload = await read_message(self.reader)
+            if kind == MSG_STATE:
+                return self.decoder.decode(payload)
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
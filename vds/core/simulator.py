@@ -1,20 +1,32 @@
 
 # vds/core/simulator.py
 
+import logging
 import numpy as np
 import copy
-from collections import deque
 from .kinematics import update_kinematics_6dof
-from vds.models.vessels.base_vessel import BaseVessel
+from vds.models.vessels.base_vessel import BaseVessel, VesselState
 from vds.models.dynamics.base_model import BaseDynamicsModel
 from vds.environment.geography import Geography
 from vds.data_handler.ais_parser import AISTarget
+from vds.data_handler.live_ais import LiveAISTarget
 from vds.environment.wind import Wind
 from vds.environment.current import Current
 from vds.environment.waves import Waves
+from .autopilot import AutopilotBank
+from .route import Route
+from .mpc import SamplingMPC
+from .random_streams import RandomStreams
+from . import snapshot as snapshot_io
+from .snapshot import SimulationSnapshot
+from .events import EventBus, EventType
+from .track_history import TrackHistory
+from vds.utils.profiler import Profiler, NULL_PROFILER
+
+log = logging.getLogger(__name__)
 
 class Simulator:
-    def __init__(self, vessel: BaseVessel, dynamics_model: BaseDynamicsModel, geography: Geography, ais_targets: list[AISTarget] = [], wind: Wind = None, current: Current = None, waves: Waves = None):
+    def __init__(self, vessel: BaseVessel, dynamics_model: BaseDynamicsModel, geography: Geography, ais_targets: list[AISTarget] = [], wind: Wind = None, current: Current = None, waves: Waves = None, autopilot: AutopilotBank = None, seed=None):
         self.vessel = vessel
         self.dynamics_model = dynamics_model
         self.geography = geography
@@ -22,85 +34,250 @@ class Simulator:
         self.wind = wind
         self.current = current
         self.waves = waves
+        self.initial_vessel_state = copy.deepcopy(vessel.state)
+        self.route: Route = None
         self.waypoints = [] # Waypoints for autopilot
         self.current_waypoint_index = 0
+        self.cross_track_error = 0.0 # Route metrics, updated every step
+        self.along_track_distance = 0.0
+        self.distance_to_go = 0.0
         
-        self.initial_vessel_state = copy.deepcopy(vessel.state)
         self.time = 0.0
         self.collision_detected = False
         self.is_paused = False
         self.autopilot_enabled = False # Autopilot state
-        self.track_history = deque(maxlen=10000)
+        self.autopilot = autopilot if autopilot is not None else AutopilotBank(1, lookahead=2.5 * vessel.specs.loa)
+        self.collision_avoidance: SamplingMPC = None # Optional avoidance controller used instead of the PID autopilot
+        self.avoidance_enabled = False
+        self.track_history = TrackHistory(maxlen=10000)
         self.show_obstacles = True
         self.show_water_depth = True
         self.show_minimap = True
+        self.show_prediction = True
+        # Independent obstacle/environment/sensor streams; `seed` may be an int, a SeedSequence or a RandomStreams
+        self.random = seed if isinstance(seed, RandomStreams) else RandomStreams(seed)
+        self.profiler: Profiler = None # Opt-in per-phase timing; None records into a no-op
+        self.live_ais = None # Optional LiveAISFeed; when set, it supplies `ais_targets` every step
+        self.events = EventBus() # Waypoints, collisions, groundings, ...; subscribe a sink to see them
+        self._grounded = False # Groundings are reported once, when the vessel first touches bottom
+        self._shore_anchor = np.zeros(2) # Shore distance is only re-queried after moving `_shore_margin` from here
+        self._shore_margin = -1.0
+
+    @property
+    def waypoints(self) -> list[dict]:
+        return self.route.waypoints if self.route is not None else []
+
+    @waypoints.setter
+    def waypoints(self, waypoints: list[dict]):
+        """Builds the route geometry once; the first leg starts at the vessel's initial position."""
+        self.route = Route.for_vessel(waypoints, self.initial_vessel_state.eta[:2], self.vessel.specs.loa) if waypoints else None
 
     def reset(self):
-        self.vessel.state = copy.deepcopy(self.initial_vessel_state)
+        self.vessel.state = VesselState(eta=self.initial_vessel_state.eta.copy(), nu=self.initial_vessel_state.nu.copy())
         self.time = 0.0
         self.collision_detected = False
         self.track_history.clear()
         self.current_waypoint_index = 0
+        self.cross_track_error, self.along_track_distance, self.distance_to_go = 0.0, 0.0, 0.0
+        self.autopilot.reset()
+        if self.collision_avoidance is not None:
+            self.collision_avoidance.reset()
         for target in self.ais_targets:
             target.update(0)
-        print("\n--- Simulation Reset ---")
+        self._grounded = False
+        self._shore_margin = -1.0
+        self.events.emit(EventType.SIMULATION_RESET, 0.0)
+
+    @property
+    def rng(self) -> np.random.Generator:
+        """Environment random stream."""
+        return self.random.environment
+
+    def rng_streams(self) -> list[np.random.Generator]:
+        """Random streams whose state is part of a snapshot."""
+        return self.random.generators()
+
+    def snapshot(self, control: dict = None) -> SimulationSnapshot:
+        """Captures the current simulation state (and optionally the control) as a flat-array snapshot."""
+        return snapshot_io.capture(self, control)
+
+    def restore(self, snapshot: SimulationSnapshot) -> dict:
+        """Restores a snapshot taken from this simulator or one of its forks. Returns the recorded control."""
+        snapshot_io.apply(self, snapshot)
+        self.track_history.clear()
+        self._shore_margin = -1.0
+        if self.collision_avoidance is not None:
+            # The plan is not part of the snapshot: re-plan from the restored state on the next step
+            self.collision_avoidance.reset()
+        return snapshot.control
+
+    def fork(self, n: int, snapshot: SimulationSnapshot = None) -> list['Simulator']:
+        """
+        Creates `n` independent simulators continuing from `snapshot` (default: the current state).
+        Static components (dynamics model, geography, route, environment) are shared, not copied.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+        forks = []
+        for _ in range(n):
+            sim = copy.copy(self)
+            sim.vessel = BaseVessel(self.vessel.specs, VesselState())
+            sim.autopilot = copy.deepcopy(self.autopilot)
+            sim.collision_avoidance = copy.deepcopy(self.collision_avoidance)
+            # Live targets are frozen at their current fix: the feed's table keeps changing under the parent
+            sim.ais_targets = [target.frozen(self.time) if isinstance(target, LiveAISTarget) else copy.copy(target)
+                               for target in self.ais_targets]
+            for target in sim.ais_targets:
+                target.state = copy.copy(target.state)
+            sim.track_history = TrackHistory(maxlen=self.track_history.maxlen)
+            sim.random = RandomStreams()
+            sim.profiler = None
+            sim.events = EventBus(self.events.capacity)
+            sim.live_ais = None # Forks continue from the live targets as last received
+            sim.restore(snapshot)
+            forks.append(sim)
+        return forks
 
     def step(self, dt: float, control: dict):
         if self.collision_detected or self.is_paused:
             return
-
+        profiler = self.profiler if self.profiler is not None else NULL_PROFILER
+        step_start = t = profiler.now()
         self._update_waypoint_tracking()
+        t = profiler.record('waypoints', t)
+        if self.autopilot_enabled:
+            if self.avoidance_enabled and self.collision_avoidance is not None:
+                self.collision_avoidance.update(self, control)
+                t = profiler.record('avoidance', t)
+            else:
+                self._apply_autopilot(dt, control)
+                t = profiler.record('autopilot', t)
 
         current_depth = self.geography.get_depth_at(self.vessel.state.eta[0], self.vessel.state.eta[1])
+        if (abs(current_depth) < self.vessel.specs.draft) != self._grounded:
+            self._check_grounding(current_depth)
+        t = profiler.record('depth', t)
         nu_dot = self.dynamics_model.calculate_forces(self.vessel.state, control, current_depth, self.wind, self.current, self.waves)
+        t = profiler.record('forces', t)
         self.vessel.state.nu += nu_dot * dt
         self.vessel.state = update_kinematics_6dof(self.vessel.state, dt)
-        
-        self.track_history.append(self.vessel.state.eta[:2].copy())
+        t = profiler.record('kinematics', t)
+
+        self.track_history.append(self.vessel.state.eta)
         self.check_collisions()
-        
+        t = profiler.record('collisions', t)
+        if self.show_obstacles:
+            profiler.count('obstacles_checked', len(self.geography.obstacle_radii))
+
+        if self.live_ais is not None:
+            self.ais_targets = self.live_ais.poll(self.time)
         for target in self.ais_targets:
             target.update(self.time)
+        profiler.record('ais', t)
+        profiler.count('targets_updated', len(self.ais_targets))
         self.time += dt
+        profiler.count('steps')
+        profiler.record('step', step_start)
 
     def _update_waypoint_tracking(self):
-        """Checks if the vessel has reached the current waypoint and advances to the next."""
-        if not self.waypoints or self.current_waypoint_index >= len(self.waypoints):
+        """Advances to the next leg at its wheel-over point and updates the route metrics."""
+        route = self.route
+        if route is None or self.current_waypoint_index >= route.num_legs:
             return
 
-        target_pos = np.array(self.waypoints[self.current_waypoint_index]['position'])
         current_pos = self.vessel.state.eta[:2]
-        
-        distance_to_target = np.linalg.norm(target_pos - current_pos)
-        
-        # Waypoint arrival check (e.g., within 2 ship lengths)
-        if distance_to_target < self.vessel.specs.loa * 2:
-            print(f"Waypoint '{self.waypoints[self.current_waypoint_index]['name']}' reached!")
+        if route.should_switch(current_pos, self.current_waypoint_index):
+            self.events.emit(EventType.WAYPOINT_REACHED, self.time, index=self.current_waypoint_index,
+                             label=route.names[self.current_waypoint_index])
             self.current_waypoint_index += 1
-            if self.current_waypoint_index >= len(self.waypoints):
-                print("All waypoints reached. Autopilot disengaging.")
+            if self.current_waypoint_index >= route.num_legs:
+                if self.autopilot_enabled:
+                    self.events.emit(EventType.AUTOPILOT_DISENGAGED, self.time, label='all waypoints reached')
                 self.autopilot_enabled = False
+                return
+
+        self.cross_track_error, self.along_track_distance = route.leg_errors(current_pos, self.current_waypoint_index)
+        self.distance_to_go = route.distance_to_go(current_pos, self.current_waypoint_index)
+
+    def set_autopilot(self, enabled: bool):
+        """Engages or disengages the autopilot, clearing the controller memory."""
+        if self.autopilot_enabled and not enabled:
+            self.events.emit(EventType.AUTOPILOT_DISENGAGED, self.time, label='manual')
+        self.autopilot_enabled = enabled
+        self.autopilot.reset()
+        if self.collision_avoidance is not None:
+            self.collision_avoidance.reset()
+
+    def active_leg(self):
+        """Returns (start, end) of the leg being followed, or None when no waypoint is active."""
+        if self.route is None or self.current_waypoint_index >= self.route.num_legs:
+            return None
+        return self.route.leg(self.current_waypoint_index)
+
+    def _apply_autopilot(self, dt: float, control: dict):
+        """Overrides the rudder demand in `control` to keep the vessel on the active leg."""
+        leg = self.active_leg()
+        if leg is None:
+            return
+        leg_start, leg_end = leg
+        eta = self.vessel.state.eta
+        rudder = self.autopilot.track_control(eta[None, :2], eta[5:6], leg_start[None, :], leg_end[None, :], dt)
+        control['rudder_angle'] = float(rudder[0])
 
     def check_collisions(self):
         if not self.show_obstacles: return
         vessel_pos = self.vessel.state.eta[:2]
-        for obs in self.geography.obstructions:
-            dist = np.linalg.norm(vessel_pos - obs.position)
-            if dist < (self.vessel.specs.loa / 2 + obs.radius):
+        geography = self.geography
+        if len(geography.obstacle_radii):
+            gaps = np.linalg.norm(geography.obstacle_positions - vessel_pos, axis=1) - geography.obstacle_radii
+            hit = int(np.argmin(gaps))
+            if gaps[hit] < self.vessel.specs.loa / 2:
                 self.collision_detected = True
-                print(f"COLLISION DETECTED with obstruction at {obs.position}!")
-                break
-    
+                self.events.emit(EventType.COLLISION, self.time, index=hit, x=vessel_pos[0], y=vessel_pos[1])
+                return
+        self._check_shore(vessel_pos)
+
+    def _check_shore(self, vessel_pos: np.ndarray):
+        """
+        Hull contact with structures and the coastline. The nearest-edge distance minus the hull's
+        half diagonal is a margin the vessel can move within without touching anything, so the BVH
+        is only queried again once it has left that circle, and tested exactly only when close.
+        """
+        if np.hypot(*(vessel_pos - self._shore_anchor)) < self._shore_margin:
+            return
+        geography, specs = self.geography, self.vessel.specs
+        if not len(geography.shore):
+            self._shore_anchor, self._shore_margin = vessel_pos.copy(), np.inf
+            return
+        reach = np.hypot(specs.loa, specs.beam) / 2.0
+        clearance = float(geography.distance_to_shore(vessel_pos[0], vessel_pos[1])) - reach
+        self._shore_anchor, self._shore_margin = vessel_pos.copy(), clearance
+        if clearance > 0:
+            return
+        owner = geography.hull_contact(vessel_pos, self.vessel.state.eta[5], specs.loa, specs.beam)
+        if owner is not None:
+            self.collision_detected = True
+            what = f"structure #{owner}" if owner >= 0 else "the shore"
+            self.events.emit(EventType.COLLISION, self.time, x=vessel_pos[0], y=vessel_pos[1], label=f"own ship and {what}")
+
+    def _check_grounding(self, depth: float):
+        """Called when the under-keel state changes: reports a grounding when the water gets shallower than the draft."""
+        self._grounded = not self._grounded
+        if self._grounded:
+            eta = self.vessel.state.eta
+            self.events.emit(EventType.GROUNDING, self.time, x=eta[0], y=eta[1], value=depth)
+
     def run(self, duration: float, dt: float, control: dict):
         """
         Runs the simulation for a given duration. (Mainly for non-GUI testing)
         """
         num_steps = int(duration / dt)
+        report_every = max(1, int(round(10 / dt)))
         for i in range(num_steps):
             self.step(dt, control)
-            if (i % (10 / dt) == 0):
-                print(f"Time: {self.time:.1f}s | "
-                      f"Position: ({self.vessel.state.eta[0]:.2f}, {self.vessel.state.eta[1]:.2f}) m | "
-                      f"Speed: {self.vessel.sog:.2f} knots | "
-                      f"Heading: {np.degrees(self.vessel.state.eta[5]):.2f}°")
+            if i % report_every == 0 and log.isEnabledFor(logging.INFO):
+                log.info(f"Time: {self.time:.1f}s | "
+                         f"Position: ({self.vessel.state.eta[0]:.2f}, {self.vessel.state.eta[1]:.2f}) m | "
+                         f"Speed: {self.vessel.sog:.2f} knots | "
+                         f"Heading: {np.degrees(self.vessel.state.eta[5]):.2f}°")
 
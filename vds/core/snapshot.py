@@ -0,0 +1,125 @@
+# vds/core/snapshot.py
+
+import struct
+from dataclasses import dataclass
+import numpy as np
+
+_MAGIC = b'VDSS'
+_VERSION = 2
+_HEADER = struct.Struct('<4sHHII')  # magic, version, autopilot size, value count, rng word count
+
+# Fixed part of the flat value array; the autopilot block follows it
+_TIME = 0
+_ETA = slice(1, 7)
+_NU = slice(7, 13)
+_WAYPOINT_INDEX = 13
+_COLLISION = 14
+_GROUNDED = 15
+_AUTOPILOT_ENABLED = 16
+_ROUTE_METRICS = slice(17, 20)  # cross-track, along-track, distance to go
+_CONTROL = slice(20, 22)        # rpm, rudder angle
+_FIXED_SIZE = 22
+
+_MASK64 = (1 << 64) - 1
+
+def _pcg64_to_words(state: dict) -> np.ndarray:
+    """Packs a PCG64 bit generator state into six uint64 words."""
+    s = state['state']
+    return np.array([s['state'] >> 64, s['state'] & _MASK64, s['inc'] >> 64, s['inc'] & _MASK64,
+                     state['has_uint32'], state['uinteger']], dtype=np.uint64)
+
+def _words_to_pcg64(words: np.ndarray) -> dict:
+    w = [int(x) for x in words]
+    return {'bit_generator': 'PCG64',
+            'state': {'state': (w[0] << 64) | w[1], 'inc': (w[2] << 64) | w[3]},
+            'has_uint32': w[4], 'uinteger': w[5]}
+
+@dataclass
+class SimulationSnapshot:
+    """
+    Complete, flat-array state of a `Simulator` at one instant.
+    시뮬레이터의 특정 시점 상태를 평탄한 배열로 저장한 스냅샷.
+
+    `values` holds time, vessel eta/nu, waypoint index, flags, route metrics,
+    control and the autopilot integrators; `rng_words` holds the packed state
+    of each environment random stream. Static data (geography, hydro
+    parameters, route geometry) is not copied, so snapshots are a few hundred
+    bytes and cheap to duplicate.
+    """
+    values: np.ndarray
+    rng_words: np.ndarray
+    autopilot_size: int
+
+    @property
+    def time(self) -> float:
+        return float(self.values[_TIME])
+
+    @property
+    def control(self) -> dict:
+        rpm, rudder = self.values[_CONTROL]
+        return {'rpm': float(rpm), 'rudder_angle': float(rudder)}
+
+    def copy(self) -> 'SimulationSnapshot':
+        return SimulationSnapshot(self.values.copy(), self.rng_words.copy(), self.autopilot_size)
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(_MAGIC, _VERSION, self.autopilot_size, len(self.values), len(self.rng_words))
+        return header + self.values.astype('<f8').tobytes() + self.rng_words.astype('<u8').tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'SimulationSnapshot':
+        magic, version, autopilot_size, n_values, n_words = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a simulation snapshot, or an unsupported snapshot version.")
+        offset = _HEADER.size
+        values = np.frombuffer(data, dtype='<f8', count=n_values, offset=offset).astype(float)
+        offset += 8 * n_values
+        rng_words = np.frombuffer(data, dtype='<u8', count=n_words, offset=offset).astype(np.uint64)
+        return cls(values, rng_words, autopilot_size)
+
+def capture(simulator, control: dict = None) -> SimulationSnapshot:
+    """Captures the dynamic state of `simulator` (and optionally the current control)."""
+    autopilot = simulator.autopilot
+    n = autopilot.n
+    values = np.empty(_FIXED_SIZE + 3 * n)
+    values[_TIME] = simulator.time
+    values[_ETA] = simulator.vessel.state.eta
+    values[_NU] = simulator.vessel.state.nu
+    values[_WAYPOINT_INDEX] = simulator.current_waypoint_index
+    values[_COLLISION] = simulator.collision_detected
+    values[_GROUNDED] = simulator._grounded
+    values[_AUTOPILOT_ENABLED] = simulator.autopilot_enabled
+    values[_ROUTE_METRICS] = (simulator.cross_track_error, simulator.along_track_distance, simulator.distance_to_go)
+    control = control or {}
+    values[_CONTROL] = (control.get('rpm', 0.0), control.get('rudder_angle', 0.0))
+    values[_FIXED_SIZE:_FIXED_SIZE + n] = autopilot._integral
+    values[_FIXED_SIZE + n:_FIXED_SIZE + 2 * n] = autopilot._previous_error
+    values[_FIXED_SIZE + 2 * n:] = autopilot._has_previous
+    rng_words = np.concatenate([_pcg64_to_words(rng.bit_generator.state) for rng in simulator.rng_streams()]) \
+        if simulator.rng_streams() else np.zeros(0, dtype=np.uint64)
+    return SimulationSnapshot(values, rng_words, n)
+
+def apply(simulator, snapshot: SimulationSnapshot):
+    """Restores `simulator` to the state recorded in `snapshot`."""
+    n = snapshot.autopilot_size
+    if n != simulator.autopilot.n:
+        raise ValueError(f"Snapshot has {n} autopilot channels but the simulator has {simulator.autopilot.n}.")
+    values = snapshot.values
+    simulator.time = float(values[_TIME])
+    simulator.vessel.state.eta = values[_ETA].copy()
+    simulator.vessel.state.nu = values[_NU].copy()
+    simulator.current_waypoint_index = int(values[_WAYPOINT_INDEX])
+    simulator.collision_detected = bool(values[_COLLISION])
+    simulator._grounded = bool(values[_GROUNDED])
+    simulator.autopilot_enabled = bool(values[_AUTOPILOT_ENABLED])
+    simulator.cross_track_error, simulator.along_track_distance, simulator.distance_to_go = (float(x) for x in values[_ROUTE_METRICS])
+    simulator.autopilot._integral = values[_FIXED_SIZE:_FIXED_SIZE + n].copy()
+    simulator.autopilot._previous_error = values[_FIXED_SIZE + n:_FIXED_SIZE + 2 * n].copy()
+    simulator.autopilot._has_previous = values[_FIXED_SIZE + 2 * n:].astype(bool)
+    streams = simulator.rng_streams()
+    if len(snapshot.rng_words) != 6 * len(streams):
+        raise ValueError(f"Snapshot has {len(snapshot.rng_words) // 6} random streams but the simulator has {len(streams)}.")
+    for i, rng in enumerate(streams):
+        rng.bit_generator.state = _words_to_pcg64(snapshot.rng_words[6 * i:6 * (i + 1)])
+    for target in simulator.ais_targets:
+        target.update(simulator.time)
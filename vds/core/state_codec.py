@@ -0,0 +1,135 @@
+# vds/core/state_codec.py
+
+import struct
+from dataclasses import dataclass
+import numpy as np
+
+KEYFRAME, DELTA = 0, 1
+_HEADER = struct.Struct('<IBH') # sequence number, frame kind, AIS target count
+
+# Fixed-point scale of every quantized value: time (ms), eta (mm, 1e-5 rad), nu (mm/s, 1e-5 rad/s),
+# rpm and rudder (1/100), waypoint index and flags; each AIS target adds x, y (cm) and course (1e-4 rad)
+_FIXED_SCALES = np.array([1e3, 1e3, 1e3, 1e3, 1e5, 1e5, 1e5, 1e3, 1e3, 1e3, 1e5, 1e5, 1e5, 1e2, 1e2, 1.0, 1.0])
+_TARGET_SCALES = np.array([1e2, 1e2, 1e4])
+_FIXED_SIZE = len(_FIXED_SCALES)
+FLAG_COLLISION, FLAG_AUTOPILOT, FLAG_AVOIDANCE, FLAG_PAUSED = 1, 2, 4, 8
+
+_SHIFTS = np.arange(0, 64, 7, dtype=np.uint64) # 7-bit groups of a 64-bit varint
+
+def encode_varints(values: np.ndarray) -> bytes:
+    """LEB128-encodes an array of signed integers (zigzag first) in one vectorized pass."""
+    if len(values) == 0:
+        return b''
+    values = np.asarray(values, dtype=np.int64)
+    zigzag = ((values << 1) ^ (values >> 63)).view(np.uint64)
+    shifted = zigzag[:, None] >> _SHIFTS
+    lengths = 1 + np.count_nonzero(shifted[:, 1:], axis=1)
+    column = np.arange(len(_SHIFTS))
+    groups = (shifted & np.uint64(0x7f)) | (column < (lengths - 1)[:, None]).astype(np.uint64) << np.uint64(7)
+    return groups[column < lengths[:, None]].astype(np.uint8).tobytes()
+
+def decode_varints(data: bytes, offset: int, count: int) -> tuple[np.ndarray, int]:
+    """Decodes `count` zigzag varints starting at `offset`. Returns the values and the offset after them."""
+    if count == 0:
+        return np.zeros(0, dtype=np.int64), offset
+    raw = np.frombuffer(data, dtype=np.uint8, offset=offset)
+    ends = np.flatnonzero(raw < 0x80)[:count]
+    if len(ends) < count:
+        raise ValueError("Truncated varint data.")
+    raw = raw[:ends[-1] + 1]
+    starts = np.r_[0, ends[:-1] + 1]
+    group = np.r_[0, np.cumsum(raw[:-1] < 0x80)]
+    position = (np.arange(len(raw)) - starts[group]).astype(np.uint64)
+    zigzag = np.add.reduceat((raw & 0x7f).astype(np.uint64) << (position * np.uint64(7)), starts)
+    values = (zigzag >> np.uint64(1)).view(np.int64) ^ -(zigzag & np.uint64(1)).view(np.int64)
+    return values, offset + len(raw)
+
+@dataclass
+class StateFrame:
+    """One decoded broadcast of the simulation state (values are rounded to the wire precision)."""
+    seq: int
+    time: float
+    eta: np.ndarray
+    nu: np.ndarray
+    rpm: float
+    rudder_angle: float
+    waypoint_index: int
+    flags: int
+    ais_mmsi: np.ndarray
+    ais_states: np.ndarray # (n, 3) x, y, course (rad)
+
+    @property
+    def collision(self) -> bool:
+        return bool(self.flags & FLAG_COLLISION)
+
+    @property
+    def autopilot(self) -> bool:
+        return bool(self.flags & FLAG_AUTOPILOT)
+
+def quantize(simulator, control: dict) -> tuple[np.ndarray, np.ndarray]:
+    """Fixed-point value vector and AIS MMSIs of the current simulator state."""
+    state = simulator.vessel.state
+    flags = (FLAG_COLLISION * simulator.collision_detected | FLAG_AUTOPILOT * simulator.autopilot_enabled
+             | FLAG_AVOIDANCE * simulator.avoidance_enabled | FLAG_PAUSED * simulator.is_paused)
+    fixed = np.concatenate([[simulator.time], state.eta, state.nu,
+                            [control['rpm'], control['rudder_angle'], simulator.current_waypoint_index, flags]])
+    targets = simulator.ais_targets
+    ais = np.array([(t.state.x, t.state.y, t.state.cog_rad) for t in targets], dtype=float).reshape(-1, 3)
+    values = np.concatenate([fixed * _FIXED_SCALES, (ais * _TARGET_SCALES).ravel()])
+    return np.round(values).astype(np.int64), np.array([t.mmsi for t in targets], dtype=np.int64)
+
+class StateEncoder:
+    """
+    Encodes successive quantized states as keyframes or deltas against the previous state.
+    연속된 상태를 키프레임 또는 이전 상태 대비 델타로 부호화합니다.
+
+    A keyframe carries the AIS MMSIs and every value as a varint. A delta carries a bitmask of
+    the values that changed and the varint differences of only those, so a vessel holding
+    course costs a few bytes per frame. Deltas are exact (integer arithmetic on fixed-point
+    values), so a client applying every delta never drifts from the server. A delta is only
+    possible when the set of AIS targets is unchanged.
+    """
+    def __init__(self):
+        self.seq = 0
+        self._values: np.ndarray = None
+        self._mmsi: np.ndarray = None
+
+    def encode(self, values: np.ndarray, mmsi: np.ndarray) -> tuple[bytes, bytes]:
+        """Advances to the next frame. Returns (keyframe, delta); delta is None if the target set changed."""
+        self.seq += 1
+        keyframe = _HEADER.pack(self.seq, KEYFRAME, len(mmsi)) + encode_varints(mmsi) + encode_varints(values)
+        delta = None
+        if self._values is not None and np.array_equal(mmsi, self._mmsi):
+            change = values - self._values
+            changed = change != 0
+            delta = _HEADER.pack(self.seq, DELTA, len(mmsi)) + np.packbits(changed).tobytes() + encode_varints(change[changed])
+        self._values, self._mmsi = values, mmsi
+        return keyframe, delta
+
+class StateDecoder:
+    """Rebuilds `StateFrame`s from keyframes and deltas; a delta must follow the frame it was made against."""
+    def __init__(self):
+        self.seq = None
+        self._values: np.ndarray = None
+        self._mmsi: np.ndarray = None
+
+    def decode(self, payload: bytes) -> StateFrame:
+        seq, kind, n_targets = _HEADER.unpack_from(payload)
+        offset = _HEADER.size
+        n_values = _FIXED_SIZE + 3 * n_targets
+        if kind == KEYFRAME:
+            self._mmsi, offset = decode_varints(payload, offset, n_targets)
+            self._values, offset = decode_varints(payload, offset, n_values)
+        else:
+            if self.seq is None or seq != self.seq + 1 or len(self._mmsi) != n_targets:
+                raise ValueError(f"Delta frame {seq} does not follow frame {self.seq}.")
+            mask_bytes = (n_values + 7) // 8
+            changed = np.unpackbits(np.frombuffer(payload, dtype=np.uint8, count=mask_bytes, offset=offset))[:n_values].astype(bool)
+            change, offset = decode_varints(payload, offset + mask_bytes, int(changed.sum()))
+            self._values = self._values.copy()
+            self._values[changed] += change
+        self.seq = seq
+        fixed = self._values[:_FIXED_SIZE] / _FIXED_SCALES
+        return StateFrame(seq=seq, time=float(fixed[0]), eta=fixed[1:7], nu=fixed[7:13], rpm=float(fixed[13]),
+                          rudder_angle=float(fixed[14]), waypoint_index=int(fixed[15]), flags=int(fixed[16]),
+                          ais_mmsi=self._mmsi, ais_states=self._values[_FIXED_SIZE:].reshape(-1, 3) / _TARGET_SCALES)
@@ -0,0 +1,87 @@
+# vds/core/track_history.py
+
+import numpy as np
+
+class TrackHistory:
+    """
+    Fixed-capacity ring buffer of past (x, y) positions.
+    과거 (x, y) 위치를 저장하는 고정 용량 링 버퍼.
+
+    Points live in one preallocated (maxlen, 2) array, so `append` is O(1) and never
+    allocates. Every point has an absolute index (0 for the first point after a
+    clear); `first` and `total` bound the indices still held, and `generation`
+    changes on `clear`, so consumers can cache work on older points.
+    """
+    def __init__(self, maxlen: int = 10000):
+        self.maxlen = maxlen
+        self._buffer = np.zeros((maxlen, 2))
+        self.total = 0
+        self.generation = 0
+
+    def append(self, point):
+        self._buffer[self.total % self.maxlen] = point[0], point[1]
+        self.total += 1
+
+    def extend(self, points: np.ndarray):
+        """Appends (n, 2+) points in order; only the last `maxlen` are kept."""
+        points = np.asarray(points)
+        count = len(points)
+        points = points[-self.maxlen:, :2]
+        slots = (self.total + count - len(points) + np.arange(len(points))) % self.maxlen
+        self._buffer[slots] = points
+        self.total += count
+
+    def clear(self):
+        self.total = 0
+        self.generation += 1
+
+    def __len__(self) -> int:
+        return min(self.total, self.maxlen)
+
+    @property
+    def first(self) -> int:
+        """Absolute index of the oldest point held."""
+        return self.total - len(self)
+
+    def points(self, start: int = 0) -> np.ndarray:
+        """Points with absolute index >= `start`, oldest first, shape (n, 2). A view unless the range wraps."""
+        start = max(start, self.first)
+        if start >= self.total:
+            return self._buffer[:0]
+        begin, end = start % self.maxlen, (self.total - 1) % self.maxlen + 1
+        if begin < end:
+            return self._buffer[begin:end]
+        return np.concatenate([self._buffer[begin:], self._buffer[:end]])
+
+    def __iter__(self):
+        return iter(self.points())
+
+def simplify_polyline(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Douglas-Peucker simplification: indices of the points kept so that no dropped point is
+    farther than `tolerance` from the simplified line. The endpoints are always kept.
+    """
+    n = len(points)
+    if n < 3:
+        return np.arange(n)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        start, chord = points[i], points[j] - points[i]
+        offsets = points[i + 1:j] - start
+        length = np.hypot(chord[0], chord[1])
+        if length > 0:
+            distances = np.abs(chord[0] * offsets[:, 1] - chord[1] * offsets[:, 0]) / length
+        else:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        k = int(np.argmax(distances))
+        if distances[k] > tolerance:
+            k += i + 1
+            keep[k] = True
+            stack.append((i, k))
+            stack.append((k, j))
+    return np.flatnonzero(keep)
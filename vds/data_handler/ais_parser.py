@@ -1,10 +1,11 @@
 # vds/data_handler/ais_parser.py
 
-import pandas as pd
+import logging
 import numpy as np
-from scipy.interpolate import interp1d
 from dataclasses import dataclass
 
+log = logging.getLogger(__name__)
+
 @dataclass
 class AISTargetState:
     """Holds the state of an AIS target at a specific time."""
@@ -12,20 +13,50 @@ class AISTargetState:
     y: float = 0.0
     cog_rad: float = 0.0
 
+def _linear_track(t: np.ndarray, v: np.ndarray):
+    """Piecewise-linear interpolant of a time-sorted track column, extrapolated linearly past both ends."""
+    slope_start = float((v[1] - v[0]) / (t[1] - t[0]))
+    slope_end = float((v[-1] - v[-2]) / (t[-1] - t[-2]))
+    t_first, t_last, v_first, v_last = float(t[0]), float(t[-1]), float(v[0]), float(v[-1])
+
+    def interpolate(time):
+        if isinstance(time, (int, float)):
+            # Scalar fast path for the per-step update
+            time = float(time)
+            if time < t_first:
+                return v_first + slope_start * (time - t_first)
+            if time > t_last:
+                return v_last + slope_end * (time - t_last)
+            return float(np.interp(time, t, v))
+        time = np.asarray(time, dtype=float)
+        result = np.interp(time, t, v)
+        result = np.where(time < t[0], v[0] + slope_start * (time - t[0]), result)
+        return np.where(time > t[-1], v[-1] + slope_end * (time - t[-1]), result)
+    return interpolate
+
 class AISTarget:
-    """Represents a single AIS target that moves along a pre-defined track."""
-    def __init__(self, mmsi: int, track_data: pd.DataFrame):
+    """
+    Represents a single AIS target that moves along a pre-defined track.
+    `track_data` is a DataFrame, or any mapping of column arrays, with timestamp, x, y and cog_deg columns.
+    """
+    def __init__(self, mmsi: int, track_data):
         self.mmsi = mmsi
         self.state = AISTargetState()
 
+        # Track points in time order
+        timestamps = np.asarray(track_data['timestamp'], dtype=float)
+        order = np.argsort(timestamps, kind='stable')
+        self.track_times = timestamps[order]
+        self.track_positions = np.column_stack([np.asarray(track_data['x'], dtype=float)[order],
+                                                np.asarray(track_data['y'], dtype=float)[order]])
+
         # Create interpolation functions for the track
-        timestamps = track_data['timestamp'].values
-        self._interp_x = interp1d(timestamps, track_data['x'].values, bounds_error=False, fill_value="extrapolate")
-        self._interp_y = interp1d(timestamps, track_data['y'].values, bounds_error=False, fill_value="extrapolate")
+        self._interp_x = _linear_track(self.track_times, self.track_positions[:, 0])
+        self._interp_y = _linear_track(self.track_times, self.track_positions[:, 1])
         
         # Convert CoG to radians for consistency
-        cog_rad = np.radians(track_data['cog_deg'].values)
-        self._interp_cog = interp1d(timestamps, cog_rad, bounds_error=False, fill_value="extrapolate")
+        cog_rad = np.radians(np.asarray(track_data['cog_deg'], dtype=float)[order])
+        self._interp_cog = _linear_track(self.track_times, cog_rad)
         
         # Initialize state to time 0
         self.update(0)
@@ -36,19 +67,36 @@ class AISTarget:
         self.state.y = self._interp_y(time)
         self.state.cog_rad = self._interp_cog(time)
 
+    def positions_at(self, times: np.ndarray) -> np.ndarray:
+        """Forecast (x, y) positions at an array of simulation times, shape (len(times), 2)."""
+        return np.stack([self._interp_x(times), self._interp_y(times)], axis=-1)
+
+def targets_from_table(table) -> list[AISTarget]:
+    """
+    Builds one AISTarget per MMSI from a table with timestamp, mmsi, x, y and cog_deg columns.
+    `table` is a DataFrame or a dict of column arrays; targets come out in MMSI order.
+    """
+    columns = {name: np.asarray(table[name]) for name in ('timestamp', 'mmsi', 'x', 'y', 'cog_deg')}
+    # One stable sort groups the rows by MMSI and keeps each track's original row order
+    order = np.argsort(columns['mmsi'], kind='stable')
+    columns = {name: values[order] for name, values in columns.items()}
+    mmsis, starts = np.unique(columns['mmsi'], return_index=True)
+    ends = np.append(starts[1:], len(order))
+    targets = []
+    for mmsi, start, end in zip(mmsis, starts, ends):
+        # Ensure the track has at least 2 points for interpolation
+        if end - start > 1:
+            target = AISTarget(mmsi.item(), {name: values[start:end] for name, values in columns.items()})
+            targets.append(target)
+    log.info("Loaded %d AIS targets.", len(targets))
+    return targets
+
 def load_ais_targets(file_path: str) -> list[AISTarget]:
     """Loads all AIS tracks from a CSV file and returns a list of AISTarget objects."""
+    import pandas as pd
     try:
         df = pd.read_csv(file_path)
     except FileNotFoundError:
-        print(f"Warning: AIS data file not found at {file_path}")
+        log.warning("AIS data file not found at %s", file_path)
         return []
-        
-    targets = []
-    for mmsi, group in df.groupby('mmsi'):
-        # Ensure the track has at least 2 points for interpolation
-        if len(group) > 1:
-            target = AISTarget(mmsi, group)
-            targets.append(target)
-    print(f"Loaded {len(targets)} AIS targets.")
-    return targets
+    return targets_from_table(df)
@@ -0,0 +1,99 @@
+# vds/data_handler/aivdm.py
+
+import numpy as np
+
+POSITION_REPORT_TYPES = (1, 2, 3, 18) # Class A (1-3) and class B (18) position reports
+_PAYLOAD_CHARS = 28 # 168 bits, the length of every position report
+_BITS = _PAYLOAD_CHARS * 6
+
+# (start bit, length, signed) of the fields used, per layout
+_CLASS_A = {'mmsi': (8, 30, False), 'sog': (50, 10, False), 'lon': (61, 28, True), 'lat': (89, 27, True),
+            'cog': (116, 12, False), 'heading': (128, 9, False)}
+_CLASS_B = {'mmsi': (8, 30, False), 'sog': (46, 10, False), 'lon': (57, 28, True), 'lat': (85, 27, True),
+            'cog': (112, 12, False), 'heading': (124, 9, False)}
+
+def _checksum(body: str) -> int:
+    value = 0
+    for byte in body.encode('ascii'):
+        value ^= byte
+    return value
+
+def _fields(bits: np.ndarray, layout: dict) -> dict[str, np.ndarray]:
+    values = {}
+    for name, (start, length, signed) in layout.items():
+        weights = np.int64(1) << np.arange(length - 1, -1, -1, dtype=np.int64)
+        value = bits[:, start:start + length].astype(np.int64) @ weights
+        if signed:
+            value = np.where(value >= 1 << (length - 1), value - (1 << length), value)
+        values[name] = value
+    return values
+
+def decode_position_reports(sentences: list[str]) -> dict[str, np.ndarray]:
+    """
+    Decodes a batch of `!AIVDM`/`!AIVDO` sentences in one vectorized pass.
+    AIVDM 위치 보고 문장 묶음을 한 번에 벡터화하여 해독합니다.
+
+    Only single-fragment position reports (types 1, 2, 3 and 18) with a valid checksum
+    are kept; anything else is skipped. Returns arrays of equal length: `mmsi`, `type`,
+    `lat`/`lon` (deg), `sog_kts`, `cog_deg` (NaN if not available) and `heading_deg`
+    (NaN if not available). Reports without a position are dropped.
+    """
+    payloads = []
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if not sentence.startswith(('!AIVDM', '!AIVDO')) or '*' not in sentence:
+            continue
+        body, _, checksum = sentence[1:].partition('*')
+        parts = body.split(',')
+        if len(parts) != 7 or parts[1] != '1' or len(parts[5]) != _PAYLOAD_CHARS:
+            continue
+        try:
+            if int(checksum[:2], 16) != _checksum(body):
+                continue
+        except ValueError:
+            continue
+        payloads.append(parts[5])
+    empty = {name: np.zeros(0) for name in ('lat', 'lon', 'sog_kts', 'cog_deg', 'heading_deg')}
+    if not payloads:
+        return {'mmsi': np.zeros(0, dtype=np.int64), 'type': np.zeros(0, dtype=np.int64), **empty}
+
+    # Six-bit armouring: '0'-'W' are 0-39, '`'-'w' are 40-63
+    chars = np.frombuffer(''.join(payloads).encode('ascii'), dtype=np.uint8).reshape(-1, _PAYLOAD_CHARS)
+    values = chars.astype(np.int16) - 48
+    values = np.where(values > 40, values - 8, values).astype(np.uint8)
+    bits = ((values[:, :, None] >> np.arange(5, -1, -1, dtype=np.uint8)) & 1).reshape(-1, _BITS)
+
+    kind = _fields(bits, {'type': (0, 6, False)})['type']
+    class_a, class_b = _fields(bits, _CLASS_A), _fields(bits, _CLASS_B)
+    is_b = kind == 18
+    decoded = {name: np.where(is_b, class_b[name], class_a[name]) for name in _CLASS_A}
+    lon, lat = decoded['lon'] / 600000.0, decoded['lat'] / 600000.0
+    keep = np.isin(kind, POSITION_REPORT_TYPES) & (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
+    return {
+        'mmsi': decoded['mmsi'][keep], 'type': kind[keep], 'lat': lat[keep], 'lon': lon[keep],
+        'sog_kts': np.where(decoded['sog'] == 1023, np.nan, decoded['sog'] / 10.0)[keep],
+        'cog_deg': np.where(decoded['cog'] >= 3600, np.nan, decoded['cog'] / 10.0)[keep],
+        'heading_deg': np.where(decoded['heading'] >= 360, np.nan, decoded['heading'].astype(float))[keep],
+    }
+
+def encode_position_report(mmsi: int, lat: float, lon: float, sog_kts: float, cog_deg: float,
+                           heading_deg: float = None, msg_type: int = 1, channel: str = 'A') -> str:
+    """Encodes one position report as an `!AIVDM` sentence (used by the replay server and tests)."""
+    layout = _CLASS_B if msg_type == 18 else _CLASS_A
+    values = {'mmsi': mmsi, 'sog': min(int(round(sog_kts * 10)), 1022), 'lon': int(round(lon * 600000)),
+              'lat': int(round(lat * 600000)), 'cog': int(round(cog_deg * 10)) % 3600,
+              'heading': 511 if heading_deg is None else int(round(heading_deg)) % 360}
+    bits = [0] * _BITS
+    def put(start, length, value):
+        value &= (1 << length) - 1
+        for k in range(length):
+            bits[start + k] = (value >> (length - 1 - k)) & 1
+    put(0, 6, msg_type)
+    for name, (start, length, _) in layout.items():
+        put(start, length, values[name])
+    payload = ''
+    for k in range(0, _BITS, 6):
+        value = int(''.join(map(str, bits[k:k + 6])), 2)
+        payload += chr(value + 48 if value < 40 else value + 56)
+    body = f"AIVDM,1,1,,{channel},{payload},0"
+    return f"!{body}*{_checksum(body):02X}"
@@ -0,0 +1,308 @@
+# vds/data_handler/live_ais.py
+
+import asyncio
+import threading
+from collections import deque
+import numpy as np
+from .aivdm import decode_position_reports, encode_position_report
+from .ais_parser import AISTarget, AISTargetState
+
+EARTH_RADIUS_M = 6371008.8
+KNOTS_TO_MS = 0.514444
+
+class LocalFrame:
+    """Equirectangular projection around an origin: x metres north, y metres east (NED, like the simulator)."""
+    def __init__(self, lat0: float, lon0: float):
+        self.lat0, self.lon0 = lat0, lon0
+        self._metres_per_deg_lat = np.radians(1.0) * EARTH_RADIUS_M
+        self._metres_per_deg_lon = self._metres_per_deg_lat * np.cos(np.radians(lat0))
+
+    def to_local(self, lat, lon) -> tuple[np.ndarray, np.ndarray]:
+        return (np.asarray(lat) - self.lat0) * self._metres_per_deg_lat, \
+            (np.asarray(lon) - self.lon0) * self._metres_per_deg_lon
+
+    def to_geodetic(self, x, y) -> tuple[np.ndarray, np.ndarray]:
+        return self.lat0 + np.asarray(x) / self._metres_per_deg_lat, self.lon0 + np.asarray(y) / self._metres_per_deg_lon
+
+class LiveTargetTable:
+    """
+    Fixed-size table of live AIS targets with a ring buffer of recent fixes per target.
+    대상별 최근 위치 링 버퍼를 가진 고정 크기 실시간 AIS 대상 테이블.
+
+    Memory is bounded by `max_targets` x `history` fixes. A target is dropped when it has
+    not reported for `ttl` seconds, or (least recently heard first) when a new MMSI
+    arrives while the table is full. States are dead-reckoned from the latest fix.
+    """
+    def __init__(self, max_targets: int = 1024, history: int = 32, ttl: float = 360.0):
+        self.max_targets, self.history, self.ttl = max_targets, history, ttl
+        self.mmsi = np.zeros(max_targets, dtype=np.int64)
+        self.active = np.zeros(max_targets, dtype=bool)
+        self.fixes = np.zeros(max_targets, dtype=np.int64) # Fixes received per slot
+        self.times = np.zeros((max_targets, history))
+        self.positions = np.zeros((max_targets, history, 2))
+        self.last_time = np.zeros(max_targets)
+        self.last_position = np.zeros((max_targets, 2))
+        self.velocity = np.zeros((max_targets, 2)) # North/east speed (m/s) from the latest SOG/COG
+        self.cog_rad = np.zeros(max_targets)
+        self.slots: dict[int, int] = {}
+        self.version = 0 # Changes whenever targets are added or dropped
+
+    def ingest(self, now: float, mmsi: np.ndarray, x: np.ndarray, y: np.ndarray, sog_kts: np.ndarray, cog_deg: np.ndarray):
+        """Appends a batch of fixes (in arrival order) received at time `now`."""
+        if len(mmsi) == 0:
+            return
+        slot = np.array([self._slot(int(m), now) for m in mmsi.tolist()], dtype=np.int64)
+        # Rank of every fix among the fixes of its slot in this batch, to place it in the ring
+        order = np.argsort(slot, kind='stable')
+        sorted_slots = slot[order]
+        group_start = np.flatnonzero(np.r_[True, sorted_slots[1:] != sorted_slots[:-1]])
+        group_size = np.diff(np.r_[group_start, len(slot)])
+        rank = np.empty(len(slot), dtype=np.int64)
+        rank[order] = np.arange(len(slot)) - np.repeat(group_start, group_size)
+        ring = (self.fixes[slot] + rank) % self.history
+        self.times[slot, ring] = now
+        self.positions[slot, ring, 0], self.positions[slot, ring, 1] = x, y
+        np.add.at(self.fixes, slot, 1)
+
+        # Latest fix per slot: the last one in arrival order
+        last = order[np.r_[group_start[1:] - 1, len(slot) - 1]]
+        slots = slot[last]
+        self.last_time[slots] = now
+        self.last_position[slots, 0], self.last_position[slots, 1] = x[last], y[last]
+        sog = np.nan_to_num(sog_kts[last]) * KNOTS_TO_MS
+        cog = np.radians(np.nan_to_num(cog_deg[last]))
+        self.velocity[slots, 0], self.velocity[slots, 1] = sog * np.cos(cog), sog * np.sin(cog)
+        self.cog_rad[slots] = cog
+
+    def _slot(self, mmsi: int, now: float) -> int:
+        slot = self.slots.get(mmsi)
+        if slot is not None:
+            return slot
+        free = np.flatnonzero(~self.active)
+        if len(free):
+            slot = int(free[0])
+        else:
+            slot = int(np.argmin(self.last_time))
+            del self.slots[int(self.mmsi[slot])]
+        self.slots[mmsi] = slot
+        self.mmsi[slot], self.active[slot], self.fixes[slot] = mmsi, True, 0
+        self.last_time[slot] = now
+        self.version += 1
+        return slot
+
+    def expire(self, now: float) -> int:
+        """Drops targets silent for more than `ttl` seconds. Returns how many were dropped."""
+        stale = np.flatnonzero(self.active & (now - self.last_time > self.ttl))
+        for slot in stale.tolist():
+            del self.slots[int(self.mmsi[slot])]
+        self.active[stale] = False
+        if len(stale):
+            self.version += 1
+        return len(stale)
+
+    def active_slots(self) -> np.ndarray:
+        return np.flatnonzero(self.active)
+
+    def states_at(self, t: float, slots: np.ndarray = None) -> np.ndarray:
+        """(n, 3) dead-reckoned x, y and course (rad) of the given (default: all active) slots at time `t`."""
+        slots = self.active_slots() if slots is None else slots
+        elapsed = (t - self.last_time[slots])[:, None]
+        positions = self.last_position[slots] + self.velocity[slots] * elapsed
+        return np.column_stack([positions, self.cog_rad[slots]])
+
+    def track(self, slot: int) -> tuple[np.ndarray, np.ndarray]:
+        """Buffered fix times and (x, y) positions of one slot, oldest first."""
+        n = min(int(self.fixes[slot]), self.history)
+        order = (self.fixes[slot] - n + np.arange(n)) % self.history
+        return self.times[slot, order], self.positions[slot, order]
+
+class LiveAISTarget:
+    """A live target with the `AISTarget` interface (`mmsi`, `state`, `update`, `positions_at`)."""
+    def __init__(self, table: LiveTargetTable, slot: int):
+        self.table, self.slot = table, slot
+        self.mmsi = int(table.mmsi[slot])
+        self.state = AISTargetState()
+
+    def update(self, time: float):
+        table, slot = self.table, self.slot
+        elapsed = time - table.last_time[slot]
+        self.state.x = float(table.last_position[slot, 0] + table.velocity[slot, 0] * elapsed)
+        self.state.y = float(table.last_position[slot, 1] + table.velocity[slot, 1] * elapsed)
+        self.state.cog_rad = float(table.cog_rad[slot])
+
+    def positions_at(self, times: np.ndarray) -> np.ndarray:
+        elapsed = np.asarray(times, dtype=float) - self.table.last_time[self.slot]
+        return self.table.last_position[self.slot] + elapsed[..., None] * self.table.velocity[self.slot]
+
+    def frozen(self, time: float) -> 'FrozenAISTarget':
+        """A copy of this target's dead-reckoned state at `time` that later reports do not change."""
+        x, y, cog_rad = self.table.states_at(time, np.array([self.slot]))[0]
+        return FrozenAISTarget(self.mmsi, time, np.array([x, y]), self.table.velocity[self.slot].copy(), cog_rad)
+
+class FrozenAISTarget:
+    """A live target detached from its table, dead-reckoned from one fix (used by simulator forks)."""
+    def __init__(self, mmsi: int, time: float, position: np.ndarray, velocity: np.ndarray, cog_rad: float):
+        self.mmsi = mmsi
+        self.time, self.position, self.velocity, self.cog_rad = time, position, velocity, float(cog_rad)
+        self.state = AISTargetState()
+        self.update(time)
+
+    def update(self, time: float):
+        elapsed = time - self.time
+        self.state.x = float(self.position[0] + self.velocity[0] * elapsed)
+        self.state.y = float(self.position[1] + self.velocity[1] * elapsed)
+        self.state.cog_rad = self.cog_rad
+
+    def positions_at(self, times: np.ndarray) -> np.ndarray:
+        elapsed = np.asarray(times, dtype=float) - self.time
+        return self.position + elapsed[..., None] * self.velocity
+
+class LiveAISFeed:
+    """
+    Ingests live AIVDM sentences on a background asyncio thread.
+    백그라운드 asyncio 스레드에서 실시간 AIVDM 문장을 수신합니다.
+
+    With `protocol='udp'` the feed listens on (host, port); with 'tcp' it connects to a
+    server there and reads lines. Sentences are decoded in batches every `batch_interval`
+    seconds on the network thread; decoded batches wait in a bounded queue until the
+    physics loop calls `poll(now)`, which applies them to the target table without
+    blocking. Fixes are timestamped with the `now` of the poll that applies them.
+    """
+    def __init__(self, frame: LocalFrame, host: str = '127.0.0.1', port: int = 10110, protocol: str = 'udp',
+                 max_targets: int = 1024, history: int = 32, ttl: float = 360.0, batch_interval: float = 0.05,
+                 max_pending_batches: int = 256):
+        if protocol not in ('udp', 'tcp'):
+            raise ValueError(f"Unknown protocol '{protocol}'; use 'udp' or 'tcp'.")
+        self.frame, self.host, self.port, self.protocol = frame, host, port, protocol
+        self.table = LiveTargetTable(max_targets, history, ttl)
+        self.batch_interval = batch_interval
+        self.targets: list[LiveAISTarget] = []
+        self.sentences_received = 0
+        self._pending = deque(maxlen=max_pending_batches) # Oldest batches are dropped if the physics loop stalls
+        self._lines: list[str] = []
+        self._targets_version = -1
+        self._thread = None
+        self._loop = None
+        self._stop = None
+        self._ready = threading.Event()
+        self.error: Exception = None
+
+    def start(self) -> 'LiveAISFeed':
+        self._thread = threading.Thread(target=self._thread_main, daemon=True)
+        self._thread.start()
+        self._ready.wait(5.0)
+        if self.error is not None:
+            raise self.error
+        return self
+
+    def stop(self):
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+
+    def poll(self, now: float) -> list[LiveAISTarget]:
+        """Applies the batches decoded since the last poll, expires stale targets and returns the live targets."""
+        while self._pending:
+            reports = self._pending.popleft()
+            x, y = self.frame.to_local(reports['lat'], reports['lon'])
+            self.table.ingest(now, reports['mmsi'], x, y, reports['sog_kts'], reports['cog_deg'])
+        self.table.expire(now)
+        if self.table.version != self._targets_version:
+            self.targets = [LiveAISTarget(self.table, slot) for slot in self.table.active_slots().tolist()]
+            self._targets_version = self.table.version
+        return self.targets
+
+    def _thread_main(self):
+        try:
+            asyncio.run(self._run())
+        except Exception as error: # Reported to `start` if it happens during setup
+            self.error = error
+            self._ready.set()
+
+    async def _run(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        if self.protocol == 'udp':
+            transport, _ = await self._loop.create_datagram_endpoint(
+                lambda: _DatagramLines(self._lines), local_addr=(self.host, self.port))
+            closers = [transport.close]
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            reading = asyncio.ensure_future(self._read_lines(reader))
+            closers = [reading.cancel, writer.close]
+        self._ready.set()
+        try:
+            while not self._stop.is_set():
+                try:
+                    await asyncio.wait_for(self._stop.wait(), self.batch_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._decode_pending()
+        finally:
+            for close in closers:
+                close()
+
+    async def _read_lines(self, reader: asyncio.StreamReader):
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            self._lines.append(line.decode('ascii', errors='replace'))
+
+    def _decode_pending(self):
+        lines, self._lines[:] = list(self._lines), []
+        if not lines:
+            return
+        self.sentences_received += len(lines)
+        reports = decode_position_reports(lines)
+        if len(reports['mmsi']):
+            self._pending.append(reports)
+
+class _DatagramLines(asyncio.DatagramProtocol):
+    def __init__(self, lines: list[str]):
+        self.lines = lines
+
+    def datagram_received(self, data: bytes, addr):
+        self.lines.extend(data.decode('ascii', errors='replace').splitlines())
+
+def replay_sentences(targets: list[AISTarget], frame: LocalFrame, times: np.ndarray):
+    """Yields (time, sentences) with one position report per target at each time, from recorded tracks."""
+    for t in np.asarray(times, dtype=float).tolist():
+        sentences = []
+        for target in targets:
+            target.update(t)
+            (x, y), (dx, dy) = target.positions_at(np.array([t, t + 1.0]))
+            lat, lon = frame.to_geodetic(target.state.x, target.state.y)
+            speed_kts = np.hypot(dx - x, dy - y) / KNOTS_TO_MS
+            cog_deg = np.degrees(np.arctan2(dy - y, dx - x)) % 360.0
+            sentences.append(encode_position_report(int(target.mmsi), float(lat), float(lon), speed_kts, cog_deg))
+        yield t, sentences
+
+async def serve_replay(schedule, host: str = '127.0.0.1', port: int = 10110, protocol: str = 'udp',
+                       speedup: float = 1.0):
+    """
+    Local AIS replay server: sends the (time, sentences) pairs of `schedule` (e.g. `replay_sentences`)
+    in real time divided by `speedup`. UDP sends datagrams to (host, port); TCP listens there and
+    streams the sentences to every connected client.
+    """
+    loop = asyncio.get_running_loop()
+    clients: list[asyncio.StreamWriter] = []
+    if protocol == 'udp':
+        transport, _ = await loop.create_datagram_endpoint(asyncio.DatagramProtocol, remote_addr=(host, port))
+        send = lambda payload: transport.sendto(payload)
+        close = transport.close
+    else:
+        server = await asyncio.start_server(lambda reader, writer: clients.append(writer), host, port)
+        send = lambda payload: [client.write(payload) for client in clients]
+        close = server.close
+    try:
+        start, first = loop.time(), None
+        for t, sentences in schedule:
+            first = t if first is None else first
+            await asyncio.sleep(max(0.0, start + (t - first) / speedup - loop.time()))
+            send(''.join(f"{sentence}\r\n" for sentence in sentences).encode('ascii'))
+            for client in clients:
+                await client.drain()
+    finally:
+        close()
@@ -0,0 +1,142 @@
+# vds/data_handler/run_log.py
+
+import json
+import os
+import numpy as np
+
+RUN_LOG_VERSION = 1
+_META = 'meta.json'
+
+# Per-step state needed to replay a run; `elapsed` is the time index (never decreases, even across resets)
+REPLAY_COLUMNS = {
+    'elapsed': 'f8', 'time': 'f8',
+    **{f"eta_{k}": 'f8' for k in range(6)},
+    **{f"nu_{k}": 'f8' for k in range(6)},
+    'rpm': 'f8', 'rudder_angle': 'f8',
+    'waypoint_index': 'i4', 'cross_track_m': 'f8', 'distance_to_go_m': 'f8',
+    'autopilot': 'u1', 'avoidance': 'u1', 'collision': 'u1',
+}
+
+class RunLogWriter:
+    """
+    Appends rows to a chunked, column-per-file run log directory.
+    청크 단위로 열별 파일에 기록하는 실행 로그 작성기.
+
+    Rows are buffered in preallocated arrays and appended to `<column>.bin` one chunk at a
+    time. `meta.json` (columns, row count, first row and index time of every chunk) is
+    rewritten atomically after each chunk, so a log is readable while it is being written
+    and a crash loses at most the open chunk. The first column is the time index and must
+    never decrease.
+    """
+    def __init__(self, path: str, columns: dict[str, str] = None, chunk_rows: int = 4096, attributes: dict = None):
+        self.path = path
+        self.columns = dict(columns or REPLAY_COLUMNS)
+        self.index_column = next(iter(self.columns))
+        self.chunk_rows = chunk_rows
+        self.attributes = attributes or {}
+        self.rows = 0
+        self.chunk_starts = [] # First row and first index time of every chunk
+        self.chunk_times = []
+        self._buffer = {name: np.zeros(chunk_rows, dtype=dtype) for name, dtype in self.columns.items()}
+        self._buffered = 0
+        os.makedirs(path, exist_ok=True)
+        for name in self.columns:
+            open(os.path.join(path, f"{name}.bin"), 'wb').close()
+        self._write_meta()
+
+    def append(self, row: dict):
+        """Buffers one row; missing columns are written as zero."""
+        slot = self._buffered
+        for name, value in row.items():
+            self._buffer[name][slot] = value
+        self._buffered += 1
+        if self._buffered == self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered rows as one chunk."""
+        n = self._buffered
+        if n == 0:
+            return
+        self.chunk_starts.append(self.rows)
+        self.chunk_times.append(float(self._buffer[self.index_column][0]))
+        for name, values in self._buffer.items():
+            with open(os.path.join(self.path, f"{name}.bin"), 'ab') as f:
+                f.write(values[:n].tobytes())
+            values[:n] = 0
+        self.rows += n
+        self._buffered = 0
+        self._write_meta()
+
+    def close(self):
+        self.flush()
+
+    def _write_meta(self):
+        meta = {'version': RUN_LOG_VERSION, 'columns': self.columns, 'rows': self.rows,
+                'chunk_starts': self.chunk_starts, 'chunk_times': self.chunk_times, 'attributes': self.attributes}
+        tmp = os.path.join(self.path, f"{_META}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.path, _META))
+
+class RunLog:
+    """
+    Read-only view of a run log; columns are memory-mapped, so only the pages touched are read.
+    열을 메모리 매핑하여 필요한 부분만 읽는 실행 로그 뷰.
+
+    `index_at(t)` finds a row by time with a binary search over the chunk index and then
+    within one chunk, without scanning the time column.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.refresh()
+
+    def refresh(self):
+        """Re-reads the metadata, picking up chunks written since the log was opened."""
+        with open(os.path.join(self.path, _META), 'r') as f:
+            meta = json.load(f)
+        if meta['version'] != RUN_LOG_VERSION:
+            raise ValueError(f"'{self.path}' was written by an unsupported run log version.")
+        self.columns = meta['columns']
+        self.index_column = next(iter(self.columns))
+        self.rows = meta['rows']
+        self.chunk_starts = np.array(meta['chunk_starts'], dtype=int)
+        self.chunk_times = np.array(meta['chunk_times'], dtype=float)
+        self.attributes = meta['attributes']
+        self._columns = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """A whole column as a read-only memory map."""
+        column = self._columns.get(name)
+        if column is None:
+            dtype = self.columns[name]
+            if self.rows == 0:
+                column = np.zeros(0, dtype=dtype)
+            else:
+                column = np.memmap(os.path.join(self.path, f"{name}.bin"), dtype=dtype, mode='r', shape=(self.rows,))
+            self._columns[name] = column
+        return column
+
+    @property
+    def start_time(self) -> float:
+        return float(self.chunk_times[0]) if self.rows else 0.0
+
+    @property
+    def end_time(self) -> float:
+        return float(self[self.index_column][-1]) if self.rows else 0.0
+
+    def index_at(self, t: float) -> int:
+        """Last row whose index time is <= `t` (clamped to the first and last rows)."""
+        if self.rows == 0:
+            raise IndexError("The run log is empty.")
+        chunk = max(int(np.searchsorted(self.chunk_times, t, side='right')) - 1, 0)
+        begin = self.chunk_starts[chunk]
+        end = self.chunk_starts[chunk + 1] if chunk + 1 < len(self.chunk_starts) else self.rows
+        row = begin + int(np.searchsorted(self[self.index_column][begin:end], t, side='right')) - 1
+        return min(max(row, 0), self.rows - 1)
+
+    def row(self, index: int) -> dict:
+        return {name: self[name][index].item() for name in self.columns}
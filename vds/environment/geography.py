@@ -1,9 +1,11 @@
 # vds/environment/geography.py
 
-import pandas as pd
+import logging
 import numpy as np
 from dataclasses import dataclass, field
-import random
+from .shoreline import SegmentBVH, marching_squares, polygon_edges
+
+log = logging.getLogger(__name__)
 
 @dataclass
 class Obstruction:
@@ -14,21 +16,55 @@ class Obstruction:
 class Geography:
     """
     Manages geographical data like bathymetry (water depth) and obstructions.
+
+    Obstructions are stored as `obstacle_positions` (k, 2) and `obstacle_radii` (k,)
+    arrays; `obstructions` is a list view over them for code that works per obstacle.
+    Polygonal structures (piers, breakwaters) are kept in `polygons`; their edges and the
+    0 m coastline of the bathymetry are indexed together in the `shore` segment BVH.
+
+    `depth_version`, `obstacles_version` and `polygons_version` are bumped whenever the
+    depth grid, the obstructions or the structures change, so caches derived from them
+    can be keyed cheaply. Edits made in place to `depth_data` must be followed by
+    `mark_depth_changed()`.
     """
     def __init__(self, depth_data: np.ndarray, cell_size: float):
-        self.depth_data = depth_data
         self.cell_size = cell_size
-        self.grid_height, self.grid_width = depth_data.shape
-        self.map_width = self.grid_width * self.cell_size
-        self.map_height = self.grid_height * self.cell_size
-        self.obstructions: list[Obstruction] = []
+        self.depth_version = 0
+        self.obstacles_version = 0
+        self.polygons_version = 0
+        self.obstacle_positions = np.zeros((0, 2))
+        self.obstacle_radii = np.zeros(0)
+        self._obstruction_view = None
+        self.polygons: list[np.ndarray] = []
+        self._coastline: np.ndarray = None
+        self._shore: SegmentBVH = None
+        self.depth_data = depth_data
 
     @classmethod
     def from_csv(cls, file_path: str, cell_size: float):
+        import pandas as pd
         data = pd.read_csv(file_path, header=None).values
-        print("Geography data loaded.")
+        log.info("Geography data loaded from %s.", file_path)
         return cls(data, cell_size)
 
+    @property
+    def depth_data(self) -> np.ndarray:
+        return self._depth_data
+
+    @depth_data.setter
+    def depth_data(self, depth_data: np.ndarray):
+        self._depth_data = depth_data
+        self.grid_height, self.grid_width = depth_data.shape
+        self.map_width = self.grid_width * self.cell_size
+        self.map_height = self.grid_height * self.cell_size
+        self.mark_depth_changed()
+
+    def mark_depth_changed(self):
+        """Invalidates everything derived from the depth grid after it was edited in place."""
+        self.depth_version += 1
+        self._coastline = None
+        self._shore = None
+
     def get_depth_at(self, x: float, y: float) -> float:
         grid_j = int(y / self.cell_size) 
         grid_i = int(x / self.cell_size) 
@@ -37,23 +73,111 @@ class Geography:
         else:
             return 1000.0
 
+    def get_depths_at(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Vectorized `get_depth_at` for arrays of positions."""
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        grid_i = np.trunc(x / self.cell_size).astype(int)
+        grid_j = np.trunc(y / self.cell_size).astype(int)
+        inside = (grid_i >= 0) & (grid_i < self.grid_height) & (grid_j >= 0) & (grid_j < self.grid_width)
+        depths = np.full(grid_i.shape, 1000.0)
+        depths[inside] = self.depth_data[grid_i[inside], grid_j[inside]]
+        return depths
+
+    @property
+    def obstructions(self) -> list[Obstruction]:
+        """Obstructions as objects. Each `position` is a view into `obstacle_positions`."""
+        if self._obstruction_view is None:
+            self._obstruction_view = [Obstruction(position=position, radius=float(radius))
+                                      for position, radius in zip(self.obstacle_positions, self.obstacle_radii)]
+        return self._obstruction_view
+
+    @obstructions.setter
+    def obstructions(self, obstructions: list[Obstruction]):
+        self.set_obstacles([obs.position for obs in obstructions], [obs.radius for obs in obstructions])
+
+    def set_obstacles(self, positions: np.ndarray, radii: np.ndarray):
+        """Replaces all obstructions with the given (k, 2) positions and (k,) radii."""
+        self.obstacle_positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        self.obstacle_radii = np.asarray(radii, dtype=float).reshape(-1)
+        self._obstruction_view = None
+        self.obstacles_version += 1
+
+    def _append_obstacles(self, positions: np.ndarray, radii: np.ndarray):
+        self.obstacle_positions = np.concatenate([self.obstacle_positions, positions])
+        self.obstacle_radii = np.concatenate([self.obstacle_radii, radii])
+        self._obstruction_view = None
+        self.obstacles_version += 1
+
+    @property
+    def has_obstructions(self) -> bool:
+        """Whether there is anything to collide with: circles, structures or a coastline."""
+        return bool(len(self.obstacle_radii) or self.polygons or len(self.coastline()))
+
+    def set_polygons(self, polygons: list[np.ndarray]):
+        """Replaces all polygonal structures with the given (k_i, 2) vertex arrays."""
+        self.polygons = [np.asarray(points, dtype=float).reshape(-1, 2) for points in polygons]
+        self._shore = None
+        self.polygons_version += 1
+
+    def add_polygon(self, points: np.ndarray):
+        self.polygons.append(np.asarray(points, dtype=float).reshape(-1, 2))
+        self._shore = None
+        self.polygons_version += 1
+
+    def coastline(self) -> np.ndarray:
+        """(m, 2, 2) segments of the 0 m depth contour (land is depth >= 0); extracted once."""
+        if self._coastline is None:
+            self._coastline = marching_squares(self.depth_data, 0.0, self.cell_size)
+        return self._coastline
+
+    @property
+    def shore(self) -> SegmentBVH:
+        """BVH over polygon edges (owner: polygon index) and the coastline (owner: -1), built on first use."""
+        if self._shore is None:
+            edges, owners = polygon_edges(self.polygons)
+            coastline = self.coastline()
+            self._shore = SegmentBVH(np.concatenate([edges, coastline]),
+                                     np.concatenate([owners, np.full(len(coastline), -1, dtype=np.int64)]))
+        return self._shore
+
+    def distance_to_shore(self, x, y) -> np.ndarray:
+        """Distance from each position to the nearest structure edge or coastline (inf if there is none)."""
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        distance, _ = self.shore.nearest(np.column_stack([x.ravel(), y.ravel()]))
+        return distance.reshape(x.shape)
+
+    def hull_contact(self, position: np.ndarray, heading: float, length: float, beam: float) -> int | None:
+        """
+        What an oriented `length` x `beam` hull touches: the polygon index, -1 for the coastline,
+        or None when it is clear.
+        """
+        owner = int(self.shore.hull_contacts(np.asarray(position, dtype=float)[None, :2], [heading], length, beam)[0])
+        return None if owner == -2 else owner
+
     def add_obstacle(self, center_x: float, center_y: float, radius: float):
         """Creates and adds a circular obstruction at a specific location."""
-        position = np.array([center_x, center_y])
-        self.obstructions.append(Obstruction(position=position, radius=radius))
-
-    def add_random_obstacles(self, count: int, min_radius: float, max_radius: float, safe_zone_radius: float = 0.0):
-        """Generates and adds random obstacles, avoiding a safe zone around the origin."""
-        for _ in range(count):
-            while True: # Loop until a valid position is found
-                rand_x = random.uniform(0, self.map_height)
-                rand_y = random.uniform(0, self.map_width)
-                position = np.array([rand_x, rand_y])
-                
-                # Check if the obstacle is outside the safe zone
-                if np.linalg.norm(position) > safe_zone_radius:
-                    rand_radius = random.uniform(min_radius, max_radius)
-                    self.obstructions.append(Obstruction(position=position, radius=rand_radius))
-                    break # Exit loop and create the next obstacle
-        print(f"Added {count} random obstacles.")
+        self._append_obstacles(np.array([[center_x, center_y]], dtype=float), np.array([radius], dtype=float))
 
+    def add_random_obstacles(self, count: int, min_radius: float, max_radius: float, safe_zone_radius: float = 0.0,
+                             rng: np.random.Generator = None, center=(0.0, 0.0)):
+        """
+        Generates and adds random obstacles, avoiding a safe zone of `safe_zone_radius` around
+        `center` (normally the vessel's start position).
+        Positions are drawn in bulk from `rng` (a fresh unseeded generator if None) and
+        rejected as a batch, so large fields cost a few array operations.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        center = np.asarray(center, dtype=float)[:2]
+        corners = np.array([[0.0, 0.0], [self.map_height, 0.0], [0.0, self.map_width], [self.map_height, self.map_width]])
+        if count > 0 and safe_zone_radius >= np.max(np.linalg.norm(corners - center, axis=1)):
+            raise ValueError(f"Safe zone radius {safe_zone_radius} m covers the whole map; no obstacle can be placed.")
+        accepted = np.zeros((0, 2))
+        while len(accepted) < count:
+            needed = count - len(accepted)
+            candidates = rng.uniform((0.0, 0.0), (self.map_height, self.map_width), size=(needed + needed // 4 + 16, 2))
+            offsets = candidates - center
+            outside = np.einsum('ij,ij->i', offsets, offsets) > safe_zone_radius**2
+            accepted = np.concatenate([accepted, candidates[outside][:needed]])
+        self._append_obstacles(accepted, rng.uniform(min_radius, max_radius, count))
+        log.debug("Added %d random obstacles.", count)
@@ -0,0 +1,231 @@
+# vds/environment/shoreline.py
+
+import json
+import os
+import numpy as np
+
+# Marching squares: for each corner case (bit 0: (i, j), 1: (i, j+1), 2: (i+1, j+1), 3: (i+1, j) at or above
+# the level), up to two segments as pairs of block edges (0: i side, 1: j+1 side, 2: i+1 side, 3: j side)
+_CASE_SEGMENTS = np.array([
+    [[-1, -1], [-1, -1]], [[3, 0], [-1, -1]], [[0, 1], [-1, -1]], [[3, 1], [-1, -1]],
+    [[1, 2], [-1, -1]], [[3, 0], [1, 2]], [[0, 2], [-1, -1]], [[3, 2], [-1, -1]],
+    [[2, 3], [-1, -1]], [[0, 2], [-1, -1]], [[0, 1], [2, 3]], [[1, 2], [-1, -1]],
+    [[1, 3], [-1, -1]], [[0, 1], [-1, -1]], [[3, 0], [-1, -1]], [[-1, -1], [-1, -1]],
+])
+# Saddles (cases 5 and 10) whose block centre is at or above the level join the two high corners
+_SADDLE_JOINED = {5: [[0, 1], [2, 3]], 10: [[3, 0], [1, 2]]}
+
+def marching_squares(values: np.ndarray, level: float, cell_size: float) -> np.ndarray:
+    """
+    (m, 2, 2) segments of the `level` contour of a grid of cell-centre values, in world (x, y).
+    Outside the grid counts as below the level, so contours around areas touching the edge close.
+    """
+    low = min(float(np.min(values)), level) - 1.0
+    v = np.pad(np.asarray(values, dtype=float), 1, constant_values=low)
+    corners = np.stack([v[:-1, :-1], v[:-1, 1:], v[1:, 1:], v[1:, :-1]], axis=-1) # (H+1, W+1, 4)
+    case = ((corners >= level) * np.array([1, 2, 4, 8])).sum(axis=-1)
+    i, j = np.nonzero((case != 0) & (case != 15))
+    if not len(i):
+        return np.zeros((0, 2, 2))
+    case, c = case[i, j], corners[i, j]
+    segments = _CASE_SEGMENTS[case].copy()
+    centre_high = c.mean(axis=1) >= level
+    for saddle, joined in _SADDLE_JOINED.items():
+        segments[(case == saddle) & centre_high] = joined
+
+    def crossing(v0, v1):
+        return np.clip((level - v0) / np.where(v1 != v0, v1 - v0, 1.0), 0.0, 1.0)
+    # Padded block (i, j) has corner centres at grid cells i-1..i and j-1..j
+    x0, y0 = (i - 0.5) * cell_size, (j - 0.5) * cell_size
+    edge_points = np.stack([
+        np.column_stack([x0, y0 + crossing(c[:, 0], c[:, 1]) * cell_size]),
+        np.column_stack([x0 + crossing(c[:, 1], c[:, 2]) * cell_size, y0 + cell_size]),
+        np.column_stack([x0 + cell_size, y0 + crossing(c[:, 3], c[:, 2]) * cell_size]),
+        np.column_stack([x0 + crossing(c[:, 0], c[:, 3]) * cell_size, y0]),
+    ], axis=1) # (n, 4, 2)
+    block, slot = np.nonzero(segments[:, :, 0] >= 0)
+    pairs = segments[block, slot]
+    return np.stack([edge_points[block, pairs[:, 0]], edge_points[block, pairs[:, 1]]], axis=1)
+
+def polygon_edges(polygons: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """(m, 2, 2) edges of closed polygons and the (m,) index of the polygon each belongs to."""
+    if not polygons:
+        return np.zeros((0, 2, 2)), np.zeros(0, dtype=np.int64)
+    starts = np.concatenate(polygons)
+    ends = np.concatenate([np.roll(points, -1, axis=0) for points in polygons])
+    owners = np.repeat(np.arange(len(polygons)), [len(points) for points in polygons])
+    return np.stack([starts, ends], axis=1), owners
+
+def load_polygons(file_path: str) -> list[np.ndarray]:
+    """
+    Reads polygon obstructions (piers, breakwaters, islands) as (k, 2) arrays of (x, y) metres.
+    JSON files hold `{"polygons": [{"name": ..., "points": [[x, y], ...]}, ...]}` or a GeoJSON
+    FeatureCollection of Polygons in local metres (outer rings only); CSV files have a
+    `polygon,x,y` header with one row per vertex.
+    """
+    if os.path.splitext(file_path)[1].lower() == '.csv':
+        table = np.genfromtxt(file_path, delimiter=',', names=True, encoding='utf-8')
+        ids = np.atleast_1d(table['polygon'])
+        points = np.column_stack([np.atleast_1d(table['x']), np.atleast_1d(table['y'])])
+        _, starts = np.unique(ids, return_index=True)
+        starts = np.sort(starts)
+        return [np.asarray(chunk, dtype=float) for chunk in np.split(points, starts[1:])]
+    with open(file_path, 'r') as f:
+        data = json.load(f)
+    if data.get('type') == 'FeatureCollection':
+        rings = [feature['geometry']['coordinates'][0] for feature in data['features']
+                 if feature['geometry']['type'] == 'Polygon']
+    else:
+        rings = [polygon['points'] for polygon in data['polygons']]
+    polygons = []
+    for ring in rings:
+        points = np.asarray(ring, dtype=float)
+        if len(points) > 1 and np.array_equal(points[0], points[-1]):
+            points = points[:-1] # Closed rings repeat the first vertex
+        polygons.append(points)
+    return polygons
+
+def _morton_codes(points: np.ndarray) -> np.ndarray:
+    """Interleaved 16-bit quantized coordinates, for ordering points along a Z curve."""
+    lo, hi = points.min(axis=0), points.max(axis=0)
+    q = ((points - lo) / np.maximum(hi - lo, 1e-9) * 65535).astype(np.uint64)
+    def spread(v):
+        v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF)
+        v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F)
+        v = (v | (v << np.uint64(2))) & np.uint64(0x33333333)
+        return (v | (v << np.uint64(1))) & np.uint64(0x55555555)
+    return spread(q[:, 0]) | (spread(q[:, 1]) << np.uint64(1))
+
+def _point_segment_distance(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    edge = ends - starts
+    length_sq = np.einsum('ij,ij->i', edge, edge)
+    t = np.clip(np.einsum('ij,ij->i', points - starts, edge) / np.where(length_sq > 0, length_sq, 1.0), 0.0, 1.0)
+    closest = starts + t[:, None] * edge
+    return np.hypot(points[:, 0] - closest[:, 0], points[:, 1] - closest[:, 1])
+
+class SegmentBVH:
+    """
+    Bounding-volume hierarchy over 2D line segments, queried for many points or boxes at once.
+    선분 집합에 대한 경계 볼륨 계층 구조(BVH).
+
+    Segments are ordered along a Morton curve and grouped into leaves of `LEAF_SIZE`; the
+    leaves form a complete binary tree whose boxes are built bottom-up with one vectorized
+    min/max per level. Queries walk the tree one level at a time for all queries together,
+    keeping only the (query, node) pairs that can still matter, so each query costs about
+    O(log n) box tests plus the exact tests in the few leaves it reaches.
+    `owners` labels every segment (e.g. its polygon index) and is returned with the hits.
+    """
+    LEAF_SIZE = 8
+
+    def __init__(self, segments: np.ndarray, owners: np.ndarray = None):
+        segments = np.asarray(segments, dtype=float).reshape(-1, 2, 2)
+        owners = np.full(len(segments), -1, dtype=np.int64) if owners is None else np.asarray(owners, dtype=np.int64)
+        self.size = len(segments)
+        if self.size:
+            order = np.argsort(_morton_codes(segments.mean(axis=1)), kind='stable')
+            segments, owners = segments[order], owners[order]
+        leaves = 1 << max(int(np.ceil(np.log2(max(-(-self.size // self.LEAF_SIZE), 1)))), 0)
+        slots = leaves * self.LEAF_SIZE
+        self.segments = np.full((slots, 2, 2), np.nan)
+        self.segments[:self.size] = segments
+        self.owners = np.full(slots, -1, dtype=np.int64)
+        self.owners[:self.size] = owners
+        self.valid = np.arange(slots) < self.size
+
+        points = self.segments.reshape(leaves, self.LEAF_SIZE * 2, 2)
+        with np.errstate(invalid='ignore'):
+            lo = np.where(np.isnan(points), np.inf, points).min(axis=1)
+            hi = np.where(np.isnan(points), -np.inf, points).max(axis=1)
+        self.levels = [(lo, hi)] # Leaves first, then built up to the root
+        while len(lo) > 1:
+            lo, hi = np.minimum(lo[0::2], lo[1::2]), np.maximum(hi[0::2], hi[1::2])
+            self.levels.append((lo, hi))
+        self.levels.reverse()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _descend(self, n_queries: int, keep) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Walks the tree for all queries; `keep(query, lo, hi)` selects the pairs to refine.
+        Returns the (query, segment slot) pairs of every leaf reached.
+        """
+        query = np.arange(n_queries)
+        node = np.zeros(n_queries, dtype=np.int64)
+        for depth, (lo, hi) in enumerate(self.levels):
+            if depth:
+                query, node = np.repeat(query, 2), (np.repeat(node, 2) * 2 + np.tile([0, 1], len(node)))
+            kept = keep(query, lo[node], hi[node])
+            query, node = query[kept], node[kept]
+        slot = (node[:, None] * self.LEAF_SIZE + np.arange(self.LEAF_SIZE)).ravel()
+        query = np.repeat(query, self.LEAF_SIZE)
+        valid = self.valid[slot]
+        return query[valid], slot[valid]
+
+    def query_boxes(self, lo: np.ndarray, hi: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(query, segment slot) pairs whose segment bounding box overlaps the query's (lo, hi) box."""
+        lo, hi = np.atleast_2d(lo), np.atleast_2d(hi)
+        if not self.size:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        query, slot = self._descend(len(lo), lambda q, box_lo, box_hi:
+                                    np.all((box_lo <= hi[q]) & (box_hi >= lo[q]), axis=1))
+        seg = self.segments[slot]
+        overlap = np.all((seg.min(axis=1) <= hi[query]) & (seg.max(axis=1) >= lo[query]), axis=1)
+        return query[overlap], slot[overlap]
+
+    def nearest(self, points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Distance from each point to the nearest segment and that segment's owner (inf and -1 if empty)."""
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        distance = np.full(len(points), np.inf)
+        owner = np.full(len(points), -1, dtype=np.int64)
+        if not self.size:
+            return distance, owner
+
+        def keep(q, box_lo, box_hi):
+            p = points[q]
+            near = np.hypot(*np.maximum(np.maximum(box_lo - p, p - box_hi), 0.0).T)
+            # Every segment in a non-empty box is within the distance to the box's farthest corner
+            far = np.hypot(*np.maximum(np.abs(p - box_lo), np.abs(p - box_hi)).T)
+            bound = np.full(len(points), np.inf)
+            np.minimum.at(bound, q, np.where(np.isfinite(box_lo[:, 0]), far, np.inf))
+            return near <= bound[q]
+        query, slot = self._descend(len(points), keep)
+        d = _point_segment_distance(points[query], self.segments[slot, 0], self.segments[slot, 1])
+        np.minimum.at(distance, query, d)
+        best = d == distance[query]
+        owner[query[best]] = self.owners[slot[best]]
+        return distance, owner
+
+    def hull_contacts(self, centers: np.ndarray, headings: np.ndarray, length: float, beam: float) -> np.ndarray:
+        """
+        For oriented rectangular hulls (centre, heading from north, `length` x `beam`), the owner of
+        a segment crossing or inside each hull, -2 where none does (-1 is an unowned segment).
+        """
+        centers, headings = np.atleast_2d(centers), np.atleast_1d(headings)
+        result = np.full(len(centers), -2, dtype=np.int64)
+        half = np.array([length / 2.0, beam / 2.0])
+        cos, sin = np.cos(headings), np.sin(headings)
+        extent = np.abs(np.column_stack([cos, sin])) * half[0] + np.abs(np.column_stack([-sin, cos])) * half[1]
+        query, slot = self.query_boxes(centers - extent, centers + extent)
+        if not len(query):
+            return result
+        # Segment endpoints in each hull's frame (x forward, y starboard), clipped against the box
+        rel = self.segments[slot] - centers[query, None, :]
+        c, s = cos[query, None], sin[query, None]
+        local = np.stack([c * rel[..., 0] + s * rel[..., 1], -s * rel[..., 0] + c * rel[..., 1]], axis=-1)
+        start, delta = local[:, 0], local[:, 1] - local[:, 0]
+        t0, t1 = np.zeros(len(slot)), np.ones(len(slot))
+        inside = np.ones(len(slot), dtype=bool)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for axis in range(2):
+                for sign in (-1.0, 1.0):
+                    # Liang-Barsky: sign * (start + t * delta) <= half
+                    p, q = sign * delta[:, axis], half[axis] - sign * start[:, axis]
+                    parallel = p == 0
+                    inside &= ~(parallel & (q < 0))
+                    t = q / p
+                    t1 = np.where(~parallel & (p > 0), np.minimum(t1, t), t1)
+                    t0 = np.where(~parallel & (p < 0), np.maximum(t0, t), t0)
+        hit = inside & (t0 <= t1)
+        result[query[hit]] = self.owners[slot[hit]]
+        return result
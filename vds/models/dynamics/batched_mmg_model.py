@@ -0,0 +1,148 @@
+# vds/models/dynamics/batched_mmg_model.py
+
+import numpy as np
+from .mmg_model import MMGModel
+from vds.environment.wind import Wind
+from vds.environment.current import Current
+from vds.environment.waves import Waves
+
+# Hydro parameters used by the force model, in the order they are stacked
+HYDRO_KEYS = ('Lpp', 'd', 'rho', 'w_P0', 'D_P', 'k_0', 'k_1', 'k_2', 'kappa', 'epsilon', 'x_R_prime',
+              'Lambda', 'A_R', 'N_r_prime', 'R_0_prime', 'X_vv_prime', 'Y_v_prime', 'Y_r_prime',
+              'N_v_prime', 'a_H', 'x_H_prime')
+
+class BatchedMMGModel:
+    """
+    Vectorized version of `MMGModel` that evaluates many vessel states at once.
+    여러 선박 상태를 한 번에 계산하는 벡터화된 MMG 모델.
+
+    Every parameter is stored as an array of shape (n,) (or a scalar shared by
+    all rows), so the same model can batch control hypotheses for one hull or
+    a fleet of heterogeneous hulls. `calculate_forces` reproduces
+    `MMGModel.calculate_forces` row by row.
+    """
+    def __init__(self, params: dict, mass, inertia_z, wind_area_longitudinal, wind_area_transverse):
+        self.p = {key: np.asarray(params[key], dtype=float) for key in HYDRO_KEYS}
+        self.mass = np.asarray(mass, dtype=float)
+        self.Iz = np.asarray(inertia_z, dtype=float)
+        self.wind_area_longitudinal = np.asarray(wind_area_longitudinal, dtype=float)
+        self.wind_area_transverse = np.asarray(wind_area_transverse, dtype=float)
+        self.rho_air = 1.225
+
+    @classmethod
+    def from_model(cls, model: MMGModel) -> 'BatchedMMGModel':
+        """Batched model sharing one hull's parameters across all rows."""
+        return cls(model.p, model.mass, model.Iz, model.spec.wind_area_longitudinal, model.spec.wind_area_transverse)
+
+    @classmethod
+    def from_models(cls, models: list[MMGModel]) -> 'BatchedMMGModel':
+        """Batched model with one row per (possibly different) hull."""
+        params = {key: np.array([m.p[key] for m in models], dtype=float) for key in HYDRO_KEYS}
+        return cls(params,
+                   [m.mass for m in models], [m.Iz for m in models],
+                   [m.spec.wind_area_longitudinal for m in models], [m.spec.wind_area_transverse for m in models])
+
+    def select(self, index) -> 'BatchedMMGModel':
+        """Model restricted to the rows in `index` (shared scalar parameters are kept as they are)."""
+        pick = lambda a: a if a.ndim == 0 else a[index]
+        return BatchedMMGModel({k: pick(v) for k, v in self.p.items()}, pick(self.mass), pick(self.Iz),
+                               pick(self.wind_area_longitudinal), pick(self.wind_area_transverse))
+
+    def calculate_forces(self, eta: np.ndarray, nu: np.ndarray, rpm, rudder_angle_deg, depth=1000.0,
+                         wind: Wind = None, current: Current = None, waves: Waves = None) -> np.ndarray:
+        """
+        Calculates body-fixed accelerations for a batch of states.
+
+        Args:
+            eta (np.ndarray): Positions/orientations, shape (n, 6).
+            nu (np.ndarray): Body-fixed velocities, shape (n, 6).
+            rpm (array-like): Propeller rpm, shape (n,) or scalar.
+            rudder_angle_deg (array-like): Rudder angles in degrees, shape (n,) or scalar.
+            depth: Water depth (unused by the model, kept for interface parity).
+
+        Returns:
+            np.ndarray: nu_dot, shape (n, 6).
+        """
+        p = self.p
+        u_abs, v_abs, r = nu[:, 0], nu[:, 1], nu[:, 5]
+        psi = eta[:, 5]
+        L = p['Lpp']
+        rho = p['rho']
+
+        u_c, v_c = 0.0, 0.0
+        if current:
+            current_speed_ms = current.speed * 0.514444
+            current_dir_rad = np.radians(current.direction)
+            u_c = current_speed_ms * np.cos(current_dir_rad - psi)
+            v_c = current_speed_ms * np.sin(current_dir_rad - psi)
+        u = u_abs - u_c
+        v = v_abs - v_c
+
+        rpm = np.broadcast_to(np.asarray(rpm, dtype=float), u.shape)
+        n_rps = rpm / 60.0
+        rudder_angle_rad = np.radians(np.broadcast_to(np.asarray(rudder_angle_deg, dtype=float), u.shape))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            U = np.sqrt(u**2 + v**2)
+            moving = U > 0
+            v_prime = np.where(moving, v / U, 0.0)
+            r_prime = np.where(moving, r * L / U, 0.0)
+            w_p = p['w_P0']
+            D_P = p['D_P']
+
+            ahead = n_rps > 0
+            J = np.where(ahead, u * (1 - w_p) / (n_rps * D_P), 0.0)
+            Kt = p['k_0'] + p['k_1'] * J + p['k_2'] * J**2
+            Kt = np.where(n_rps >= 0, Kt, -0.4 * p['k_0'])
+            T = rho * n_rps**2 * D_P**4 * Kt
+
+            C1 = np.where(J > 0, p['kappa'] * (2 * Kt) / J**2, p['kappa'] * 2 * p['k_0'])
+            u_r_factor = np.where(ahead, np.sqrt(1 + C1), 1.0)
+
+        u_r = p['epsilon'] * u * (1 - w_p) * u_r_factor
+        v_r = v + r * p['x_R_prime'] * L
+        U_R_sq = u_r**2 + v_r**2
+        alpha_R = rudder_angle_rad - np.arctan2(v_r, u_r)
+        f_alpha = (8.0 * p['Lambda']) / (p['Lambda'] + 2.25)
+        F_N = 0.5 * rho * p['A_R'] * U_R_sq * f_alpha * np.sin(alpha_R)
+        N_r_prime_damped = p['N_r_prime'] * (1.0 + 3.0 * np.abs(r_prime))
+        X_H_prime = p['R_0_prime'] + p['X_vv_prime'] * v_prime**2
+        Y_H_prime = p['Y_v_prime'] * v_prime + p['Y_r_prime'] * r_prime
+        N_H_prime = p['N_v_prime'] * v_prime + N_r_prime_damped * r_prime
+        cos_rudder = np.cos(rudder_angle_rad)
+        X_R = -(1 - p['a_H']) * F_N * np.sin(rudder_angle_rad)
+        Y_R = -(1 + p['a_H']) * F_N * cos_rudder
+        N_R = -(p['x_R_prime'] + p['a_H'] * p['x_H_prime']) * L * F_N * cos_rudder
+        dynamic_pressure = 0.5 * rho * L * p['d'] * U**2
+
+        X = -np.sign(u) * X_H_prime * dynamic_pressure + T + X_R
+        Y = Y_H_prime * dynamic_pressure + Y_R
+        N = N_H_prime * dynamic_pressure * L + N_R
+
+        if wind:
+            wind_speed = wind.speed * 0.514444
+            wind_dir_rad = np.radians(wind.direction) + np.pi
+            u_w = wind_speed * np.cos(wind_dir_rad - psi) - u_abs
+            v_w = wind_speed * np.sin(wind_dir_rad - psi) - v_abs
+            q_w = 0.5 * self.rho_air * (u_w**2 + v_w**2)
+            alpha_wr = np.arctan2(-v_w, -u_w)
+            X = X + q_w * self.wind_area_transverse * (-0.6 * np.cos(alpha_wr))
+            Y = Y + q_w * self.wind_area_longitudinal * (0.9 * np.sin(alpha_wr))
+            N = N + q_w * self.wind_area_longitudinal * L * (0.15 * np.sin(2 * alpha_wr))
+
+        if waves:
+            wave_dir_rad = np.radians(waves.direction) + np.pi
+            relative_wave_angle = (wave_dir_rad - psi + np.pi) % (2 * np.pi) - np.pi
+            hs_sq = waves.significant_height**2
+            X = X + (-0.05 * hs_sq * (1 - np.cos(relative_wave_angle))) * rho * L * 9.81
+            Y = Y + (0.2 * hs_sq * np.sin(2 * relative_wave_angle)) * rho * L * 9.81
+            N = N + (0.03 * hs_sq * np.sin(relative_wave_angle)) * rho * L**2 * 9.81
+
+        nu_dot = np.zeros((len(u), 6))
+        nu_dot[:, 0] = X / (self.mass + 0.15 * self.mass)
+        nu_dot[:, 1] = Y / (self.mass + 0.8 * self.mass)
+        nu_dot[:, 5] = N / (self.Iz + 0.1 * self.Iz)
+        # Matches the scalar model's early exit for a stopped vessel with the engine off
+        idle = (np.abs(u) < 0.1) & (np.abs(rpm) < 1.0)
+        nu_dot[idle] = 0.0
+        return nu_dot
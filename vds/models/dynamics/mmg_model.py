@@ -10,8 +10,12 @@ from vds.environment.waves import Waves
 
 class MMGModel(BaseDynamicsModel):
     def __init__(self, vessel_spec, hydro_params_path):
-        with open(hydro_params_path, 'r') as f:
-            self.p = json.load(f)
+        # Accepts a JSON path or an already-parsed parameter dict (e.g. from a scenario bundle)
+        if isinstance(hydro_params_path, dict):
+            self.p = dict(hydro_params_path)
+        else:
+            with open(hydro_params_path, 'r') as f:
+                self.p = json.load(f)
         self.spec = vessel_spec
         self.mass = float(self.spec.mass) # Ensure mass is a float
         self.Iz = float(self.spec.inertia_z) # Ensure inertia is a float
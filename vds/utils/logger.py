@@ -1,15 +1,22 @@
 # vds/utils/logger.py
 
-import pandas as pd
 from datetime import datetime
 import os
+from vds.data_handler.run_log import RunLogWriter
 
 class DataLogger:
     """
     Logs simulation data and saves it to a CSV file upon completion.
+    With `run_log_path`, every row is also streamed to an indexed run log (see `run_log`)
+    that `replay.py` can play back; `attributes` (e.g. the scenario path) are stored with it.
     """
-    def __init__(self):
+    def __init__(self, run_log_path: str = None, attributes: dict = None, run_log_chunk_rows: int = 4096):
         self.log_data = []
+        self.run_log = None
+        if run_log_path:
+            self.run_log = RunLogWriter(run_log_path, chunk_rows=run_log_chunk_rows, attributes=attributes)
+        self._elapsed_offset = 0.0 # Keeps the run log's time index increasing across simulator resets
+        self._last_time = 0.0
 
     def log(self, simulator, control):
         """
@@ -26,14 +33,36 @@ class DataLogger:
             'v_mps': simulator.vessel.state.nu[1],
             'r_rad_s': simulator.vessel.state.nu[5],
             'control_rpm': control.get('rpm', 0),
-            'control_rudder_deg': control.get('rudder_angle', 0)
+            'control_rudder_deg': control.get('rudder_angle', 0),
+            'waypoint_index': simulator.current_waypoint_index,
+            'cross_track_m': simulator.cross_track_error,
+            'distance_to_go_m': simulator.distance_to_go
         }
         self.log_data.append(state_summary)
+        if self.run_log is not None:
+            self._log_replay_row(simulator, control)
+
+    def _log_replay_row(self, simulator, control):
+        if simulator.time < self._last_time:
+            self._elapsed_offset += self._last_time - simulator.time
+        self._last_time = simulator.time
+        eta, nu = simulator.vessel.state.eta, simulator.vessel.state.nu
+        row = {'elapsed': simulator.time + self._elapsed_offset, 'time': simulator.time,
+               'rpm': control.get('rpm', 0), 'rudder_angle': control.get('rudder_angle', 0),
+               'waypoint_index': simulator.current_waypoint_index, 'cross_track_m': simulator.cross_track_error,
+               'distance_to_go_m': simulator.distance_to_go, 'autopilot': simulator.autopilot_enabled,
+               'avoidance': simulator.avoidance_enabled, 'collision': simulator.collision_detected}
+        for k in range(6):
+            row[f"eta_{k}"], row[f"nu_{k}"] = eta[k], nu[k]
+        self.run_log.append(row)
 
     def save(self, output_dir="output"):
         """
         Saves the logged data to a timestamped CSV file.
         """
+        if self.run_log is not None:
+            self.run_log.close()
+            print(f"Run log saved to {self.run_log.path}")
         if not self.log_data:
             print("No data to save.")
             return
@@ -44,6 +73,7 @@ class DataLogger:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = os.path.join(output_dir, f"simulation_log_{timestamp}.csv")
         
+        import pandas as pd
         df = pd.DataFrame(self.log_data)
         df.to_csv(filename, index=False)
         print(f"Simulation log saved to {filename}")
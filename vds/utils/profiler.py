@@ -0,0 +1,130 @@
+# vds/utils/profiler.py
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+import numpy as np
+
+class Profiler:
+    """
+    Opt-in per-phase timers and counters for the simulation loop.
+    시뮬레이션 루프를 위한 선택적 구간별 타이머 및 카운터.
+
+    Each phase keeps its last `capacity` samples (start and duration, in ns) in a
+    preallocated ring buffer, so recording never allocates. Statistics (p50/p99 etc.)
+    are computed from the buffered samples on demand. Components take a profiler as
+    an optional attribute and time through `NULL_PROFILER` when it is None.
+
+        t = profiler.now()
+        ...                             # work
+        t = profiler.record('forces', t)  # returns the end time, so phases can be chained
+    """
+    def __init__(self, capacity: int = 100_000):
+        self.capacity = capacity
+        self.counters: dict[str, int] = {}
+        self._starts: dict[str, np.ndarray] = {}
+        self._durations: dict[str, np.ndarray] = {}
+        self._counts: dict[str, int] = {}
+        self._origin = time.perf_counter_ns()
+        self._thread_id = threading.get_ident()
+
+    now = staticmethod(time.perf_counter_ns)
+
+    def record(self, phase: str, start: int) -> int:
+        """Records one sample of `phase` that began at `start` (from `now`). Returns the end time."""
+        end = time.perf_counter_ns()
+        count = self._counts.get(phase)
+        if count is None:
+            self._starts[phase] = np.zeros(self.capacity, dtype=np.int64)
+            self._durations[phase] = np.zeros(self.capacity, dtype=np.int64)
+            count = 0
+        slot = count % self.capacity
+        self._starts[phase][slot] = start
+        self._durations[phase][slot] = end - start
+        self._counts[phase] = count + 1
+        return end
+
+    @contextmanager
+    def section(self, phase: str):
+        """Times a block; for code outside the hot path."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(phase, start)
+
+    def count(self, counter: str, amount: int = 1):
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def reset(self):
+        self.counters.clear()
+        self._starts.clear()
+        self._durations.clear()
+        self._counts.clear()
+        self._origin = time.perf_counter_ns()
+
+    def samples(self, phase: str) -> np.ndarray:
+        """Buffered durations of `phase` in seconds, oldest first."""
+        count = self._counts.get(phase, 0)
+        if count == 0:
+            return np.zeros(0)
+        durations = self._durations[phase]
+        if count > self.capacity:
+            durations = np.roll(durations, -(count % self.capacity))
+        return durations[:min(count, self.capacity)] * 1e-9
+
+    def stats(self, phase: str) -> dict:
+        """Total sample count and mean/p50/p99/max (ms) of the buffered samples of `phase`."""
+        samples = self.samples(phase) * 1e3
+        if len(samples) == 0:
+            return {'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+        p50, p99 = np.percentile(samples, [50, 99])
+        return {'count': self._counts[phase], 'mean_ms': float(samples.mean()), 'p50_ms': float(p50),
+                'p99_ms': float(p99), 'max_ms': float(samples.max())}
+
+    def summary(self) -> dict:
+        return {'phases': {phase: self.stats(phase) for phase in self._counts}, 'counters': dict(self.counters)}
+
+    def save_json(self, path: str):
+        """Writes `summary()` as JSON."""
+        _ensure_directory(path)
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def save_chrome_trace(self, path: str):
+        """Writes the buffered samples in Chrome trace format (chrome://tracing, Perfetto)."""
+        events = []
+        for phase, count in self._counts.items():
+            n = min(count, self.capacity)
+            starts = (self._starts[phase][:n] - self._origin) / 1e3
+            durations = self._durations[phase][:n] / 1e3
+            events += [{'name': phase, 'ph': 'X', 'ts': float(ts), 'dur': float(dur), 'pid': os.getpid(),
+                        'tid': self._thread_id} for ts, dur in zip(starts, durations)]
+        events.sort(key=lambda event: event['ts'])
+        _ensure_directory(path)
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms',
+                       'otherData': {'counters': dict(self.counters)}}, f)
+
+class NullProfiler:
+    """Stand-in with the recording interface of `Profiler` that does nothing, so one code path serves both."""
+    @staticmethod
+    def now() -> int:
+        return 0
+
+    @staticmethod
+    def record(phase: str, start: int) -> int:
+        return 0
+
+    @staticmethod
+    def count(counter: str, amount: int = 1):
+        pass
+
+NULL_PROFILER = NullProfiler()
+
+def _ensure_directory(path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)